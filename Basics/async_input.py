@@ -0,0 +1,346 @@
+# Async input layer for the input() programs
+#
+# calculator.py, USer_Input.py, While_loop.py and Functions_Example.py all
+# block on input() and then call int(). That is fine for one person typing,
+# but a test harness that drives thousands of sessions needs them to run
+# side by side.
+#
+# Here every session reads from its own asyncio stream (stdin, a socket or
+# a pipe), so thousands of sessions share one event loop. A bad number only
+# ends its own session; the error is reported in that session's result.
+#
+# Run:  python async_input.py            -> calculator on stdin
+#       python async_input.py < ans.txt  -> calculator fed from a file
+#       python async_input.py bench      -> 10k simulated sessions
+#       python async_input.py serve 8888 -> calculator over TCP
+
+import asyncio
+import os
+import stat
+import sys
+
+
+class InputParseError(ValueError):
+    """Raised when an answer cannot be converted (e.g. "abc" for an int)."""
+
+    def __init__(self, prompt, text, kind):
+        self.prompt = prompt
+        self.text = text
+        self.kind = kind
+        super().__init__(f"{prompt.strip()!r}: cannot read {text!r} as {kind}")
+
+
+class InputClosedError(EOFError):
+    """Raised when the stream ends before the session got its answer."""
+
+
+class InputLineError(ValueError):
+    """Raised for a line that cannot be read: bad encoding, or longer than
+    the stream's line limit."""
+
+
+# ============================================================================
+# PROMPTER - async replacement for input()
+# ============================================================================
+
+class Prompter:
+    """
+    Reads answers from an asyncio StreamReader, like input() reads stdin.
+
+    Args:
+        reader: asyncio.StreamReader (stdin pipe, socket, subprocess pipe)
+        writer: Optional object with write() (and optionally async drain())
+                that receives prompts and printed output; if None the
+                output is only kept in `self.output`
+        encoding: Encoding of the stream
+    """
+
+    def __init__(self, reader, writer=None, encoding="utf-8"):
+        self.reader = reader
+        self.writer = writer
+        self.encoding = encoding
+        self.output = []
+
+    async def _write(self, text):
+        self.output.append(text)
+        if self.writer is not None:
+            self.writer.write(text.encode(self.encoding))
+            drain = getattr(self.writer, "drain", None)
+            if drain is not None:
+                await drain()
+
+    async def print(self, *values, sep=" ", end="\n"):
+        """Async version of print() for the session's output."""
+        await self._write(sep.join(str(value) for value in values) + end)
+
+    async def input(self, prompt=""):
+        """Async version of input(): shows the prompt, returns one line."""
+        if prompt:
+            await self._write(prompt)
+        try:
+            line = await self.reader.readline()
+        except ValueError:      # readline's "chunk is longer than limit"
+            raise InputLineError(f"{prompt.strip()!r}: line is longer than "
+                                 f"the stream limit") from None
+        if not line:
+            raise InputClosedError(f"{prompt.strip()!r}: input ended")
+        try:
+            return line.decode(self.encoding).rstrip("\r\n")
+        except UnicodeDecodeError:
+            raise InputLineError(f"{prompt.strip()!r}: line is not valid "
+                                 f"{self.encoding}") from None
+
+    async def ask_int(self, prompt=""):
+        """Like int(input(prompt)), but raises InputParseError."""
+        text = await self.input(prompt)
+        try:
+            return int(text)
+        except ValueError:
+            raise InputParseError(prompt, text, "int") from None
+
+    async def ask_str(self, prompt=""):
+        """Like input(prompt)."""
+        return await self.input(prompt)
+
+
+# ============================================================================
+# SESSIONS - the blocking programs rewritten with the prompter
+# ============================================================================
+
+async def calculator_session(io):
+    """Basics/calculator.py"""
+    a = await io.ask_int("Enter a Integer ")
+    b = await io.ask_int("Enter a Integer ")
+    await io.print(a + b)
+    await io.print(a - b)
+    await io.print(a / b)   # ZeroDivisionError is reported per session
+    await io.print(a * b)
+
+
+async def user_input_session(io):
+    """Basics/USer_Input.py"""
+    a = await io.ask_str("Enter your Name ")
+    await io.print(a)
+    x = await io.ask_int("Enter a number: ")
+    y = await io.ask_int("Enter another number: ")
+    await io.print(x + y)
+
+
+async def while_loop_session(io):
+    """Loops/While_Loop/While_loop.py"""
+    i = 0
+    while i < 3:
+        await io.print(i)
+        i = i + 1
+    while i < 10:
+        i = await io.ask_int("Enter a number ")
+        await io.print(i)
+        await io.print("Done")
+
+
+async def square_session(io):
+    """Functions/Functions_Example.py (Q3)"""
+    num = await io.ask_int("Enter a number: ")
+    await io.print(num * num)
+
+
+SESSIONS = {
+    "calculator": calculator_session,
+    "user_input": user_input_session,
+    "while_loop": while_loop_session,
+    "square": square_session,
+}
+
+
+# ============================================================================
+# RUNNING MANY SESSIONS
+# ============================================================================
+
+class SessionResult:
+    """Outcome of one session: its output and the error, if any."""
+
+    __slots__ = ("session_id", "output", "error")
+
+    def __init__(self, session_id, output, error=None):
+        self.session_id = session_id
+        self.output = output
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"SessionResult({self.session_id}, {status})"
+
+
+async def run_session(session, reader, writer=None, session_id=None):
+    """
+    Runs one session and catches its errors.
+
+    Returns:
+        SessionResult (never raises for errors inside the session)
+    """
+    io = Prompter(reader, writer)
+    try:
+        await session(io)
+        error = None
+    except (InputParseError, InputLineError, InputClosedError,
+            ArithmeticError) as exc:
+        error = exc
+    if writer is not None and error is not None:
+        writer.write(f"error: {error}\n".encode(io.encoding))
+    return SessionResult(session_id, io.output, error)
+
+
+def reader_from_text(text):
+    """Makes a StreamReader that yields `text` (str or bytes) and then ends
+    (for tests and simulated sessions)."""
+    reader = asyncio.StreamReader()
+    reader.feed_data(text if isinstance(text, bytes) else text.encode())
+    reader.feed_eof()
+    return reader
+
+
+async def run_many(session, inputs, limit=None):
+    """
+    Runs one session per input text, all at once on the event loop.
+
+    Args:
+        session: A session coroutine function, e.g. calculator_session
+        inputs: Iterable of the text (str or bytes) each session reads
+        limit: Optional maximum number of sessions running at the same time
+
+    Returns:
+        List of SessionResult in input order
+    """
+    semaphore = asyncio.Semaphore(limit) if limit else None
+
+    async def one(session_id, text):
+        if semaphore is None:
+            return await run_session(session, reader_from_text(text),
+                                     session_id=session_id)
+        async with semaphore:
+            return await run_session(session, reader_from_text(text),
+                                     session_id=session_id)
+
+    return await asyncio.gather(*(one(session_id, text)
+                                  for session_id, text in enumerate(inputs)))
+
+
+# Running feeder tasks; the event loop only keeps weak references to tasks
+_FEEDERS = set()
+
+
+async def _feed_from_file(reader, file, chunk_size=1 << 16):
+    """Copies a regular file into `reader`, reading in a worker thread."""
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, file.read, chunk_size)
+            if not chunk:
+                break
+            reader.feed_data(chunk)
+    finally:
+        reader.feed_eof()
+
+
+async def stdin_reader():
+    """
+    Connects sys.stdin to an asyncio StreamReader.
+
+    Pipes and terminals are read by the event loop. A regular file
+    (python async_input.py < answers.txt) cannot be, so it is read in a
+    worker thread and fed to the reader.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    if stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode):
+        task = asyncio.create_task(_feed_from_file(reader, sys.stdin.buffer))
+        _FEEDERS.add(task)
+        task.add_done_callback(_FEEDERS.discard)
+        return reader
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader),
+                                 sys.stdin)
+    return reader
+
+
+class _StdoutWriter:
+    def write(self, data):
+        sys.stdout.write(data.decode())
+        sys.stdout.flush()
+
+
+async def serve_tcp(session, host="127.0.0.1", port=8888):
+    """Serves `session` to every TCP client that connects."""
+    count = 0
+
+    async def handle(reader, writer):
+        nonlocal count
+        count += 1
+        session_id = count
+        try:
+            result = await run_session(session, reader, writer,
+                                       session_id=session_id)
+            if not result.ok:
+                print(f"session {session_id}: {result.error}")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass                # the client already went away
+
+    server = await asyncio.start_server(handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+# ============================================================================
+# LOAD BENCHMARK
+# ============================================================================
+
+async def benchmark(sessions=10_000):
+    import random
+    import time
+
+    rng = random.Random(0)
+    inputs = []
+    for _ in range(sessions):
+        roll = rng.random()
+        if roll < 0.05:
+            inputs.append("12\nabc\n")               # parse error
+        elif roll < 0.07:
+            inputs.append(f"{rng.randint(1, 99)}\n0\n")  # division by zero
+        elif roll < 0.08:
+            inputs.append(b"\xff\n" if roll < 0.075   # not UTF-8 / too long
+                          else "1" * 70_000 + "\n")
+        else:
+            inputs.append(f"{rng.randint(-99, 99)}\n{rng.randint(1, 99)}\n")
+
+    start = time.perf_counter()
+    results = await run_many(calculator_session, inputs)
+    took = time.perf_counter() - start
+
+    failed = [result for result in results if not result.ok]
+    print(f"{sessions:,} calculator sessions in {took:.2f}s "
+          f"({sessions / took:,.0f} sessions/s)")
+    print(f"{len(results) - len(failed):,} ok, {len(failed):,} reported errors")
+    if failed:
+        print(f"e.g. {failed[0]}: {failed[0].error}")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "stdin"
+    if command == "bench":
+        asyncio.run(benchmark(int(sys.argv[2]) if len(sys.argv) > 2
+                              else 10_000))
+    elif command == "serve":
+        port = int(sys.argv[2]) if len(sys.argv) > 2 else 8888
+        asyncio.run(serve_tcp(calculator_session, port=port))
+    else:
+        async def main():
+            await run_session(calculator_session, await stdin_reader(),
+                              _StdoutWriter())
+        asyncio.run(main())
@@ -0,0 +1,230 @@
+# Bulk numeric casting
+#
+# Type_casting.py shows int("1") + int("2"), and every int(input(...)) in
+# the repo casts one value and crashes on a bad one. Ingesting a CSV column
+# of a million numeric strings that way means a million Python-level int()
+# calls inside a loop and no idea which rows were bad.
+#
+# Here a whole column is cast in one call:
+#   - values go through map(int, values) straight into an array.array, so
+#     the loop runs in C; a bad value only costs one restart of that loop.
+#     Parsing dominates, so the speed is about that of
+#     [int(x) for x in values] (clean input is cast in chunks through
+#     list(map()) to get there). What it saves is memory (8 bytes per value
+#     instead of an int object plus a list slot) and a Python-level
+#     try/except per row.
+#   - the input can be a list of str/bytes or one bytes buffer of lines
+#   - the result is an array.array, or a NumPy array sharing its memory
+#   - error modes:  "strict"  raise CastError listing every bad row
+#                   "coerce"  bad rows get a fill value (0 / nan)
+#                   "null"    bad rows get the fill value and are masked
+#
+# Run:  python bulk_cast.py            -> benchmark (1M values)
+#       python bulk_cast.py 200000     -> benchmark with fewer values
+
+import math
+from array import array
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+MODES = ("strict", "coerce", "null")
+
+_CAST_ERRORS = (ValueError, TypeError, OverflowError)
+
+# Rows cast per chunk; bounds the temporary list of parsed values
+_CHUNK_ROWS = 1 << 16
+
+
+class CastError(ValueError):
+    """Raised in strict mode; `rows` lists every row that failed."""
+
+    def __init__(self, rows, first_value):
+        self.rows = rows
+        super().__init__(f"{len(rows)} value(s) could not be cast, first at "
+                         f"row {rows[0]}: {first_value!r}")
+
+
+class CastResult:
+    """
+    Result of a bulk cast.
+
+    values: array.array (or NumPy array / masked array with as_numpy=True)
+    failed: List of row indices that could not be cast
+    mask:   bytearray with 1 for every failed row ("null" mode only)
+    """
+
+    __slots__ = ("values", "failed", "mask")
+
+    def __init__(self, values, failed, mask=None):
+        self.values = values
+        self.failed = failed
+        self.mask = mask
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return f"CastResult({len(self.values)} values, {len(self.failed)} failed)"
+
+
+def _rows(values, sep):
+    """Turns the input into an indexable sequence of rows."""
+    if isinstance(values, (bytes, bytearray, memoryview)):
+        rows = bytes(values).split(sep)
+        if rows and not rows[-1].strip():
+            rows.pop()                  # the newline after the last row
+        return rows
+    if isinstance(values, str):
+        rows = values.split(sep.decode())
+        if rows and not rows[-1].strip():
+            rows.pop()
+        return rows
+    if isinstance(values, (list, tuple)):
+        return values
+    return list(values)
+
+
+def _cast(values, parse, typecode, mode, fill, sep, as_numpy):
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, not {mode!r}")
+    rows = _rows(values, sep)
+    result = array(typecode)
+    failed = []
+    # Clean input: chunks go through list(map()), the fastest thing map()
+    # can fill, and fromlist() leaves the array unchanged if one fails
+    start = 0
+    while start < len(rows):
+        try:
+            result.fromlist(list(map(parse, rows[start:start + _CHUNK_ROWS])))
+        except _CAST_ERRORS:
+            break
+        start += _CHUNK_ROWS
+
+    # From the first bad chunk on: extend() keeps the values before a
+    # failure, and the map iterator can be resumed after it, so each bad
+    # value costs one restart, not a rescan
+    numbers = map(parse, islice(rows, start, None))
+    while True:
+        try:
+            result.extend(numbers)
+            break
+        except _CAST_ERRORS:
+            failed.append(len(result))
+            result.append(fill)
+
+    if failed and mode == "strict":
+        raise CastError(failed, rows[failed[0]])
+    mask = None
+    if mode == "null":
+        mask = bytearray(len(result))
+        for row in failed:
+            mask[row] = 1
+
+    if as_numpy:
+        if np is None:
+            raise ImportError("as_numpy=True needs NumPy")
+        numbers = np.frombuffer(result, dtype=typecode)
+        if mask is not None:
+            numbers = np.ma.MaskedArray(
+                numbers, mask=np.frombuffer(mask, dtype=bool))
+        return CastResult(numbers, failed, mask)
+    return CastResult(result, failed, mask)
+
+
+def cast_ints(values, mode="strict", typecode="q", fill=0, sep=b"\n",
+              as_numpy=False):
+    """
+    Casts a column of numeric text to integers, like int() on every row.
+
+    Args:
+        values: Iterable of str/bytes, or one str/bytes buffer of rows
+        mode: "strict", "coerce" or "null" (see the top of this file)
+        typecode: array.array typecode of the result ("q" = 64-bit);
+                  values that do not fit count as failed rows
+        fill: Value stored for failed rows in coerce/null mode
+        sep: Row separator when `values` is a buffer
+        as_numpy: Return NumPy arrays instead of array.array
+
+    Returns:
+        CastResult
+
+    Raises:
+        CastError: In strict mode, if any row fails
+    """
+    return _cast(values, int, typecode, mode, fill, sep, as_numpy)
+
+
+def cast_floats(values, mode="strict", typecode="d", fill=math.nan,
+                sep=b"\n", as_numpy=False):
+    """
+    Casts a column of numeric text to floats, like float() on every row.
+    Arguments as in cast_ints(); failed rows hold nan by default.
+    """
+    return _cast(values, float, typecode, mode, fill, sep, as_numpy)
+
+
+# ============================================================================
+# MAIN EXECUTION - Benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import sys
+    import time
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(11)
+    clean = [str(rng.randint(-10**9, 10**9)) for _ in range(size)]
+    dirty = list(clean)
+    for row in rng.sample(range(size), size // 100):
+        dirty[row] = rng.choice(["", "abc", "3.6", "1e5", "12x"])
+    buffer = "\n".join(dirty).encode() + b"\n"
+
+    def timed(label, function, repeat=3):
+        # Best of `repeat` runs, so the order of the runs matters less
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function()
+            took = time.perf_counter() - start
+            best = took if best is None else min(best, took)
+        print(f"{label:34s}: {best:6.3f}s")
+        return result
+
+    def try_each(values):
+        numbers, bad = [], []
+        for row, text in enumerate(values):
+            try:
+                numbers.append(int(text))
+            except ValueError:
+                bad.append(row)
+                numbers.append(0)
+        return numbers, bad
+
+    print(f"{size:,} values, 1% bad in the dirty column")
+    expected = timed("clean: [int(x) for x in values]",
+                     lambda: [int(x) for x in clean])
+    result = timed("clean: cast_ints", lambda: cast_ints(clean))
+    assert result.values.tolist() == expected
+    list_bytes = sys.getsizeof(expected) + sum(map(sys.getsizeof, expected))
+    array_bytes = result.values.buffer_info()[1] * result.values.itemsize
+    print(f"memory: list of int {list_bytes / 1e6:.1f} MB, "
+          f"array('q') {array_bytes / 1e6:.1f} MB")
+
+    numbers, bad = timed("dirty: loop with try/except",
+                         lambda: try_each(dirty))
+    result = timed("dirty: cast_ints(mode='coerce')",
+                   lambda: cast_ints(dirty, mode="coerce"))
+    assert result.values.tolist() == numbers and result.failed == bad
+    result = timed("dirty: cast_ints(bytes buffer)",
+                   lambda: cast_ints(buffer, mode="null"))
+    assert result.failed == bad and sum(result.mask) == len(bad)
+
+    try:
+        cast_ints(dirty[:1000] + ["oops"])
+    except CastError as exc:
+        print(f"strict mode: {exc} (rows {exc.rows[:3]}...)")
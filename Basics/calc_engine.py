@@ -0,0 +1,358 @@
+# Bulk calculator engine
+#
+# calculator.py reads two ints and prints a+b, a-b, a/b and a*b, and crashes
+# when b is 0. This engine does the same work for whole batches:
+#
+#   - (a, op, b) triples given as columns are evaluated one operator at a
+#     time with map() over the column (or NumPy when installed)
+#   - small expression strings like "(3 + 4) * 2" are compiled once into a
+#     cached closure (LRU), so repeated expressions are not parsed again
+#   - a bad row (division by zero, unknown operator, syntax error) gives an
+#     error for that row only, never an exception for the batch
+#   - files are processed as a stream, one result line per input line
+#
+# Run:  python calc_engine.py file.txt      -> evaluate one expression per line
+#       python calc_engine.py bench [n]     -> benchmark (default 10M ops)
+
+import ast
+import math
+import operator
+import sys
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+    "**": operator.pow,
+}
+
+_AST_OPS = {
+    ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/",
+    ast.FloorDiv: "//", ast.Mod: "%", ast.Pow: "**",
+}
+
+# Integer results with more bits than this are refused: powers before they
+# are computed, so "9 ** 9 ** 9" cannot hang the batch, and any other result
+# (e.g. a product of big powers) after. The cap keeps every answer under
+# Python's int -> str digit limit, so printing a result cannot fail.
+_MAX_DIGITS = getattr(sys, "get_int_max_str_digits", lambda: 0)()
+MAX_RESULT_BITS = int((_MAX_DIGITS - 1) * math.log2(10)) if _MAX_DIGITS \
+    else 1 << 20
+
+# Expressions nested too deeply for the parser / closures, or too big for
+# memory; reported as a CalcError for that row
+_LIMIT_ERRORS = (RecursionError, MemoryError)
+
+
+class CalcError(ValueError):
+    """An expression that cannot be compiled or evaluated."""
+
+
+def _power(a, b):
+    # The result of a ** b has about a.bit_length() * b bits; float powers
+    # are fast and raise OverflowError by themselves
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and abs(a) > 1 \
+            and (a.bit_length() - 1) * b > MAX_RESULT_BITS:
+        raise CalcError(f"result of ** would have over {MAX_RESULT_BITS:,} bits")
+    return operator.pow(a, b)
+
+
+def _run(compiled):
+    """Calls a compiled expression, turning limit errors (and results over
+    MAX_RESULT_BITS) into CalcError."""
+    try:
+        value = compiled()
+    except _LIMIT_ERRORS as exc:
+        raise CalcError(f"expression is too large to evaluate "
+                        f"({type(exc).__name__})") from None
+    if isinstance(value, int) and value.bit_length() > MAX_RESULT_BITS:
+        raise CalcError(f"result has over {MAX_RESULT_BITS:,} bits")
+    return value
+
+
+# ============================================================================
+# EXPRESSIONS - compiled once, cached
+# ============================================================================
+
+def _build(node):
+    """Turns an AST node into a closure that computes its value."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return lambda: value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub,
+                                                               ast.UAdd)):
+        operand = _build(node.operand)
+        if isinstance(node.op, ast.USub):
+            return lambda: -operand()
+        return operand
+    if isinstance(node, ast.BinOp) and type(node.op) in _AST_OPS:
+        symbol = _AST_OPS[type(node.op)]
+        function = _power if symbol == "**" else OPS[symbol]
+        left = _build(node.left)
+        right = _build(node.right)
+        return lambda: function(left(), right())
+    raise CalcError(f"unsupported syntax: {ast.dump(node)[:40]}")
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(text):
+    """
+    Compiles an arithmetic expression into a closure (cached by text).
+
+    Only numbers, + - * / // % ** and parentheses are allowed; nothing is
+    passed to eval().
+
+    Raises:
+        CalcError: If the expression is not valid arithmetic
+    """
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+        return _build(tree.body)
+    except SyntaxError as exc:
+        raise CalcError(f"syntax error in {text.strip()[:40]!r}") from exc
+    except _LIMIT_ERRORS as exc:
+        raise CalcError(f"expression is nested too deeply "
+                        f"({type(exc).__name__})") from None
+
+
+def evaluate(text):
+    """Evaluates one expression string (raises CalcError / ArithmeticError)."""
+    return _run(compile_expression(text))
+
+
+def evaluate_lines(lines):
+    """
+    Evaluates one expression per line, lazily.
+
+    Yields:
+        (line_number, value, error) - error is None on success, value is
+        None on failure. Blank lines are skipped.
+    """
+    for line_number, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text:
+            continue
+        try:
+            yield line_number, _run(compile_expression(text)), None
+        except (CalcError, ArithmeticError) as exc:
+            yield line_number, None, f"{type(exc).__name__}: {exc}"
+
+
+# ============================================================================
+# TRIPLES - numeric columns
+# ============================================================================
+
+class BatchResult:
+    """
+    Results of a batch: `values[i]` is the answer of row i (None when the
+    row failed) and `errors` maps failed row numbers to a message.
+    """
+
+    __slots__ = ("values", "errors")
+
+    def __init__(self, values, errors):
+        self.values = values
+        self.errors = errors
+
+    def rows(self):
+        """Yields (value, error) for every row, in order."""
+        errors = self.errors
+        for row, value in enumerate(self.values):
+            yield value, errors.get(row)
+
+    def __repr__(self):
+        return f"BatchResult({len(self.values)} rows, {len(self.errors)} errors)"
+
+
+def _apply_safely(function, a_values, b_values, rows, values, errors):
+    """Row-by-row fallback that records errors instead of raising."""
+    for row, a, b in zip(rows, a_values, b_values):
+        try:
+            values[row] = function(a, b)
+        except (ArithmeticError, TypeError, CalcError) as exc:
+            errors[row] = f"{type(exc).__name__}: {exc}"
+
+
+def _evaluate_numpy(a, ops, b):
+    values = [None] * len(a)
+    errors = {}
+    a = np.asarray(a)
+    b = np.asarray(b)
+    ops = np.asarray(ops)
+    for symbol in np.unique(ops).tolist():
+        rows = np.flatnonzero(ops == symbol)
+        function = OPS.get(symbol)
+        if function is None:
+            for row in rows.tolist():
+                errors[row] = f"unknown operator {symbol!r}"
+            continue
+        left, right = a[rows], b[rows]
+        if symbol in ("/", "//", "%"):
+            zero = right == 0
+            for row in rows[zero].tolist():
+                errors[row] = "ZeroDivisionError: division by zero"
+            rows, left, right = rows[~zero], left[~zero], right[~zero]
+        if symbol == "**":
+            _apply_safely(_power, left.tolist(), right.tolist(),
+                          rows.tolist(), values, errors)
+            continue
+        for row, value in zip(rows.tolist(), function(left, right).tolist()):
+            values[row] = value
+    return BatchResult(values, errors)
+
+
+def evaluate_triples(a, ops, b, use_numpy=None):
+    """
+    Evaluates a[i] ops[i] b[i] for every row.
+
+    Args:
+        a, b: Columns of numbers (lists, array.array or NumPy arrays)
+        ops: One operator for every row ("+"), or a column of operators
+        use_numpy: Force the NumPy path on or off (default: use it when
+                   NumPy is installed). NumPy uses fixed-size numbers, so
+                   big Python ints should use the pure-Python path.
+
+    Returns:
+        BatchResult
+    """
+    if len(a) != len(b):
+        raise ValueError("a and b must have the same length")
+    if isinstance(ops, str):
+        ops = [ops] * len(a) if use_numpy else _Repeat(ops, len(a))
+    elif len(ops) != len(a):
+        raise ValueError("need one operator per row")
+
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        return _evaluate_numpy(a, list(ops), b)
+
+    values = [None] * len(a)
+    errors = {}
+    if isinstance(ops, _Repeat):
+        groups = {ops.symbol: None}          # None = every row
+    else:
+        groups = {}
+        for row, symbol in enumerate(ops):
+            groups.setdefault(symbol, []).append(row)
+
+    for symbol, rows in groups.items():
+        function = OPS.get(symbol)
+        if rows is None:
+            rows = range(len(a))
+            left, right = a, b
+        else:
+            left = [a[row] for row in rows]
+            right = [b[row] for row in rows]
+        if function is None:
+            for row in rows:
+                errors[row] = f"unknown operator {symbol!r}"
+            continue
+        if symbol == "**":
+            _apply_safely(_power, left, right, rows, values, errors)
+            continue
+        try:
+            # Fast path: the whole group in one C-level map()
+            results = list(map(function, left, right))
+        except (ArithmeticError, TypeError):
+            _apply_safely(function, left, right, rows, values, errors)
+            continue
+        if isinstance(rows, range):
+            values = results
+        else:
+            for row, value in zip(rows, results):
+                values[row] = value
+    return BatchResult(values, errors)
+
+
+class _Repeat:
+    """The same operator for every row, without building a list."""
+
+    __slots__ = ("symbol", "size")
+
+    def __init__(self, symbol, size):
+        self.symbol = symbol
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter([self.symbol] * self.size)
+
+
+def calculator(a, b):
+    """
+    Batch version of calculator.py: a+b, a-b, a/b and a*b for every pair.
+
+    Returns:
+        Dict operator -> BatchResult
+    """
+    return {symbol: evaluate_triples(a, symbol, b)
+            for symbol in ("+", "-", "/", "*")}
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def _benchmark(total):
+    import random
+    import time
+
+    rng = random.Random(3)
+    size = min(total, 1_000_000)
+    a = [rng.randint(-1000, 1000) for _ in range(size)]
+    b = [rng.randint(-20, 20) for _ in range(size)]
+    ops = [rng.choice("+-*/") for _ in range(size)]
+    rounds = max(1, total // size)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = evaluate_triples(a, ops, b)
+    took = time.perf_counter() - start
+    print(f"triples     : {size * rounds:,} ops in {took:.2f}s "
+          f"({size * rounds / took / 1e6:.1f} M ops/s, "
+          f"{len(result.errors):,} division-by-zero rows per round)")
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        calculator(a, b)
+    took = time.perf_counter() - start
+    print(f"calculator  : {4 * size * rounds:,} ops in {took:.2f}s "
+          f"({4 * size * rounds / took / 1e6:.1f} M ops/s)")
+
+    expressions = [f"({x} + {y}) * 2" for x, y in zip(a[:1000], b[:1000])]
+    lines = [expressions[rng.randrange(1000)] for _ in range(size)]
+    start = time.perf_counter()
+    for _ in evaluate_lines(lines):
+        pass
+    took = time.perf_counter() - start
+    info = compile_expression.cache_info()
+    print(f"expressions : {size:,} lines in {took:.2f}s "
+          f"(cache hits {info.hits:,}, misses {info.misses:,})")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        _benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 10_000_000)
+    elif len(sys.argv) > 1:
+        with open(sys.argv[1]) as file:
+            for line_number, value, error in evaluate_lines(file):
+                print(f"{line_number}: {value if error is None else error}")
+    else:
+        a = int(input("Enter a Integer "))
+        b = int(input("Enter a Integer "))
+        for symbol, result in calculator([a], [b]).items():
+            value, error = next(result.rows())
+            print(f"{a} {symbol} {b} = {value if error is None else error}")
@@ -0,0 +1,560 @@
+# Zero-copy slicing of fixed-width records
+#
+# Strings_1.py and String_Methods.py slice strings (name[0:7], b[-4:-2]) and
+# call split/strip/replace. Every one of those makes a new string. For an
+# ETL job that cuts fields out of millions of fixed-width lines, reading
+# the file as text and slicing each line copies every byte several times.
+#
+# Here the file is memory-mapped and never copied:
+#   - ByteWindow is a memoryview with the slicing rules of str (negative
+#     indices, steps, strip, split) - slicing it makes another window;
+#     an int index gives the byte as an int, like bytes does
+#   - RecordLayout names the fields of a record with the same slices
+#     (e.g. "code": slice(-4, -2))
+#   - RecordFile gives the records as windows; a field is decoded only
+#     when it is read
+#   - RecordFile.column() / .rows() cut one field (or every field) out of
+#     all records in one struct.iter_unpack call
+#
+# Run:  python record_slicing.py          -> demo + benchmark (1M records)
+#       python record_slicing.py 200000   -> benchmark with fewer records
+
+import mmap
+import re
+import struct
+from functools import lru_cache
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+_WHITESPACE = b" \t\n\r\x0b\x0c"
+
+# Records decoded together by RecordFile.rows()
+_ROWS_BATCH = 65536
+
+
+# ============================================================================
+# BYTE WINDOW - str slicing without copies
+# ============================================================================
+
+class ByteWindow:
+    """
+    A read-only window over bytes that slices like a str.
+
+    window[0:7] and window[-4:-2] return new windows over the same memory;
+    window[4] returns the byte as an int, like b"hello"[4] (a character
+    of multibyte UTF-8 is more than one byte; slice and decode for it).
+    """
+
+    __slots__ = ("view", "encoding")
+
+    def __init__(self, data, encoding="utf-8"):
+        view = data if isinstance(data, memoryview) else memoryview(data)
+        self.view = view
+        self.encoding = encoding
+
+    def _window(self, view):
+        return ByteWindow(view, self.encoding)
+
+    def __len__(self):
+        return len(self.view)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._window(self.view[key])
+        return self.view[key]           # same negative-index rules as str
+
+    def __bytes__(self):
+        return self.view.tobytes()
+
+    def __str__(self):
+        return self.decode()
+
+    def __repr__(self):
+        return f"ByteWindow({self.view.tobytes()!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, ByteWindow):
+            return self.view == other.view
+        if isinstance(other, str):
+            return self.decode() == other
+        if isinstance(other, (bytes, bytearray, memoryview)):
+            return self.view == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def decode(self, errors="strict"):
+        """Copies the window into a str (the only copying step)."""
+        return str(self.view, self.encoding, errors) \
+            if self.view.contiguous else self.view.tobytes().decode(
+                self.encoding, errors)
+
+    # ------------------------------------------------------------------------
+    # strip / split return windows, not new strings
+    # ------------------------------------------------------------------------
+
+    def _bounds(self, chars, left, right):
+        view = self.view
+        if not view.contiguous:
+            view = memoryview(view.tobytes())
+        if isinstance(chars, str):
+            chars = chars.encode(self.encoding)
+        leading, trailing = _strip_patterns(
+            _WHITESPACE if chars is None else bytes(chars))
+        start, stop = 0, len(view)
+        if left:
+            start = leading.match(view).end()
+        if right and start < stop:
+            stop = max(start, trailing.search(view, start).start())
+        return start, stop
+
+    def strip(self, chars=None):
+        start, stop = self._bounds(chars, True, True)
+        return self._window(self.view[start:stop])
+
+    def lstrip(self, chars=None):
+        start, stop = self._bounds(chars, True, False)
+        return self._window(self.view[start:stop])
+
+    def rstrip(self, chars=None):
+        start, stop = self._bounds(chars, False, True)
+        return self._window(self.view[start:stop])
+
+    def find(self, sub, start=0):
+        """Index of `sub` (str or bytes) in the window, or -1."""
+        if isinstance(sub, str):
+            sub = sub.encode(self.encoding)
+        return _find(self.view, sub, start)
+
+    def split(self, sep):
+        """Like str.split(sep): returns a list of windows."""
+        if isinstance(sep, str):
+            sep = sep.encode(self.encoding)
+        if not sep:
+            raise ValueError("empty separator")
+        parts = []
+        view = self.view
+        start = 0
+        while True:
+            found = _find(view, sep, start)
+            if found < 0:
+                parts.append(self._window(view[start:]))
+                return parts
+            parts.append(self._window(view[start:found]))
+            start = found + len(sep)
+
+
+@lru_cache(maxsize=256)
+def _strip_patterns(chars):
+    """Regexes for the leading and trailing run of `chars` (they search
+    the memoryview in place, without copying it)."""
+    if not chars:
+        return re.compile(b""), re.compile(rb"\Z")
+    run = b"[" + b"".join(re.escape(bytes([c])) for c in set(chars)) + b"]*"
+    return re.compile(run), re.compile(run + rb"\Z")
+
+
+@lru_cache(maxsize=256)
+def _pattern(sub):
+    return re.compile(re.escape(sub))
+
+
+def _find(view, sub, start):
+    """bytes.find over a memoryview; re searches the buffer in place."""
+    if not view.contiguous:
+        view = memoryview(view.tobytes())
+    match = _pattern(bytes(sub)).search(view, start)
+    return match.start() if match else -1
+
+
+# ============================================================================
+# RECORD LAYOUT
+# ============================================================================
+
+class Field:
+    """One named slice of a record, with an optional converter (e.g. int)."""
+
+    __slots__ = ("name", "start", "stop", "convert")
+
+    def __init__(self, name, start, stop, convert=None):
+        self.name = name
+        self.start = start
+        self.stop = stop
+        self.convert = convert
+
+    @property
+    def width(self):
+        return self.stop - self.start
+
+    def __repr__(self):
+        return f"Field({self.name!r}, {self.start}, {self.stop})"
+
+
+class RecordLayout:
+    """
+    Describes a fixed-width record.
+
+    Args:
+        fields: Iterable of (name, spec) or (name, spec, convert), where
+                spec is a width (fields follow each other), a slice such as
+                slice(-4, -2), or a (start, stop) pair. Slices use str rules
+                on a record of `width` bytes.
+        width: Bytes of data per record (default: end of the last field)
+        terminator: Bytes after every record (b"\\n" for lines, b"" for none)
+        pad: Padding bytes stripped from decoded fields
+        encoding: Text encoding of the fields
+    """
+
+    def __init__(self, fields, width=None, terminator=b"\n", pad=b" ",
+                 encoding="utf-8"):
+        specs = [tuple(field) for field in fields]
+        if width is None:
+            width = 0
+            for spec in specs:
+                if isinstance(spec[1], int):
+                    width += spec[1]
+                else:
+                    stop = spec[1].stop if isinstance(spec[1], slice) \
+                        else spec[1][1]
+                    if stop is None or stop < 0:
+                        raise ValueError("width is needed for open or "
+                                         "negative slices")
+                    width = max(width, stop)
+        self.width = width
+        self.terminator = terminator
+        self.stride = width + len(terminator)
+        self.pad = pad
+        self.encoding = encoding
+
+        self.fields = {}
+        position = 0
+        for name, spec, *convert in specs:
+            if isinstance(spec, int):
+                start, stop = position, position + spec
+            else:
+                if not isinstance(spec, slice):
+                    spec = slice(*spec)
+                start, stop, step = spec.indices(width)
+                if step != 1:
+                    raise ValueError(f"field {name!r}: steps are not allowed")
+            stop = max(start, stop)
+            self.fields[name] = Field(name, start, stop,
+                                      convert[0] if convert else None)
+            position = stop
+        self._structs = {}
+
+    def __repr__(self):
+        return f"RecordLayout({list(self.fields.values())}, width={self.width})"
+
+    def splitter(self, names):
+        """
+        Returns (struct.Struct, order): the struct cuts the named fields
+        out of one record in file order; unpacked[order[i]] is names[i].
+        """
+        names = tuple(names)
+        found = self._structs.get(names)
+        if found is None:
+            fields = sorted((self.fields[name] for name in names),
+                            key=lambda field: field.start)
+            parts = []
+            position = 0
+            for field in fields:
+                if field.start < position:
+                    raise ValueError("overlapping fields cannot be split "
+                                     "in one pass")
+                if field.start > position:
+                    parts.append(f"{field.start - position}x")
+                parts.append(f"{field.width}s")
+                position = field.stop
+            if self.stride > position:
+                parts.append(f"{self.stride - position}x")
+            order = [fields.index(self.fields[name]) for name in names]
+            found = self._structs[names] = (struct.Struct("".join(parts)),
+                                            order)
+        return found
+
+    def decoder(self, name):
+        """Function turning the raw bytes of a field into its value."""
+        field = self.fields[name]
+        encoding, pad, convert = self.encoding, self.pad, field.convert
+        if convert is None:
+            return lambda raw: str(raw.strip(pad), encoding)
+        return lambda raw: convert(str(raw.strip(pad), encoding))
+
+
+# ============================================================================
+# RECORDS
+# ============================================================================
+
+class Record(ByteWindow):
+    """
+    One record: a ByteWindow whose fields are decoded on access.
+
+    record["name"] decodes one field; record.raw("name") gives its window;
+    record[0:7] slices the record like a str.
+    """
+
+    __slots__ = ("layout",)
+
+    def __init__(self, view, layout):
+        self.view = view
+        self.encoding = layout.encoding
+        self.layout = layout
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            field = self.layout.fields[key]
+            return self.layout.decoder(key)(
+                self.view[field.start:field.stop].tobytes())
+        return super().__getitem__(key)
+
+    def raw(self, name):
+        """The field as a window (no decoding, no copy)."""
+        field = self.layout.fields[name]
+        return self._window(self.view[field.start:field.stop])
+
+    def as_dict(self):
+        """Decodes every field."""
+        return {name: self[name] for name in self.layout.fields}
+
+    def __repr__(self):
+        return f"Record({self.view.tobytes()!r})"
+
+
+class RecordFile:
+    """
+    Memory-mapped file of fixed-width records.
+
+    Example:
+        layout = RecordLayout([("id", 6, int), ("name", 20), ("city", 12)])
+        with RecordFile("people.txt", layout) as records:
+            records[-1]["name"]        # last record, one field decoded
+            records.column("id")       # every id, in one pass
+
+    Indexing and slicing follow list rules (negative indices count from
+    the end). A last record without its terminator is still counted.
+    """
+
+    def __init__(self, path, layout):
+        self.layout = layout
+        self._file = open(path, "rb")
+        size = self._file.seek(0, 2)
+        if size:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+            self.view = memoryview(self._map)
+        else:
+            self._map = None
+            self.view = memoryview(b"")
+        stride = layout.stride
+        self._count = size // stride
+        if size - self._count * stride >= layout.width and layout.width:
+            self._count += 1            # last line without "\n"
+
+    def close(self):
+        """
+        Closes the file. If records or arrays from it are still alive the
+        mapping stays open until they are garbage collected.
+        """
+        self.view.release()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _record(self, index):
+        start = index * self.layout.stride
+        return Record(self.view[start:start + self.layout.width], self.layout)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._record(index)
+                    for index in range(*key.indices(self._count))]
+        if key < 0:
+            key += self._count
+        if not 0 <= key < self._count:
+            raise IndexError("record index out of range")
+        return self._record(key)
+
+    def __iter__(self):
+        return map(self._record, range(self._count))
+
+    # ------------------------------------------------------------------------
+    # Vectorized split
+    # ------------------------------------------------------------------------
+
+    def _unpack(self, names):
+        """Yields tuples of raw field bytes for every record."""
+        layout = self.layout
+        packer, _ = layout.splitter(names)
+        whole = self._count * layout.stride
+        if whole > len(self.view):      # last record has no terminator
+            whole -= layout.stride
+        yield from packer.iter_unpack(self.view[:whole])
+        if whole // layout.stride < self._count:
+            tail = self.view[whole:].tobytes().ljust(layout.stride, b"\0")
+            yield packer.unpack(tail)
+
+    def column(self, name, decode=True):
+        """
+        Cuts one field out of every record.
+
+        Returns:
+            List of decoded values (or of raw bytes with decode=False)
+        """
+        raws = (raw for (raw,) in self._unpack((name,)))
+        if not decode:
+            return list(raws)
+        return list(map(self.layout.decoder(name), raws))
+
+    def rows(self, names=None):
+        """
+        Splits every record into its fields.
+
+        Yields:
+            Tuples of decoded values in `names` order (default: all fields)
+        """
+        names = tuple(self.layout.fields) if names is None else tuple(names)
+        decoders = [self.layout.decoder(name) for name in names]
+        try:
+            _, order = self.layout.splitter(names)
+        except ValueError:
+            # Overlapping fields: one pass per field instead
+            yield from zip(*(map(decode, (raw for (raw,)
+                                          in self._unpack((name,))))
+                             for decode, name in zip(decoders, names)))
+            return
+        raws = self._unpack(names)
+        while True:
+            # Decode a batch column by column, so each decoder runs in map()
+            batch = list(islice(raws, _ROWS_BATCH))
+            if not batch:
+                return
+            columns = list(zip(*batch))
+            yield from zip(*(map(decode, columns[position])
+                             for decode, position in zip(decoders, order)))
+
+    def column_array(self, name):
+        """
+        One field of every record as a NumPy bytes array that shares
+        memory with the file (no copy at all). Requires NumPy.
+
+        Has one entry per record, len(self) in all, including a last record
+        without its terminator.
+        """
+        if np is None:
+            raise ImportError("column_array() needs NumPy")
+        field = self.layout.fields[name]
+        # The last record's data is all there even without the terminator,
+        # so the strided view of `len(self)` records stays inside the map
+        return np.ndarray((self._count,), dtype=f"S{field.width}",
+                          buffer=self._map,
+                          offset=field.start, strides=(self.layout.stride,))
+
+
+# ============================================================================
+# MAIN EXECUTION - demo + benchmark
+# ============================================================================
+
+def _benchmark(count):
+    import gc
+    import os
+    import random
+    import tempfile
+    import time
+    import tracemalloc
+
+    layout = RecordLayout([("id", 8, int), ("name", 20), ("city", 14),
+                           ("score", 6, int)])
+    rng = random.Random(1)
+    names = ["Jotiraditya", "Asha", "Ravi", "Meera", "Karan", "Ila"]
+    cities = ["Kolkata", "Pune", "Delhi", "Chennai", "Mumbai"]
+    path = os.path.join(tempfile.mkdtemp(), "records.txt")
+    with open(path, "w") as file:
+        for number in range(count):
+            file.write(f"{number:<8}{rng.choice(names):<20}"
+                       f"{rng.choice(cities):<14}{rng.randrange(100):<6}\n")
+
+    def measure(label, function):
+        gc.collect()
+        start = time.perf_counter()
+        result = function()
+        took = time.perf_counter() - start
+        tracemalloc.start()             # second run only for memory
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label:30s}: {took:6.3f}s  {count / took / 1e6:6.2f} M rec/s"
+              f"  peak {peak / 1e6:7.1f} MB")
+        return result
+
+    # The str versions read the text and slice every line, as in
+    # Strings_1.py; the window versions only look at the mapped bytes
+    def str_kolkata():
+        with open(path) as file:
+            lines = file.read().splitlines()
+        return sum(line[28:42].strip() == "Kolkata" for line in lines)
+
+    def window_kolkata():
+        with RecordFile(path, layout) as records:
+            return sum(record.raw("city").rstrip() == b"Kolkata"
+                       for record in records)
+
+    def column_kolkata():
+        with RecordFile(path, layout) as records:
+            return records.column("city", decode=False).count(
+                b"Kolkata".ljust(14))
+
+    def str_scores():
+        with open(path) as file:
+            lines = file.read().splitlines()
+        return sum(int(line[-6:]) for line in lines)
+
+    def column_scores():
+        with RecordFile(path, layout) as records:
+            return sum(records.column("score"))
+
+    def rows_ids():
+        with RecordFile(path, layout) as records:
+            return sum(row[0] for row in records.rows(("id",)))
+
+    print(f"{count:,} records of {layout.stride} bytes")
+    expected = measure("str slicing, count city", str_kolkata)
+    assert measure("record windows, count city", window_kolkata) == expected
+    assert measure("column(), count city", column_kolkata) == expected
+    total = measure("str slicing, sum of scores", str_scores)
+    assert measure("column(), sum of scores", column_scores) == total
+    assert measure("rows(), sum of ids", rows_ids) == count * (count - 1) // 2
+    if np is not None:
+        def numpy_scores():
+            with RecordFile(path, layout) as records:
+                return int(records.column_array("score").astype(int).sum())
+        assert measure("column_array(), scores", numpy_scores) == total
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    name = ByteWindow(b"Jotiraditya Hazra")
+    b = ByteWindow(b"popcorn")
+    print(name[0:7], b[-4:-2], name[4:5], name[4], b[:-2])
+    print([str(part) for part in ByteWindow(b"Jotiraditya").split("i")])
+    print(ByteWindow(b"aJotiradityaa").strip("a"))
+
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,391 @@
+# Batch string-transform pipeline
+#
+# String_Methods.py calls upper(), lower(), strip(), replace(), split(),
+# title() and count() one at a time on one string. Applying the same chain
+# to millions of lines that way costs one Python-level step per method per
+# line, and every replace() scans the whole line again.
+#
+# Here a chain is declared once:
+#
+#     clean = Pipeline().strip().lower().replace("a", "4").replace("e", "3")
+#
+# and compiled before it runs:
+#   - a run of single-character replaces becomes one str.translate table
+#   - other replaces that cannot affect each other become one regex pass
+#   - every step becomes one C-level callable (str method, methodcaller,
+#     pattern.sub) and a chunk of lines goes through one map() per step,
+#     chained lazily, so the chain is not interpreted per line
+#
+# clean.map(lines) is lazy: it reads the input chunk by chunk, and with
+# workers=N the chunks go to a process pool.
+#
+# Run:  python string_pipeline.py            -> checks + benchmark (1M lines)
+#       python string_pipeline.py 200000     -> benchmark with fewer lines
+
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
+from operator import methodcaller
+
+# Lines handed to the kernel (and to each worker task) at a time
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Steps that end the chain: their result is not a str any more
+_TERMINAL = {"split", "count"}
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+class Pipeline:
+    """
+    An immutable chain of str methods. Every method returns a new pipeline.
+
+    Example:
+        words = Pipeline().strip().lower().replace(",", "").split()
+        words("  Hello, World ")        # ['hello', 'world']
+        list(words.map(lines))          # one list per line, lazily
+    """
+
+    __slots__ = ("steps",)
+
+    def __init__(self, steps=()):
+        self.steps = tuple(steps)
+
+    def _then(self, *step):
+        if self.steps and self.steps[-1][0] in _TERMINAL:
+            raise ValueError(f"nothing can follow {self.steps[-1][0]}()")
+        return Pipeline(self.steps + (step,))
+
+    def __repr__(self):
+        return "Pipeline()" + "".join(
+            f".{name}({', '.join(map(repr, args))})"
+            for name, *args in self.steps)
+
+    # ------------------------------------------------------------------------
+    # The String_Methods.py operations
+    # ------------------------------------------------------------------------
+
+    def upper(self):
+        return self._then("upper")
+
+    def lower(self):
+        return self._then("lower")
+
+    def title(self):
+        return self._then("title")
+
+    def capitalize(self):
+        return self._then("capitalize")
+
+    def strip(self, chars=None):
+        return self._then("strip", chars)
+
+    def lstrip(self, chars=None):
+        return self._then("lstrip", chars)
+
+    def rstrip(self, chars=None):
+        return self._then("rstrip", chars)
+
+    def replace(self, old, new, count=-1):
+        return self._then("replace", old, new, count)
+
+    def split(self, sep=None, maxsplit=-1):
+        """Ends the chain: every line becomes a list."""
+        return self._then("split", sep, maxsplit)
+
+    def count(self, sub):
+        """Ends the chain: every line becomes an int."""
+        return self._then("count", sub)
+
+    # ------------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------------
+
+    def __call__(self, text):
+        """Applies the chain to one string."""
+        return _compile(self.steps)[0](text)
+
+    def apply(self, lines):
+        """Applies the chain to a list of lines at once."""
+        return _compile(self.steps)[1](lines)
+
+    def map(self, lines, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Applies the chain lazily to any iterable of lines.
+
+        Args:
+            lines: Iterable of str (a file, a generator, a list)
+            workers: Processes to use; the pool is only started when the
+                     input is longer than one chunk
+            chunk_size: Lines per chunk / per worker task
+
+        Yields:
+            One result per line, in input order
+        """
+        kernel = _compile(self.steps)[1]
+        lines = iter(lines)
+        chunks = iter(lambda: list(islice(lines, chunk_size)), [])
+
+        first = next(chunks, None)
+        if first is None:
+            return
+        second = next(chunks, None)
+        if second is None or not workers or workers < 2:
+            yield from kernel(first)
+            if second is not None:
+                yield from kernel(second)
+                for chunk in chunks:
+                    yield from kernel(chunk)
+            return
+
+        # Keep a bounded number of chunks in flight so a huge generator is
+        # never read ahead completely
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque(pool.submit(_run_chunk, self.steps, chunk)
+                            for chunk in (first, second))
+            for chunk in chunks:
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+                pending.append(pool.submit(_run_chunk, self.steps, chunk))
+            while pending:
+                yield from pending.popleft().result()
+
+    def fused(self):
+        """Returns the fused plan as text (useful to see the fusion)."""
+        return _compile(self.steps)[2]
+
+
+def _run_chunk(steps, chunk):
+    """Worker task: compile (cached per process) and run one chunk."""
+    return _compile(steps)[1](chunk)
+
+
+# ============================================================================
+# FUSION
+# ============================================================================
+
+def _compose_translate(table, old, new):
+    """Adds replace(old, new) (old is one character) after `table`."""
+    composed = {code: value.replace(old, new) for code, value in table.items()}
+    composed.setdefault(ord(old), new)
+    return {code: value for code, value in composed.items()
+            if value != chr(code)}
+
+
+def _can_join(group, old, new):
+    """
+    True if replace(old, new) can run in the same regex pass as the
+    replaces already in `group` and give the same result as running
+    them one after another.
+    """
+    if not old:
+        return False
+    for previous_old, previous_new in group:
+        # An earlier replacement must not produce text the new one matches
+        if set(previous_new) & set(old):
+            return False
+        # Deleting text can glue neighbours into a longer match
+        if not previous_new and len(old) > 1:
+            return False
+        # The patterns must not overlap or contain each other
+        if old != previous_old and (old in previous_old or previous_old in old
+                                    or _overlaps(old, previous_old)):
+            return False
+    return True
+
+
+def _overlaps(a, b):
+    for size in range(1, min(len(a), len(b))):
+        if a[-size:] == b[:size] or b[-size:] == a[:size]:
+            return True
+    return False
+
+
+def _plan(steps):
+    """
+    Groups the steps into fused operations.
+
+    Returns:
+        List of ("call", name, args), ("translate", table) or
+        ("regex", pattern, replacements)
+    """
+    plan = []
+    index = 0
+    while index < len(steps):
+        name, *args = steps[index]
+        if name != "replace" or args[2] != -1:
+            plan.append(("call", name, tuple(args)))
+            index += 1
+            continue
+
+        # A run of single-character replaces: one translate table (always
+        # exact, even when one replace feeds the next)
+        table = None
+        while index < len(steps) and steps[index][0] == "replace" \
+                and steps[index][3] == -1 and len(steps[index][1]) == 1:
+            table = _compose_translate(table or {}, steps[index][1],
+                                       steps[index][2])
+            index += 1
+        if table is not None:
+            plan.append(("translate", table))
+            continue
+
+        # Longer replaces: as many as can share one regex pass
+        group = []
+        while index < len(steps) and steps[index][0] == "replace" \
+                and steps[index][3] == -1 \
+                and _can_join(group, steps[index][1], steps[index][2]):
+            group.append(steps[index][1:3])
+            index += 1
+        if len(group) == 1:
+            plan.append(("call", "replace", tuple(group[0])))
+        elif group:
+            replacements = {}
+            for old, new in group:
+                replacements.setdefault(old, new)
+            pattern = re.compile("|".join(map(re.escape, replacements)))
+            plan.append(("regex", pattern, replacements))
+        else:
+            plan.append(("call", "replace", tuple(args)))
+            index += 1
+    return plan
+
+
+def _line_function(operation):
+    """One fused operation as a function of one line."""
+    kind = operation[0]
+    if kind == "call":
+        _, name, args = operation
+        return methodcaller(name, *args) if args else getattr(str, name)
+    if kind == "translate":
+        return methodcaller("translate", operation[1])
+    _, pattern, replacements = operation
+    return partial(pattern.sub, lambda match: replacements[match[0]])
+
+
+def _describe(operation):
+    kind = operation[0]
+    if kind == "call":
+        return f"{operation[1]}({', '.join(map(repr, operation[2]))})"
+    if kind == "translate":
+        return f"translate({len(operation[1])} chars)"
+    return f"regex({operation[1].pattern!r})"
+
+
+@lru_cache(maxsize=256)
+def _compile(steps):
+    """
+    Turns a pipeline into functions. Every fused operation is a C-level
+    callable (an unbound str method, methodcaller or pattern.sub), and a
+    batch is one map() per operation, chained lazily, so the lines pass
+    through the whole chain without a Python-level loop.
+
+    Returns:
+        (function of one line, function of a list of lines, plan as text)
+    """
+    plan = _plan(steps)
+    functions = tuple(map(_line_function, plan))
+
+    def one(text):
+        for function in functions:
+            text = function(text)
+        return text
+
+    def many(lines):
+        for function in functions:
+            lines = map(function, lines)
+        return list(lines)
+
+    return one, many, " | ".join(map(_describe, plan))
+
+
+# ============================================================================
+# MAIN EXECUTION - checks + benchmark
+# ============================================================================
+
+def _apply_naive(steps, text):
+    """The steps one by one, like String_Methods.py."""
+    for name, *args in steps:
+        text = getattr(text, name)(*args)
+    return text
+
+
+def _benchmark(size):
+    import os
+    import random
+    import time
+
+    rng = random.Random(7)
+    words = ["intro", "to", "Python", "Jotiraditya", "hello", "world",
+             "popcorn", "strings", "are", "fun"]
+    lines = ["  " + " ".join(rng.choice(words) for _ in range(8)) + "  "
+             for _ in range(size)]
+    chain = (Pipeline().strip().lower().replace("a", "4").replace("e", "3")
+             .replace("o", "0").replace("python", "py")
+             .replace("hell0", "hi").title())
+    print(f"plan: {chain.fused()}")
+
+    start = time.perf_counter()
+    expected = [_apply_naive(chain.steps, line) for line in lines]
+    naive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = list(chain.map(iter(lines)))
+    fused = time.perf_counter() - start
+    assert result == expected
+
+    print(f"{size:,} lines, {len(chain.steps)} steps")
+    print(f"one method at a time : {naive:6.2f}s")
+    print(f"fused, lazy          : {fused:6.2f}s  ({naive / fused:.1f}x)")
+
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        print("fused, process pool  : skipped (one CPU)")
+        return
+    start = time.perf_counter()
+    result = list(chain.map(iter(lines), workers=workers, chunk_size=50_000))
+    pooled = time.perf_counter() - start
+    assert result == expected
+    print(f"fused, {workers} processes   : {pooled:6.2f}s  "
+          f"({naive / pooled:.1f}x)")
+
+
+if __name__ == "__main__":
+    import random
+    import sys
+
+    a = "Jotiraditya"
+    blog = "intro to Python"
+    print(Pipeline().strip("a")(a), Pipeline().replace(a, "Joti")(a),
+          Pipeline().split("i")(a), Pipeline().title()(blog),
+          Pipeline().count("o")(blog))
+
+    # Fused chains must give exactly what the methods give one by one
+    rng = random.Random(0)
+    alphabet = "abcab xy"
+    for _ in range(20_000):
+        steps = []
+        for _ in range(rng.randrange(1, 6)):
+            roll = rng.random()
+            if roll < 0.7:
+                old = "".join(rng.choice(alphabet)
+                              for _ in range(rng.randrange(1, 3)))
+                new = "".join(rng.choice(alphabet)
+                              for _ in range(rng.randrange(0, 3)))
+                steps.append(("replace", old, new, -1))
+            elif roll < 0.85:
+                steps.append(("upper",) if rng.random() < 0.5 else ("lower",))
+            else:
+                steps.append(("strip", rng.choice([None, "a", "xy"])))
+        pipeline = Pipeline(steps)
+        texts = ["".join(rng.choice(alphabet + "AB")
+                         for _ in range(rng.randrange(12))) for _ in range(5)]
+        assert pipeline.apply(texts) == [_apply_naive(steps, text)
+                                         for text in texts], (steps, texts)
+    print("Fused pipelines match the step-by-step methods")
+
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -13,6 +13,7 @@
 # 7. Lambda functions
 # 8. Docstrings
 # 9. Scope (local vs global)
+# 10. Higher-order functions (functions as arguments)
 
 
 
@@ -71,11 +72,21 @@ def calculate_average(*numbers):
     """
     Calculates average of any number of arguments.
     *args allows passing any number of positional arguments.
+    Thin wrapper over running_stats.RunningStats; use that directly for
+    streams that are too big to unpack.
     """
+    try:
+        from .running_stats import RunningStats
+    except ImportError:  # running this file directly
+        from running_stats import RunningStats
     if len(numbers) == 0:
         return 0
-    total = sum(numbers)
-    return total / len(numbers)
+    try:
+        return RunningStats.from_values(numbers).mean
+    except TypeError:
+        # Values RunningStats cannot take: plain sum() / len()
+        total = sum(numbers)
+        return total / len(numbers)
 
 
 # ============================================================================
@@ -125,6 +136,8 @@ multiply = lambda x, y: x * y
 # 9. SCOPE - Local vs Global Variables
 # ============================================================================
 
+# A global like this is not safe to share between threads or processes;
+# for a real request counter, see counters.py
 global_counter = 0  # Global variable
 
 def demonstrate_scope():
@@ -136,6 +149,18 @@ def demonstrate_scope():
     print(f"Global counter: {global_counter}")
 
 
+# ============================================================================
+# 10. HIGHER-ORDER FUNCTIONS - Functions as arguments
+# ============================================================================
+
+def apply_operation(x, y, operation):
+    """
+    Applies a given operation function to two numbers.
+    For whole columns of numbers, see operator_executor.apply_columns.
+    """
+    return operation(x, y)
+
+
 # ============================================================================
 # COMPREHENSIVE EXAMPLE - Student Management System
 # ============================================================================
@@ -260,10 +285,6 @@ if __name__ == "__main__":
     print(f"\nNested function result: {outer_function('hello world')}")
     
     # Example 3: Function as argument (Higher-order function)
-    def apply_operation(x, y, operation):
-        """Applies a given operation function to two numbers."""
-        return operation(x, y)
-    
     result1 = apply_operation(10, 5, lambda a, b: a + b)
     result2 = apply_operation(10, 5, lambda a, b: a * b)
     print(f"\nApplying addition: {result1}")
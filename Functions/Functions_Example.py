@@ -1,22 +1,29 @@
- 
 
 # Q1 - Write a function to greet the user
 
 def greet():
     print("hello")
 
-greet()
 
-# Q2 - write a function greet the user 3 three times
+# Q3 - write a function that returns the square of a number
+
+def square(num):
+    return num * num
+
 
-for i in range(3):
+def main():
     greet()
 
+    # Q2 - write a function greet the user 3 three times
 
-# Q3 - write a function that returns the square of a number
+    for i in range(3):
+        greet()
+
+    # Q3 - ask for a number and print its square
+
+    num = int(input("Enter a number: "))
+    print(square(num))
 
-num = int(input("Enter a number: "))
-def square(num):
-    return num * num
 
-print(square(num))
+if __name__ == "__main__":
+    main()
@@ -14,13 +14,19 @@ Instructions:
 Let's begin! 🚀
 """
 
+try:
+    from .char_classes import DEFAULT_POLICY, count_class
+except ImportError:  # running this file directly
+    from char_classes import DEFAULT_POLICY, count_class
+
 # ============================================================================
 # LEVEL 1: BEGINNER - Basic Function Concepts
 # ============================================================================
 
-print("=" * 70)
-print("LEVEL 1: BEGINNER - Basic Function Concepts")
-print("=" * 70)
+if __name__ == "__main__":
+    print("=" * 70)
+    print("LEVEL 1: BEGINNER - Basic Function Concepts")
+    print("=" * 70)
 
 # ----------------------------------------------------------------------------
 # Question 1: Simple Function
@@ -35,8 +41,9 @@ def say_hello():
     print("Hello, Python!")
 
 # Test your function:
-say_hello()
-print()
+if __name__ == "__main__":
+    say_hello()
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -52,9 +59,10 @@ def greet_person(name):
     print(f"Hello, {name}! Welcome to Python!")
 
 # Test your function:
-greet_person("Alice")
-greet_person("Bob")
-print()
+if __name__ == "__main__":
+    greet_person("Alice")
+    greet_person("Bob")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -70,10 +78,11 @@ def add(a, b):
     return a + b
 
 # Test your function:
-result = add(5, 3)
-print(f"5 + 3 = {result}")
-print(f"10 + 20 = {add(10, 20)}")
-print()
+if __name__ == "__main__":
+    result = add(5, 3)
+    print(f"5 + 3 = {result}")
+    print(f"10 + 20 = {add(10, 20)}")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -89,9 +98,10 @@ def calculate_area(length, width):
     return length * width
 
 # Test your function:
-area = calculate_area(5, 4)
-print(f"Area of rectangle (5x4): {area}")
-print()
+if __name__ == "__main__":
+    area = calculate_area(5, 4)
+    print(f"Area of rectangle (5x4): {area}")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -108,18 +118,20 @@ def is_even(number):
     return number % 2 == 0
 
 # Test your function:
-print(f"Is 4 even? {is_even(4)}")
-print(f"Is 7 even? {is_even(7)}")
-print()
+if __name__ == "__main__":
+    print(f"Is 4 even? {is_even(4)}")
+    print(f"Is 7 even? {is_even(7)}")
+    print()
 
 
 # ============================================================================
 # LEVEL 2: INTERMEDIATE - More Complex Functions
 # ============================================================================
 
-print("=" * 70)
-print("LEVEL 2: INTERMEDIATE - More Complex Functions")
-print("=" * 70)
+if __name__ == "__main__":
+    print("=" * 70)
+    print("LEVEL 2: INTERMEDIATE - More Complex Functions")
+    print("=" * 70)
 
 # ----------------------------------------------------------------------------
 # Question 6: Function with Default Parameters
@@ -135,10 +147,11 @@ def create_greeting(name, greeting="Hello"):
     return f"{greeting}, {name}!"
 
 # Test your function:
-print(create_greeting("Alice"))
-print(create_greeting("Bob", "Hi"))
-print(create_greeting("Charlie", "Good morning"))
-print()
+if __name__ == "__main__":
+    print(create_greeting("Alice"))
+    print(create_greeting("Bob", "Hi"))
+    print(create_greeting("Charlie", "Good morning"))
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -152,16 +165,37 @@ Hint: return min_value, max_value
 
 # YOUR CODE HERE:
 def get_stats(numbers):
-    if not numbers:
+    # Thin wrapper over RunningStats, which also takes generators and
+    # endless streams; imported here so importing this file stays cheap
+    try:
+        from .running_stats import RunningStats
+    except ImportError:  # running this file directly
+        from running_stats import RunningStats
+    try:
+        stats = RunningStats.from_values(numbers)
+    except TypeError:
+        # Values that cannot be added up (e.g. strings) can still be
+        # ordered: fall back to the built-ins for such a list
+        if not numbers:
+            return None, None
+        return min(numbers), max(numbers)
+    if stats.count == 0:
         return None, None
-    return min(numbers), max(numbers)
+    return stats.min, stats.max
+
+# Simple solution (two passes over the list):
+# def get_stats(numbers):
+#     if not numbers:
+#         return None, None
+#     return min(numbers), max(numbers)
 
 # Test your function:
-nums = [45, 23, 67, 89, 12, 34]
-min_val, max_val = get_stats(nums)
-print(f"Numbers: {nums}")
-print(f"Min: {min_val}, Max: {max_val}")
-print()
+if __name__ == "__main__":
+    nums = [45, 23, 67, 89, 12, 34]
+    min_val, max_val = get_stats(nums)
+    print(f"Numbers: {nums}")
+    print(f"Min: {min_val}, Max: {max_val}")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -191,11 +225,12 @@ def get_grade(score):
         return 'F'
 
 # Test your function:
-print(f"Score 95: Grade {get_grade(95)}")
-print(f"Score 85: Grade {get_grade(85)}")
-print(f"Score 72: Grade {get_grade(72)}")
-print(f"Score 55: Grade {get_grade(55)}")
-print()
+if __name__ == "__main__":
+    print(f"Score 95: Grade {get_grade(95)}")
+    print(f"Score 85: Grade {get_grade(85)}")
+    print(f"Score 72: Grade {get_grade(72)}")
+    print(f"Score 55: Grade {get_grade(55)}")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -209,17 +244,22 @@ Hint: Loop through the string and check each character
 
 # YOUR CODE HERE:
 def count_vowels(text):
-    vowels = "aeiouAEIOU"
-    count = 0
-    for char in text:
-        if char in vowels:
-            count += 1
-    return count
+    return count_class(text, "vowel")
+
+# Loop solution (counts the same thing one character at a time):
+# def count_vowels(text):
+#     vowels = "aeiouAEIOU"
+#     count = 0
+#     for char in text:
+#         if char in vowels:
+#             count += 1
+#     return count
 
 # Test your function:
-print(f"Vowels in 'Hello': {count_vowels('Hello')}")
-print(f"Vowels in 'Python Programming': {count_vowels('Python Programming')}")
-print()
+if __name__ == "__main__":
+    print(f"Vowels in 'Hello': {count_vowels('Hello')}")
+    print(f"Vowels in 'Python Programming': {count_vowels('Python Programming')}")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -242,20 +282,22 @@ def calculate_total(prices, discount=0):
     return total - discount_amount
 
 # Test your function:
-prices = [10, 20, 30, 15]
-print(f"Prices: {prices}")
-print(f"Total (no discount): ${calculate_total(prices)}")
-print(f"Total (10% discount): ${calculate_total(prices, 10)}")
-print()
+if __name__ == "__main__":
+    prices = [10, 20, 30, 15]
+    print(f"Prices: {prices}")
+    print(f"Total (no discount): ${calculate_total(prices)}")
+    print(f"Total (10% discount): ${calculate_total(prices, 10)}")
+    print()
 
 
 # ============================================================================
 # LEVEL 3: ADVANCED - Complex Functions
 # ============================================================================
 
-print("=" * 70)
-print("LEVEL 3: ADVANCED - Complex Functions")
-print("=" * 70)
+if __name__ == "__main__":
+    print("=" * 70)
+    print("LEVEL 3: ADVANCED - Complex Functions")
+    print("=" * 70)
 
 # ----------------------------------------------------------------------------
 # Question 11: Function with *args
@@ -276,10 +318,11 @@ def multiply_all(*args):
     return result
 
 # Test your function:
-print(f"multiply_all(2, 3, 4) = {multiply_all(2, 3, 4)}")
-print(f"multiply_all(5, 2) = {multiply_all(5, 2)}")
-print(f"multiply_all(1, 2, 3, 4, 5) = {multiply_all(1, 2, 3, 4, 5)}")
-print()
+if __name__ == "__main__":
+    print(f"multiply_all(2, 3, 4) = {multiply_all(2, 3, 4)}")
+    print(f"multiply_all(5, 2) = {multiply_all(5, 2)}")
+    print(f"multiply_all(1, 2, 3, 4, 5) = {multiply_all(1, 2, 3, 4, 5)}")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -298,9 +341,10 @@ def create_profile(**kwargs):
     return "Profile: " + ", ".join(profile_parts)
 
 # Test your function:
-print(create_profile(name="Alice", age=25, city="NYC"))
-print(create_profile(name="Bob", occupation="Developer", experience=5))
-print()
+if __name__ == "__main__":
+    print(create_profile(name="Alice", age=25, city="NYC"))
+    print(create_profile(name="Bob", occupation="Developer", experience=5))
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -315,10 +359,11 @@ its square. Then use it to square the numbers: 5, 10, 15
 square = lambda x: x ** 2
 
 # Test your function:
-print(f"Square of 5: {square(5)}")
-print(f"Square of 10: {square(10)}")
-print(f"Square of 15: {square(15)}")
-print()
+if __name__ == "__main__":
+    print(f"Square of 5: {square(5)}")
+    print(f"Square of 10: {square(10)}")
+    print(f"Square of 15: {square(15)}")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -342,10 +387,11 @@ def filter_positive(numbers):
 #     return result
 
 # Test your function:
-numbers = [-5, 10, -3, 0, 7, -2, 15]
-print(f"Original: {numbers}")
-print(f"Positive only: {filter_positive(numbers)}")
-print()
+if __name__ == "__main__":
+    numbers = [-5, 10, -3, 0, 7, -2, 15]
+    print(f"Original: {numbers}")
+    print(f"Positive only: {filter_positive(numbers)}")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -365,19 +411,21 @@ def factorial(n):
     return n * factorial(n - 1)
 
 # Test your function:
-print(f"Factorial of 5: {factorial(5)}")
-print(f"Factorial of 0: {factorial(0)}")
-print(f"Factorial of 7: {factorial(7)}")
-print()
+if __name__ == "__main__":
+    print(f"Factorial of 5: {factorial(5)}")
+    print(f"Factorial of 0: {factorial(0)}")
+    print(f"Factorial of 7: {factorial(7)}")
+    print()
 
 
 # ============================================================================
 # LEVEL 4: PROJECT-BASED - Real-World Applications
 # ============================================================================
 
-print("=" * 70)
-print("LEVEL 4: PROJECT-BASED - Real-World Applications")
-print("=" * 70)
+if __name__ == "__main__":
+    print("=" * 70)
+    print("LEVEL 4: PROJECT-BASED - Real-World Applications")
+    print("=" * 70)
 
 # ----------------------------------------------------------------------------
 # Question 16: Temperature Converter
@@ -405,10 +453,11 @@ def temperature_converter(temp, unit):
         return None
 
 # Test your function:
-print(f"32°F to Celsius: {temperature_converter(32, 'F'):.2f}°C")
-print(f"0°C to Fahrenheit: {temperature_converter(0, 'C'):.2f}°F")
-print(f"100°C to Fahrenheit: {temperature_converter(100, 'C'):.2f}°F")
-print()
+if __name__ == "__main__":
+    print(f"32°F to Celsius: {temperature_converter(32, 'F'):.2f}°C")
+    print(f"0°C to Fahrenheit: {temperature_converter(0, 'C'):.2f}°F")
+    print(f"100°C to Fahrenheit: {temperature_converter(100, 'C'):.2f}°F")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -427,21 +476,27 @@ Password requirements:
 
 # YOUR CODE HERE:
 def validate_password(password):
-    if len(password) < 8:
-        return False
-    
-    has_upper = any(char.isupper() for char in password)
-    has_lower = any(char.islower() for char in password)
-    has_digit = any(char.isdigit() for char in password)
-    
-    return has_upper and has_lower and has_digit
+    # One pass over the password; the rules live in char_classes.PasswordPolicy
+    return DEFAULT_POLICY.check(password)
+
+# Solution with any() (three passes over the password):
+# def validate_password(password):
+#     if len(password) < 8:
+#         return False
+#
+#     has_upper = any(char.isupper() for char in password)
+#     has_lower = any(char.islower() for char in password)
+#     has_digit = any(char.isdigit() for char in password)
+#
+#     return has_upper and has_lower and has_digit
 
 # Test your function:
-print(f"'Password123' is valid: {validate_password('Password123')}")
-print(f"'weak' is valid: {validate_password('weak')}")
-print(f"'NoDigitHere' is valid: {validate_password('NoDigitHere')}")
-print(f"'nouppercase123' is valid: {validate_password('nouppercase123')}")
-print()
+if __name__ == "__main__":
+    print(f"'Password123' is valid: {validate_password('Password123')}")
+    print(f"'weak' is valid: {validate_password('weak')}")
+    print(f"'NoDigitHere' is valid: {validate_password('NoDigitHere')}")
+    print(f"'nouppercase123' is valid: {validate_password('nouppercase123')}")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -470,11 +525,12 @@ def calculate_cart_total(items, tax_rate=0.08, discount=0):
     return final_total
 
 # Test your function:
-cart = {'apple': 2.50, 'banana': 1.50, 'orange': 3.00}
-print(f"Cart items: {cart}")
-print(f"Total (no discount): ${calculate_cart_total(cart):.2f}")
-print(f"Total (10% discount): ${calculate_cart_total(cart, discount=10):.2f}")
-print()
+if __name__ == "__main__":
+    cart = {'apple': 2.50, 'banana': 1.50, 'orange': 3.00}
+    print(f"Cart items: {cart}")
+    print(f"Total (no discount): ${calculate_cart_total(cart):.2f}")
+    print(f"Total (10% discount): ${calculate_cart_total(cart, discount=10):.2f}")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -514,11 +570,12 @@ def analyze_text(text):
     }
 
 # Test your function:
-sample_text = "Hello world! This is Python. Functions are great?"
-analysis = analyze_text(sample_text)
-print(f"Text: '{sample_text}'")
-print(f"Analysis: {analysis}")
-print()
+if __name__ == "__main__":
+    sample_text = "Hello world! This is Python. Functions are great?"
+    analysis = analyze_text(sample_text)
+    print(f"Text: '{sample_text}'")
+    print(f"Analysis: {analysis}")
+    print()
 
 
 # ----------------------------------------------------------------------------
@@ -557,26 +614,28 @@ def check_guess(secret, guess, attempts_left):
     }
 
 # Test your function:
-secret_num = 42
-print(f"Secret number: {secret_num}")
-result1 = check_guess(secret_num, 50, 5)
-print(f"Guess 50: {result1}")
+if __name__ == "__main__":
+    secret_num = 42
+    print(f"Secret number: {secret_num}")
+    result1 = check_guess(secret_num, 50, 5)
+    print(f"Guess 50: {result1}")
 
-result2 = check_guess(secret_num, 30, 4)
-print(f"Guess 30: {result2}")
+    result2 = check_guess(secret_num, 30, 4)
+    print(f"Guess 30: {result2}")
 
-result3 = check_guess(secret_num, 42, 3)
-print(f"Guess 42: {result3}")
-print()
+    result3 = check_guess(secret_num, 42, 3)
+    print(f"Guess 42: {result3}")
+    print()
 
 
 # ============================================================================
 # BONUS CHALLENGES - Test Your Mastery!
 # ============================================================================
 
-print("=" * 70)
-print("BONUS CHALLENGES - Test Your Mastery!")
-print("=" * 70)
+if __name__ == "__main__":
+    print("=" * 70)
+    print("BONUS CHALLENGES - Test Your Mastery!")
+    print("=" * 70)
 
 # ----------------------------------------------------------------------------
 # Bonus 1: Function Decorator Pattern
@@ -605,19 +664,21 @@ def slow_function():
     time.sleep(0.1)
     return "Done!"
 
-print("Testing timer decorator:")
-slow_function()
-print()
+if __name__ == "__main__":
+    print("Testing timer decorator:")
+    slow_function()
+    print()
 
 
 # ============================================================================
 # SUMMARY AND NEXT STEPS
 # ============================================================================
 
-print("=" * 70)
-print("🎉 CONGRATULATIONS! You've completed the practice questions!")
-print("=" * 70)
-print("""
+if __name__ == "__main__":
+    print("=" * 70)
+    print("🎉 CONGRATULATIONS! You've completed the practice questions!")
+    print("=" * 70)
+    print("""
 Next Steps:
 1. Review any questions you found difficult
 2. Try modifying the functions to add new features
@@ -627,4 +688,3 @@ Next Steps:
 
 Remember: Practice makes perfect! Keep coding! 🚀
 """)
-
@@ -0,0 +1,100 @@
+"""
+Functions package
+=================
+
+Importing this package is cheap: nothing is loaded until a name is used.
+Each function is imported from its module the first time it is accessed
+(through the module level `__getattr__`), and then cached here.
+
+Example:
+    import Functions
+    Functions.analyze_text("Hello world!")   # loads PRACTICE_QUESTIONS now
+
+The demos and the interactive programs only run through their entry
+points, e.g. `python -m Functions practice`.
+"""
+
+import importlib
+
+# name -> submodule it lives in
+_LAZY_NAMES = {
+    # Functions.py
+    "greet": "Functions",
+    "greet_person": "Functions",
+    "add_numbers": "Functions",
+    "greet_with_title": "Functions",
+    "calculate_average": "Functions",
+    "display_student_info": "Functions",
+    "create_profile": "Functions",
+    "square": "Functions",
+    "multiply": "Functions",
+    "apply_operation": "Functions",
+    "demonstrate_scope": "Functions",
+    "student_management_system": "Functions",
+
+    # PRACTICE_QUESTIONS.py
+    "say_hello": "PRACTICE_QUESTIONS",
+    "add": "PRACTICE_QUESTIONS",
+    "calculate_area": "PRACTICE_QUESTIONS",
+    "is_even": "PRACTICE_QUESTIONS",
+    "create_greeting": "PRACTICE_QUESTIONS",
+    "get_stats": "PRACTICE_QUESTIONS",
+    "get_grade": "PRACTICE_QUESTIONS",
+    "count_vowels": "PRACTICE_QUESTIONS",
+    "calculate_total": "PRACTICE_QUESTIONS",
+    "multiply_all": "PRACTICE_QUESTIONS",
+    "filter_positive": "PRACTICE_QUESTIONS",
+    "factorial": "PRACTICE_QUESTIONS",
+    "temperature_converter": "PRACTICE_QUESTIONS",
+    "validate_password": "PRACTICE_QUESTIONS",
+    "calculate_cart_total": "PRACTICE_QUESTIONS",
+    "analyze_text": "PRACTICE_QUESTIONS",
+    "check_guess": "PRACTICE_QUESTIONS",
+
+    # Engines built on top of the practice functions
+    "TextStats": "text_stream",
+    "analyze_stream": "text_stream",
+    "analyze_file": "text_stream",
+    "analyze_file_parallel": "text_parallel",
+    "count_vowels_file": "text_parallel",
+    "GradeScale": "grading",
+    "grade_batch": "grading",
+    "StudentStore": "student_store",
+    "FactorialEngine": "factorial_engine",
+    "binomial": "factorial_engine",
+    "ProfileRegistry": "profiling",
+    "CharClassifier": "char_classes",
+    "PasswordPolicy": "char_classes",
+    "PriceIndex": "cart_pricing",
+    "price_batch": "cart_pricing",
+    "RunningStats": "running_stats",
+    "convert_batch": "temperature",
+    "convert_lines": "temperature",
+    "product": "products",
+    "log_product": "products",
+    "TextIndex": "text_index",
+    "memoize": "memoize",
+    "apply_to_pure_functions": "memoize",
+    "OperatorExecutor": "operator_executor",
+    "apply_columns": "operator_executor",
+    "Stream": "lazy_pipeline",
+    "Leaderboard": "ranking",
+    "ShardedCounter": "counters",
+    "SharedCounter": "counters",
+    "count_calls": "counters",
+}
+
+__all__ = sorted(_LAZY_NAMES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value  # next access skips __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
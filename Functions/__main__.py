@@ -0,0 +1,30 @@
+"""
+Entry points for the demos and interactive programs.
+
+Usage:
+    python -m Functions practice   # PRACTICE_QUESTIONS.py test prints
+    python -m Functions functions  # student management system demo
+    python -m Functions example    # interactive Functions_Example.py
+"""
+
+import runpy
+import sys
+
+DEMOS = {
+    "practice": "PRACTICE_QUESTIONS",
+    "functions": "Functions",
+    "example": "Functions_Example",
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1 or argv[0] not in DEMOS:
+        print(__doc__.strip())
+        return 2
+    runpy.run_module(f"Functions.{DEMOS[argv[0]]}", run_name="__main__")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""
+Bulk Cart Pricing
+=================
+
+`calculate_cart_total` (PRACTICE_QUESTIONS.py) prices one dict-based cart
+at a time with floats. This engine reprices many carts at once:
+
+- Catalog prices are stored once, in integer cents, in a PriceIndex.
+- A cart is a list of item ids (an item repeated = quantity > 1).
+- Subtotal, discount and tax are computed with integers only, so the
+  result is the same on every machine. The total is rounded to the cent
+  once (half up), like rounding `calculate_cart_total` to 2 places; the
+  tax is whatever makes subtotal - discount + tax equal that total.
+  The float version can only disagree on exact half-cent totals, where
+  float noise decides which way it rounds.
+- With NumPy installed the whole batch is priced with array operations.
+  Without it, carts are priced one by one in a plain loop (no faster than
+  a per-cart loop of `calculate_cart_total`); very large batches can be
+  spread over a process pool.
+- Prices must not be negative, discounts are 0-100 % and tax rates 0-1,
+  which keeps every amount non-negative and inside int64 on NumPy.
+
+Example:
+    index = PriceIndex({'apple': 2.50, 'banana': 1.50, 'orange': 3.00})
+    carts = [index.ids(['apple', 'banana', 'orange'])]
+    price_batch(index, carts, discount=10).total   # [680]  -> $6.80
+"""
+
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Tax rates and discounts are stored as integers in units of 1/RATE_SCALE
+# of the price (0.001 %), so e.g. an 8.875 % tax is exactly 8875
+RATE_SCALE = 100_000
+
+# Largest subtotal (in cents) the int64 NumPy path can handle without
+# overflow: subtotal * (RATE_SCALE - discount) * (RATE_SCALE + tax), with
+# 0 <= discount <= RATE_SCALE and 0 <= tax <= RATE_SCALE (checked by _rates)
+_INT64_SAFE_SUBTOTAL = (2 ** 63 - 1) // (RATE_SCALE * 2 * RATE_SCALE)
+
+CartTotal = namedtuple("CartTotal", "subtotal discount tax total")
+CartTotal.__doc__ = "Amounts in integer cents for one cart."
+
+PricedBatch = namedtuple("PricedBatch", "subtotal discount tax total")
+PricedBatch.__doc__ = ("Column of amounts in integer cents for every cart "
+                       "(array.array, or NumPy arrays on the NumPy path).")
+
+
+# ============================================================================
+# CONVERSIONS
+# ============================================================================
+
+def to_cents(price):
+    """Converts a price like 2.5 or "2.50" to integer cents (250)."""
+    cents = Decimal(str(price)) * 100
+    if cents < 0:
+        raise ValueError(f"price {price!r} is negative")
+    if cents != cents.to_integral_value():
+        raise ValueError(f"price {price!r} has fractions of a cent")
+    return int(cents)
+
+
+def _rate_units(rate, name):
+    units = Decimal(str(rate)) * RATE_SCALE
+    if units != units.to_integral_value():
+        raise ValueError(f"{name} {rate!r} is more precise than "
+                         f"1/{RATE_SCALE}")
+    return int(units)
+
+
+def _rates(tax_rate, discount):
+    """Validates the rates and converts them to 1/RATE_SCALE units."""
+    if not 0 <= discount <= 100:
+        raise ValueError(f"discount must be between 0 and 100 (percent), "
+                         f"not {discount!r}")
+    if not 0 <= tax_rate <= 1:
+        raise ValueError(f"tax_rate must be between 0 and 1, not {tax_rate!r}")
+    return (_rate_units(Decimal(str(discount)) / 100, "discount"),
+            _rate_units(tax_rate, "tax_rate"))
+
+
+def _round_div(numerator, denominator):
+    """
+    Integer division rounding half up. Only used on non-negative amounts:
+    prices and rates are validated, so numerators are never negative.
+    """
+    return (numerator + denominator // 2) // denominator
+
+
+# ============================================================================
+# PRICE INDEX
+# ============================================================================
+
+class PriceIndex:
+    """
+    Catalog of item prices in integer cents, addressed by item id.
+
+    Args:
+        catalog: Dict item name -> price (float, Decimal or str)
+    """
+
+    def __init__(self, catalog=None):
+        self.names = []
+        self._ids = {}
+        self.cents = array("q")
+        for name, price in (catalog or {}).items():
+            self.add(name, price)
+        self._np_cents = None
+
+    def add(self, name, price):
+        """Adds (or re-prices) an item and returns its id."""
+        item_id = self._ids.get(name)
+        if item_id is None:
+            item_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+            self.cents.append(to_cents(price))
+        else:
+            self.cents[item_id] = to_cents(price)
+        self._np_cents = None
+        return item_id
+
+    def ids(self, names):
+        """Converts item names to ids."""
+        return [self._ids[name] for name in names]
+
+    def id_of(self, name):
+        return self._ids[name]
+
+    def __len__(self):
+        return len(self.names)
+
+
+# ============================================================================
+# PRICING
+# ============================================================================
+
+def _totals(subtotal, discount_units, tax_units):
+    """Discount, tax and total for one subtotal (Python ints)."""
+    discount = _round_div(subtotal * discount_units, RATE_SCALE)
+    total = _round_div(
+        subtotal * (RATE_SCALE - discount_units) * (RATE_SCALE + tax_units),
+        RATE_SCALE * RATE_SCALE)
+    # Tax is whatever makes the parts add up to the (single-rounded) total
+    tax = total - (subtotal - discount)
+    return discount, tax, total
+
+
+def price_cart(index, cart, tax_rate=0.08, discount=0):
+    """
+    Prices one cart in integer cents.
+
+    Args:
+        index: The PriceIndex
+        cart: Iterable of item ids
+        tax_rate: Tax as a fraction (0.08 = 8%), like calculate_cart_total
+        discount: Discount in percent (10 = 10%), like calculate_cart_total
+
+    Returns:
+        CartTotal(subtotal, discount, tax, total)
+
+    Raises:
+        ValueError: If the discount is outside 0-100 or tax_rate outside 0-1
+    """
+    cents = index.cents
+    subtotal = sum(cents[item_id] for item_id in cart)
+    discount_units, tax_units = _rates(tax_rate, discount)
+    return CartTotal(subtotal, *_totals(subtotal, discount_units, tax_units))
+
+
+def _price_python(args):
+    """Prices carts one at a time, like price_cart (no NumPy)."""
+    cents, carts, discount_units, tax_units = args
+    get = cents.__getitem__
+    columns = PricedBatch(array("q"), array("q"), array("q"), array("q"))
+    add_subtotal, add_discount, add_tax, add_total = \
+        (column.append for column in columns)
+    for cart in carts:
+        subtotal = sum(map(get, cart))
+        discount, tax, total = _totals(subtotal, discount_units, tax_units)
+        add_subtotal(subtotal)
+        add_discount(discount)
+        add_tax(tax)
+        add_total(total)
+    return columns
+
+
+def _price_numpy(index, carts, discount_units, tax_units):
+    if index._np_cents is None:
+        index._np_cents = np.array(index.cents, dtype=np.int64)
+    lengths = np.fromiter((len(cart) for cart in carts), dtype=np.int64,
+                          count=len(carts))
+    flat = np.fromiter((item_id for cart in carts for item_id in cart),
+                       dtype=np.int64, count=int(lengths.sum()))
+
+    # Sum each cart's slice of the flat price column
+    running = np.concatenate(([0], np.cumsum(index._np_cents[flat])))
+    ends = np.cumsum(lengths)
+    subtotal = running[ends] - running[ends - lengths]
+    if subtotal.size and subtotal.max() > _INT64_SAFE_SUBTOTAL:
+        return None  # too large for int64 maths, use Python ints
+
+    scale = RATE_SCALE
+    discount = (subtotal * discount_units + scale // 2) // scale
+    total = ((subtotal * (scale - discount_units) * (scale + tax_units)
+              + scale * scale // 2) // (scale * scale))
+    tax = total - (subtotal - discount)
+    return PricedBatch(subtotal, discount, tax, total)
+
+
+def price_batch(index, carts, tax_rate=0.08, discount=0, workers=None,
+                chunk_size=50_000):
+    """
+    Prices a batch of carts that share one tax rate and discount.
+
+    Args:
+        index: The PriceIndex all carts refer to
+        carts: Sequence of carts, each a sequence of item ids
+        tax_rate: Tax as a fraction (0.08 = 8%)
+        discount: Discount in percent (10 = 10%)
+        workers: Number of processes for the pure-Python path (default:
+                 price in this process)
+        chunk_size: Carts per process-pool task
+
+    Returns:
+        PricedBatch of columns in integer cents, in cart order
+
+    Raises:
+        ValueError: If the discount is outside 0-100 or tax_rate outside 0-1
+    """
+    carts = carts if isinstance(carts, (list, tuple)) else list(carts)
+    discount_units, tax_units = _rates(tax_rate, discount)
+
+    if np is not None:
+        result = _price_numpy(index, carts, discount_units, tax_units)
+        if result is not None:
+            return result
+
+    if not workers or workers == 1 or len(carts) <= chunk_size:
+        return _price_python((index.cents, carts, discount_units, tax_units))
+
+    jobs = [(index.cents, carts[start:start + chunk_size],
+             discount_units, tax_units)
+            for start in range(0, len(carts), chunk_size)]
+    columns = PricedBatch(array("q"), array("q"), array("q"), array("q"))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_price_python, jobs):
+            for column, values in zip(columns, part):
+                column.extend(values)
+    return columns
+
+
+# ============================================================================
+# MAIN EXECUTION - Benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    def calculate_cart_total(items, tax_rate=0.08, discount=0):
+        # Same as PRACTICE_QUESTIONS.py
+        subtotal = sum(items.values())
+        discount_amount = subtotal * (discount / 100)
+        discounted_total = subtotal - discount_amount
+        tax_amount = discounted_total * tax_rate
+        final_total = discounted_total + tax_amount
+        return final_total
+
+    rng = random.Random(7)
+    catalog = {f"item{i}": rng.randint(1, 50_000) / 100 for i in range(10_000)}
+    index = PriceIndex(catalog)
+    names = list(catalog)
+    cart_dicts = [{name: catalog[name] for name in rng.sample(names, 5)}
+                  for _ in range(200_000)]
+    carts = [index.ids(cart) for cart in cart_dicts]
+
+    start = time.perf_counter()
+    expected = [calculate_cart_total(cart, discount=10) for cart in cart_dicts]
+    float_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = price_batch(index, carts, discount=10)
+    batch_time = time.perf_counter() - start
+
+    # Exact half-cent totals are rounded up here; the float version rounds
+    # them either way depending on representation error
+    ties = sum(subtotal * 9 * 108 % 1000 == 500 for subtotal in batch.subtotal)
+    mismatches = sum(f"{value:.2f}" != f"{cents / 100:.2f}"
+                     for value, cents in zip(expected, batch.total))
+    print(f"Carts              : {len(carts):,}")
+    print(f"calculate_cart_total: {len(carts) / float_time:12,.0f} carts/s")
+    print(f"price_batch         : {len(carts) / batch_time:12,.0f} carts/s "
+          f"({'numpy' if np is not None else 'pure python'})")
+    print(f"Totals differing at the cent: {mismatches} "
+          f"(exact half-cent ties: {ties})")
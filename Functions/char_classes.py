@@ -0,0 +1,284 @@
+"""
+Character-Class Engine
+======================
+
+`validate_password` used to make three `any(...)` passes over the password
+and `count_vowels` checked `char in vowels` for every character in Python.
+
+This engine counts every character class (upper, lower, digit, vowel and
+any custom class) in a single translate pass:
+
+1. Each character is mapped to a small code that says which classes it
+   belongs to (e.g. "upper + vowel"). For ASCII text this is a
+   `bytes.translate` with a 256-entry table; other text uses
+   `str.translate` with a table that fills itself in as new characters
+   appear.
+2. Each code is counted with `.count()`, which runs in C.
+
+Example:
+    classifier = CharClassifier()
+    classifier.counts("Password123")
+    # {'upper': 1, 'lower': 7, 'digit': 3, 'vowel': 2}
+
+    policy = PasswordPolicy(min_length=12, min_digit=2)
+    policy.check("Password123")   # False
+"""
+
+# Classes every CharClassifier knows about; a value is either a string of
+# member characters or a predicate taking one character
+DEFAULT_CLASSES = {
+    "upper": str.isupper,
+    "lower": str.islower,
+    "digit": str.isdigit,
+    "vowel": "aeiouAEIOU",
+}
+
+
+class _CodeTable(dict):
+    """str.translate table that computes the code of a character the
+    first time it is seen."""
+
+    def __init__(self, classifier):
+        super().__init__()
+        self._classifier = classifier
+
+    def __missing__(self, ordinal):
+        code = self._classifier._code_char(chr(ordinal))
+        self[ordinal] = code
+        return code
+
+
+# ============================================================================
+# CLASSIFIER
+# ============================================================================
+
+class CharClassifier:
+    """
+    Counts characters per class in one pass.
+
+    Args:
+        classes: Dict of class name -> member string or predicate.
+                 Defaults to DEFAULT_CLASSES.
+    """
+
+    def __init__(self, classes=None):
+        classes = DEFAULT_CLASSES if classes is None else classes
+        self.names = list(classes)
+        self._tests = []
+        for name, members in classes.items():
+            if isinstance(members, str):
+                self._tests.append(frozenset(members).__contains__)
+            elif callable(members):
+                self._tests.append(members)
+            else:
+                raise TypeError(f"class {name!r} must be a string or callable")
+
+        # Each distinct combination of classes (a bit mask) gets a code
+        self._code_of_mask = {0: "\0"}
+        self._mask_of_code = {"\0": 0}
+
+        # ASCII fast path: byte value -> code byte
+        self._byte_table = bytes(
+            ord(self._code_char(chr(byte))) if byte < 128 else 0
+            for byte in range(256))
+        # Codes that can appear in the translated ASCII bytes
+        self._ascii_codes = [(ord(code), mask) for code, mask
+                             in self._mask_of_code.items() if mask]
+        # class name -> code bytes of every ASCII combination containing it
+        self.ascii_class_codes = {
+            name: tuple(code for code, mask in self._ascii_codes
+                        if mask >> bit & 1)
+            for bit, name in enumerate(self.names)}
+        self._str_table = _CodeTable(self)
+
+    def _code_char(self, char):
+        mask = 0
+        for bit, test in enumerate(self._tests):
+            if test(char):
+                mask |= 1 << bit
+        code = self._code_of_mask.get(mask)
+        if code is None:
+            code = chr(len(self._code_of_mask))
+            self._code_of_mask[mask] = code
+            self._mask_of_code[code] = mask
+        return code
+
+    def _mask_counts(self, text):
+        """Returns {class mask: number of characters} for one string."""
+        if isinstance(text, (bytes, bytearray)):
+            text = text.decode("utf-8")
+        if text.isascii():
+            coded = text.encode("ascii").translate(self._byte_table)
+            return {mask: coded.count(code) for code, mask in self._ascii_codes}
+        coded = text.translate(self._str_table)
+        return {mask: coded.count(code)
+                for code, mask in list(self._mask_of_code.items()) if mask}
+
+    def counts(self, text):
+        """
+        Counts the characters of every class in `text`.
+
+        Args:
+            text: A str (or UTF-8 bytes)
+
+        Returns:
+            Dict class name -> count
+        """
+        totals = dict.fromkeys(self.names, 0)
+        for mask, count in self._mask_counts(text).items():
+            if count:
+                for bit, name in enumerate(self.names):
+                    if mask >> bit & 1:
+                        totals[name] += count
+        return totals
+
+    def count(self, text, name):
+        """Counts the characters of one class in `text`."""
+        return self.counts(text)[name]
+
+    def counts_batch(self, texts):
+        """Returns `counts()` for every string in `texts`."""
+        counts = self.counts
+        return [counts(text) for text in texts]
+
+
+# Shared classifier with the default classes
+default_classifier = CharClassifier()
+
+
+def count_class(text, name):
+    """Counts characters of a default class ("upper", "lower", "digit" or
+    "vowel") in `text`."""
+    return default_classifier.count(text, name)
+
+
+# ============================================================================
+# PASSWORD POLICY
+# ============================================================================
+
+class PasswordPolicy:
+    """
+    Configurable password rules checked with one classification pass.
+
+    The defaults are the rules of `validate_password`: at least 8
+    characters with at least one upper case letter, one lower case letter
+    and one digit.
+
+    Args:
+        min_length: Minimum number of characters
+        min_upper: Minimum number of upper case letters
+        min_lower: Minimum number of lower case letters
+        min_digit: Minimum number of digits
+        extra: Optional dict class name -> (members, minimum count), e.g.
+               {"symbol": ("!@#$%^&*", 1)}
+    """
+
+    def __init__(self, min_length=8, min_upper=1, min_lower=1, min_digit=1,
+                 extra=None):
+        self.min_length = min_length
+        self.minimums = {"upper": min_upper, "lower": min_lower,
+                         "digit": min_digit}
+        if extra:
+            classes = dict(DEFAULT_CLASSES)
+            for name, (members, minimum) in extra.items():
+                classes[name] = members
+                self.minimums[name] = minimum
+            self.classifier = CharClassifier(classes)
+        else:
+            self.classifier = default_classifier
+
+    def failures(self, password):
+        """
+        Returns the list of rules `password` breaks (empty if valid).
+        """
+        problems = []
+        if len(password) < self.min_length:
+            problems.append(f"shorter than {self.min_length} characters")
+        counts = self.classifier.counts(password)
+        for name, minimum in self.minimums.items():
+            if counts[name] < minimum:
+                problems.append(f"needs at least {minimum} {name}")
+        return problems
+
+    def check(self, password):
+        """Returns True if `password` follows every rule."""
+        if len(password) < self.min_length:
+            return False
+        if password.isascii():
+            # Fast path: translate once, then count only the needed codes
+            # and stop at the first rule that fails
+            classifier = self.classifier
+            coded = password.encode("ascii").translate(classifier._byte_table)
+            for name, minimum in self.minimums.items():
+                found = 0
+                for code in classifier.ascii_class_codes[name]:
+                    found += coded.count(code)
+                if found < minimum:
+                    return False
+            return True
+        counts = self.classifier.counts(password)
+        for name, minimum in self.minimums.items():
+            if counts[name] < minimum:
+                return False
+        return True
+
+    def check_batch(self, passwords):
+        """Returns `check()` for every password in `passwords`."""
+        check = self.check
+        return [check(password) for password in passwords]
+
+
+# Rules of `validate_password`
+DEFAULT_POLICY = PasswordPolicy()
+
+
+# ============================================================================
+# MAIN EXECUTION - Benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import string
+    import time
+
+    print(default_classifier.counts("Password123"))
+    print(PasswordPolicy(min_length=12, extra={"symbol": ("!@#$", 1)})
+          .failures("Password123"))
+
+    def validate_password_any(password):
+        # The original three-pass version
+        if len(password) < 8:
+            return False
+        has_upper = any(char.isupper() for char in password)
+        has_lower = any(char.islower() for char in password)
+        has_digit = any(char.isdigit() for char in password)
+        return has_upper and has_lower and has_digit
+
+    def count_vowels_loop(text):
+        count = 0
+        for char in text:
+            if char in "aeiouAEIOU":
+                count += 1
+        return count
+
+    rng = random.Random(1)
+    alphabet = string.ascii_letters + string.digits + "!@#"
+    passwords = ["".join(rng.choices(alphabet, k=rng.randint(4, 16)))
+                 for _ in range(200_000)]
+    text = " ".join(passwords)
+
+    start = time.perf_counter()
+    expected = [validate_password_any(p) for p in passwords]
+    print(f"validate (3x any)   : {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    result = DEFAULT_POLICY.check_batch(passwords)
+    print(f"validate (engine)   : {time.perf_counter() - start:.3f}s")
+    assert result == expected
+
+    start = time.perf_counter()
+    expected = count_vowels_loop(text)
+    print(f"count_vowels (loop) : {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    result = count_class(text, "vowel")
+    print(f"count_vowels (engine): {time.perf_counter() - start:.3f}s")
+    assert result == expected
@@ -0,0 +1,320 @@
+"""
+Counters
+========
+
+`demonstrate_scope` counts with a module-level `global_counter` and
+`global global_counter; global_counter += 1`. Used as a request counter
+that breaks in two ways:
+- threads: `+=` is a read, an add and a write; two threads can read the
+  same value and one increment is lost. Putting a lock around it makes
+  every thread queue up on that one lock.
+- processes: every process has its own copy of the global, so the parent
+  never sees the children's counts.
+
+This module has counters without a shared hot variable:
+
+- ShardedCounter: one cell per thread. A thread only ever writes its own
+  cell, so increments need no lock; `value` adds the cells up when it is
+  read (reads are rare, increments are not).
+- SharedCounter: the same idea across processes. The cells live in shared
+  memory, one per (process, thread), claimed once under a lock.
+- count_calls(counter): decorator counting calls of plain functions and
+  of coroutine functions. Increments never wait on a lock held by another
+  thread, so they are safe to call inside an asyncio event loop.
+
+Python threads are not pinned to cores, so shards are per thread rather
+than per core; on a free-threaded build that gives the same effect.
+
+Sharding is not free. On one core, or on any build with the GIL, threads
+never increment at the same time, and ShardedCounter is slower than a
+bare `global_counter += 1` (about 4 vs 11 M increments/s): every
+increment pays a dict lookup. It is still about twice as fast as a
+global behind a lock, which is what a correct global counter needs.
+It only scales with threads when they really run in parallel: several
+cores and a free-threaded build.
+
+Example:
+    requests = ShardedCounter()
+
+    @count_calls(requests)
+    async def handle(request): ...
+
+    requests.value          # total over all threads
+"""
+
+import functools
+import inspect
+import multiprocessing
+import os
+import threading
+import weakref
+from threading import get_ident
+
+
+# ============================================================================
+# THREADS
+# ============================================================================
+
+class ShardedCounter:
+    """
+    Thread-safe counter with one cell per thread, summed lazily on read.
+
+    A thread id may be reused after a thread ends; the new thread then keeps
+    adding to the old cell, which leaves the total correct.
+    """
+
+    __slots__ = ("name", "_cells", "_lock", "__weakref__")
+
+    def __init__(self, name=None):
+        self.name = name
+        self._cells = {}                # thread id -> [count]
+        self._lock = threading.Lock()   # only taken for a thread's first cell
+
+    def increment(self, n=1):
+        try:
+            self._cells[get_ident()][0] += n
+        except KeyError:
+            with self._lock:
+                self._cells[get_ident()] = [n]
+
+    def decrement(self, n=1):
+        self.increment(-n)
+
+    @property
+    def value(self):
+        return sum(cell[0] for cell in list(self._cells.values()))
+
+    def __int__(self):
+        return self.value
+
+    def __repr__(self):
+        return f"ShardedCounter({self.name!r}, value={self.value})"
+
+
+# ============================================================================
+# PROCESSES
+# ============================================================================
+
+# SharedCounters used in this process; cleared in a forked child so it
+# claims its own cells instead of writing into its parent's
+_SHARED = weakref.WeakSet()
+
+
+def _forget_cells():
+    for counter in list(_SHARED):
+        counter._cells = {}
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_cells)
+
+
+class SharedCounter:
+    """
+    Counter shared by processes, one cell per (process, thread) in shared
+    memory, summed lazily on read.
+
+    Hand it to child processes when they are created (Process args, or a
+    Pool initializer), like any multiprocessing shared object. When every
+    cell is taken, further threads share one overflow cell under the lock.
+
+    Args:
+        cells: Number of cells (processes x threads that get their own)
+        context: multiprocessing context, e.g. get_context("spawn")
+        name: Label for repr
+    """
+
+    # cells[0] is the next free cell, cells[1] the overflow cell
+    _FIRST = 2
+
+    def __init__(self, cells=256, context=None, name=None):
+        context = context or multiprocessing
+        self.name = name
+        self._shared = context.RawArray("q", cells + self._FIRST)
+        self._shared[0] = self._FIRST
+        self._lock = context.Lock()
+        self._cells = {}                # thread id -> index, this process
+        _SHARED.add(self)
+
+    def __getstate__(self):
+        return self.name, self._shared, self._lock
+
+    def __setstate__(self, state):
+        self.name, self._shared, self._lock = state
+        self._cells = {}
+        _SHARED.add(self)
+
+    def _claim(self):
+        with self._lock:
+            index = self._shared[0]
+            if index < len(self._shared):
+                self._shared[0] = index + 1
+            else:
+                index = 1
+        self._cells[get_ident()] = index
+        return index
+
+    def increment(self, n=1):
+        index = self._cells.get(get_ident()) or self._claim()
+        if index == 1:
+            with self._lock:
+                self._shared[1] += n
+        else:
+            self._shared[index] += n
+
+    def decrement(self, n=1):
+        self.increment(-n)
+
+    @property
+    def value(self):
+        return sum(self._shared[1:self._shared[0]])
+
+    def __int__(self):
+        return self.value
+
+    def __repr__(self):
+        return f"SharedCounter({self.name!r}, value={self.value})"
+
+
+# ============================================================================
+# DECORATOR
+# ============================================================================
+
+def count_calls(counter):
+    """
+    Decorator that increments `counter` on every call of the function.
+    Works for plain functions and `async def` functions alike.
+    """
+    def decorate(func):
+        increment = counter.increment
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                increment()
+                return await func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                increment()
+                return func(*args, **kwargs)
+        wrapper.counter = counter
+        return wrapper
+    return decorate
+
+
+# ============================================================================
+# MAIN EXECUTION - contention benchmark
+# ============================================================================
+
+def _add_many(counter, times):
+    increment = counter.increment
+    for _ in range(times):
+        increment()
+
+
+def _add_to_global(times):
+    # What a child process does with demonstrate_scope's pattern
+    global _process_global
+    for _ in range(times):
+        _process_global += 1
+
+
+_process_global = 0
+
+
+if __name__ == "__main__":
+    import asyncio
+    import sys
+    import time
+
+    per_thread = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    global_counter = 0
+    global_lock = threading.Lock()
+
+    def plain_global(times):
+        global global_counter
+        for _ in range(times):
+            global_counter += 1
+
+    def locked_global(times):
+        global global_counter
+        for _ in range(times):
+            with global_lock:
+                global_counter += 1
+
+    def run_threads(worker, threads):
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return time.perf_counter() - start
+
+    # Small switch interval: threads interleave often, as on many cores
+    sys.setswitchinterval(1e-6)
+    print(f"{per_thread:,} increments per thread, {os.cpu_count()} CPU(s)")
+    print(f"{'counter':26s} {'threads':>7s} {'Mops/s':>8s} {'lost':>10s}")
+    rates = {}
+    for threads in (1, 2, 4, 8):
+        expected = threads * per_thread
+        for label in ("global +=", "global + Lock", "ShardedCounter"):
+            global_counter = 0
+            counter = ShardedCounter()
+            if label == "global +=":
+                worker = functools.partial(plain_global, per_thread)
+            elif label == "global + Lock":
+                worker = functools.partial(locked_global, per_thread)
+            else:
+                worker = functools.partial(_add_many, counter, per_thread)
+            took = run_threads(worker, threads)
+            total = counter.value if label == "ShardedCounter" \
+                else global_counter
+            rates[label, threads] = expected / took
+            print(f"{label:26s} {threads:7d} {expected / took / 1e6:8.2f} "
+                  f"{expected - total:10,}")
+    sys.setswitchinterval(0.005)
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    if (os.cpu_count() or 1) > 1 and not gil:
+        for label in ("global + Lock", "ShardedCounter"):
+            print(f"{label}: 8 threads run "
+                  f"{rates[label, 8] / rates[label, 1]:.1f}x the 1-thread rate")
+    else:
+        print("No parallel threads here (one CPU or the GIL), so no counter "
+              "can scale with threads; sharding is slower than a bare "
+              "global and only beats the locked one")
+
+    # Processes: the global stays 0 in the parent, SharedCounter adds up
+    processes = 4
+    shared = SharedCounter(name="requests")
+    workers = [multiprocessing.Process(target=_add_many,
+                                       args=(shared, per_thread))
+               for _ in range(processes)]
+    workers += [multiprocessing.Process(target=_add_to_global,
+                                        args=(per_thread,))
+                for _ in range(processes)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    print(f"{processes} processes x {per_thread:,}: SharedCounter = "
+          f"{shared.value:,}, global in parent = {_process_global:,} "
+          f"({time.perf_counter() - start:.2f}s)")
+    assert shared.value == processes * per_thread
+
+    # asyncio: many tasks counted from inside the event loop
+    requests = ShardedCounter("requests")
+
+    @count_calls(requests)
+    async def handle(number):
+        await asyncio.sleep(0)
+        return number
+
+    async def serve(tasks):
+        return await asyncio.gather(*(handle(n) for n in range(tasks)))
+
+    asyncio.run(serve(10_000))
+    print(f"asyncio: {requests.value:,} requests counted")
+    assert requests.value == 10_000
@@ -0,0 +1,223 @@
+"""
+Big-Integer Factorial Engine
+============================
+
+`factorial` in PRACTICE_QUESTIONS.py multiplies n * (n-1) * ... one step at
+a time using recursion. That hits the recursion limit near n=1000, and
+multiplying a huge number by a small one over and over is slow.
+
+This engine uses:
+- Binary splitting: the numbers are multiplied as a balanced product tree,
+  so the big multiplications happen between numbers of similar size.
+- A bounded memo of checkpoints: after computing n! it is remembered, and a
+  later query for a nearby m > n only multiplies (n+1) * ... * m onto it.
+  The memo is guarded by a lock, so one engine (like the shared one behind
+  the module level helpers) can be used from several threads.
+
+Example:
+    engine = FactorialEngine()
+    engine.factorial(1000)
+    engine.binomial(100, 3)           # 161700
+    engine.factorials([5, 10, 20])    # [120, 3628800, 2432902008176640000]
+"""
+
+import threading
+from bisect import bisect_right, insort
+from collections import OrderedDict
+
+# Ranges at most this long are multiplied with a plain loop
+_LEAF_SIZE = 16
+
+
+# ============================================================================
+# PRODUCT TREE
+# ============================================================================
+
+def product_range(low, high):
+    """
+    Multiplies low * (low+1) * ... * high using binary splitting.
+
+    Returns 1 for an empty range (high < low).
+    """
+    if high < low:
+        return 1
+    if high - low < _LEAF_SIZE:
+        result = low
+        for number in range(low + 1, high + 1):
+            result *= number
+        return result
+    middle = (low + high) // 2
+    return product_range(low, middle) * product_range(middle + 1, high)
+
+
+# ============================================================================
+# ENGINE WITH CHECKPOINT MEMO
+# ============================================================================
+
+class FactorialEngine:
+    """
+    Computes factorials and binomial coefficients, remembering a bounded
+    number of results so repeated and nearby queries are cheap.
+
+    Thread safe: the memo is only read and changed under a lock, which is
+    not held while the products are multiplied.
+
+    Args:
+        max_checkpoints: How many factorials to keep (least recently used
+                         ones are dropped first)
+    """
+
+    def __init__(self, max_checkpoints=32):
+        self.max_checkpoints = max_checkpoints
+        self._memo = OrderedDict()   # n -> n!, in least-recently-used order
+        self._keys = []              # sorted copy of the memo keys
+        self._lock = threading.Lock()
+
+    def _nearest_below(self, n):
+        """Returns the largest remembered m <= n (0 if none)."""
+        with self._lock:
+            position = bisect_right(self._keys, n)
+            if position == 0:
+                return 0, 1
+            m = self._keys[position - 1]
+            self._memo.move_to_end(m)
+            return m, self._memo[m]
+
+    def _remember(self, n, value):
+        if self.max_checkpoints <= 0 or n < 2:
+            return
+        with self._lock:
+            if n in self._memo:
+                return
+            self._memo[n] = value
+            insort(self._keys, n)
+            if len(self._memo) > self.max_checkpoints:
+                old, _ = self._memo.popitem(last=False)
+                self._keys.remove(old)
+
+    def factorial(self, n):
+        """
+        Returns n! for a non-negative integer n.
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("factorial() not defined for negative values")
+        m, value = self._nearest_below(n)
+        if m == n:
+            return value
+        value *= product_range(m + 1, n)
+        self._remember(n, value)
+        return value
+
+    def factorials(self, numbers):
+        """
+        Returns the factorial of every number in `numbers`, in input order.
+
+        The numbers are processed in increasing order so each factorial is
+        built from the previous one.
+        """
+        results = {}
+        previous, value = None, 1
+        for n in sorted(set(numbers)):
+            if n < 0:
+                raise ValueError("factorial() not defined for negative values")
+            if previous is None:
+                value = self.factorial(n)
+            else:
+                value *= product_range(previous + 1, n)
+                self._remember(n, value)
+            results[n] = value
+            previous = n
+        return [results[n] for n in numbers]
+
+    def binomial(self, n, k):
+        """
+        Returns the binomial coefficient C(n, k) ("n choose k").
+
+        Returns 0 when k < 0 or k > n, like `math.comb` does for k > n.
+        """
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        if k < 0 or k > n:
+            return 0
+        k = min(k, n - k)
+        return product_range(n - k + 1, n) // self.factorial(k)
+
+    def clear(self):
+        """Forgets every remembered factorial."""
+        with self._lock:
+            self._memo.clear()
+            self._keys.clear()
+
+
+# Shared engine used by the module level helpers
+_default_engine = FactorialEngine()
+
+
+def factorial(n):
+    """Returns n! using the shared engine."""
+    return _default_engine.factorial(n)
+
+
+def factorials(numbers):
+    """Returns [n! for n in numbers] using the shared engine."""
+    return _default_engine.factorials(numbers)
+
+
+def binomial(n, k):
+    """Returns C(n, k) using the shared engine."""
+    return _default_engine.binomial(n, k)
+
+
+# ============================================================================
+# MAIN EXECUTION - Benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import math
+    import sys
+    import time
+
+    def naive_factorial(n):
+        # Loop version of PRACTICE_QUESTIONS.factorial (recursion would fail)
+        result = 1
+        for number in range(2, n + 1):
+            result *= number
+        return result
+
+    def timed(function, *args):
+        start = time.perf_counter()
+        value = function(*args)
+        return value, time.perf_counter() - start
+
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    print(f"{'n':>9} {'naive':>9} {'engine':>9} {'cached+1':>9} {'math':>9}")
+    n = 1000
+    while n <= limit:
+        engine = FactorialEngine()
+        if n <= 10 ** 5:
+            expected, naive_time = timed(naive_factorial, n)
+        else:
+            expected, naive_time = None, float("nan")
+        value, engine_time = timed(engine.factorial, n)
+        _, nearby_time = timed(engine.factorial, n + 1)
+        reference, math_time = timed(math.factorial, n)
+        assert value == reference and expected in (None, reference)
+        print(f"{n:>9} {naive_time:9.4f} {engine_time:9.4f} "
+              f"{nearby_time:9.4f} {math_time:9.4f}")
+        n *= 10
+
+    assert binomial(1000, 500) == math.comb(1000, 500)
+    assert factorials([7, 0, 5]) == [5040, 1, 120]
+
+    # The shared engine from several threads at once
+    from concurrent.futures import ThreadPoolExecutor
+    engine = FactorialEngine(max_checkpoints=4)
+    queries = [number % 500 for number in range(0, 20_000, 7)]
+    with ThreadPoolExecutor(8) as pool:
+        assert list(pool.map(engine.factorial, queries)) == \
+            list(map(math.factorial, queries))
+    assert engine._keys == sorted(engine._memo)
+    print(f"{len(queries):,} threaded queries ok")
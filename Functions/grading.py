@@ -0,0 +1,171 @@
+"""
+Batch Grading
+=============
+
+`get_grade` (PRACTICE_QUESTIONS.py) and `get_letter_grade` (inside
+`student_management_system` in Functions.py) grade one score at a time
+with an if/elif chain. This module grades a whole batch at once with a
+bucket lookup on sorted cutoffs:
+
+- With NumPy installed, NumPy arrays are graded with `numpy.searchsorted`.
+- Otherwise (or for lists / array.array) it falls back to `bisect`.
+
+Example:
+    grade_batch([95, 85, 72, 55])            # ['A', 'B', 'C', 'F']
+    grade_batch(scores, LETTER_GRADE_SCALE)  # scale used by Functions.py
+"""
+
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+# ============================================================================
+# GRADE SCALES
+# ============================================================================
+
+class GradeScale:
+    """
+    A set of score cutoffs and the letter for each bucket.
+
+    A score gets the letter of the highest cutoff it reaches, exactly like
+    the `if score >= 90 ... elif score >= 80 ...` chains.
+
+    Args:
+        cutoffs: Dict mapping letter -> minimum score, e.g. {'A': 90, 'B': 80}
+        fail: Letter for scores below every cutoff
+    """
+
+    def __init__(self, cutoffs, fail="F"):
+        ordered = sorted(cutoffs.items(), key=lambda item: item[1])
+        self.fail = fail
+        self.cutoffs = [score for _, score in ordered]
+        # labels[i] is the letter for bisect_right(cutoffs, score) == i
+        self.labels = [fail] + [letter for letter, _ in ordered]
+        self._np_cutoffs = None
+        self._np_labels = None
+
+    def grade(self, score):
+        """Grades a single score."""
+        if score != score:  # NaN fails every ">=" test in the if/elif chain
+            return self.fail
+        return self.labels[bisect_right(self.cutoffs, score)]
+
+    def __repr__(self):
+        pairs = ", ".join(f"{letter}>={cutoff}" for letter, cutoff
+                          in zip(self.labels[1:], self.cutoffs))
+        return f"GradeScale({pairs}, else {self.fail})"
+
+
+# Scale used by `get_grade` in PRACTICE_QUESTIONS.py
+GRADE_SCALE = GradeScale({'A': 90, 'B': 80, 'C': 70, 'D': 60})
+
+# Scale used by `get_letter_grade` in Functions.py (no 'D')
+LETTER_GRADE_SCALE = GradeScale({'A': 90, 'B': 80, 'C': 70})
+
+
+# ============================================================================
+# BATCH GRADING
+# ============================================================================
+
+def _grade_numpy(scores, scale):
+    if scale._np_cutoffs is None:
+        scale._np_cutoffs = np.asarray(scale.cutoffs)
+        scale._np_labels = np.asarray(scale.labels)
+    index = np.searchsorted(scale._np_cutoffs, scores, side="right")
+    if scores.dtype.kind == "f":
+        index[np.isnan(scores)] = 0
+    return scale._np_labels[index]
+
+
+def _grade_python(scores, scale):
+    cutoffs = scale.cutoffs
+    labels = scale.labels
+    fail = scale.fail
+    return [labels[bisect_right(cutoffs, score)] if score == score else fail
+            for score in scores]
+
+
+def grade_batch(scores, scale=GRADE_SCALE):
+    """
+    Grades many scores at once.
+
+    Args:
+        scores: A list, array.array, NumPy array or any iterable of numbers
+        scale: The GradeScale to use (default: the `get_grade` scale)
+
+    Returns:
+        A NumPy array of letters for NumPy input, otherwise a list
+    """
+    if np is not None and isinstance(scores, np.ndarray):
+        return _grade_numpy(scores, scale)
+    return _grade_python(scores, scale)
+
+
+def count_grades(scores, scale=GRADE_SCALE):
+    """
+    Counts how many scores fall into each letter.
+
+    Returns:
+        Dict letter -> count, from the best letter to the fail letter
+    """
+    if np is not None and isinstance(scores, np.ndarray):
+        letters = _grade_numpy(scores, scale)
+        found, counts = np.unique(letters, return_counts=True)
+        totals = dict(zip(found.tolist(), counts.tolist()))
+    else:
+        totals = {}
+        for letter in _grade_python(scores, scale):
+            totals[letter] = totals.get(letter, 0) + 1
+    return {letter: totals.get(letter, 0) for letter in reversed(scale.labels)}
+
+
+# ============================================================================
+# MAIN EXECUTION - Benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import time
+    from array import array
+
+    print(GRADE_SCALE)
+    print(grade_batch([95, 85, 72, 55]))
+    print(grade_batch([85, 92, 78, 88, 95], LETTER_GRADE_SCALE))
+
+    def get_grade(score):
+        # Same if/elif chain as PRACTICE_QUESTIONS.py
+        if score >= 90:
+            return 'A'
+        elif score >= 80:
+            return 'B'
+        elif score >= 70:
+            return 'C'
+        elif score >= 60:
+            return 'D'
+        else:
+            return 'F'
+
+    size = 1_000_000
+    scores = array("d", (random.uniform(0, 100) for _ in range(size)))
+
+    start = time.perf_counter()
+    expected = list(map(get_grade, scores))
+    print(f"map(get_grade)     : {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    result = grade_batch(scores)
+    print(f"grade_batch(bisect): {time.perf_counter() - start:.3f}s")
+    assert result == expected
+
+    if np is not None:
+        np_scores = np.frombuffer(scores, dtype=np.float64)
+        start = time.perf_counter()
+        result = grade_batch(np_scores)
+        print(f"grade_batch(numpy) : {time.perf_counter() - start:.3f}s")
+        assert result.tolist() == expected
+
+    print(count_grades(scores))
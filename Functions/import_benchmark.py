@@ -0,0 +1,49 @@
+"""
+Import-Time Benchmark
+=====================
+
+Measures how long a cold `import Functions` takes in a fresh interpreter,
+and how long the first use of a lazily loaded function costs.
+
+Usage (from the repository root or from this folder):
+    python Functions/import_benchmark.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+# Parent of the Functions package, so `import Functions` works
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPETS = {
+    "import Functions": "import Functions",
+    "first use (analyze_text)": "import Functions; Functions.analyze_text",
+}
+
+_TIMER = """
+import time
+start = time.perf_counter_ns()
+{code}
+print(time.perf_counter_ns() - start)
+"""
+
+
+def time_cold(code, runs):
+    """Runs `code` in `runs` fresh interpreters and returns the times in ms."""
+    times = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(code=code)],
+            cwd=ROOT, check=True, capture_output=True, text=True).stdout
+        times.append(int(output.strip().splitlines()[-1]) / 1e6)
+    return times
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for label, code in SNIPPETS.items():
+        times = time_cold(code, runs)
+        print(f"{label:<26} median {statistics.median(times):7.3f} ms   "
+              f"min {min(times):7.3f} ms   ({runs} runs)")
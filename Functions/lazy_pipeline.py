@@ -0,0 +1,370 @@
+"""
+Lazy Filter / Map Pipeline
+==========================
+
+`filter_positive` (PRACTICE_QUESTIONS.py) and the
+`list(filter(...))` / `list(map(...))` lines in `student_management_system`
+build a complete list after every step. For a stream of 100 million
+numbers that means gigabytes of lists that are only read once.
+
+`Stream` describes the steps first and runs them lazily, one value at a
+time, when a result is asked for:
+
+    Stream(grades).filter(ge(80)).map(get_grade).take(10).collect()
+    Stream(numbers).filter(lambda x: x > 0).sum()
+
+- Nothing in between is stored: memory stays constant however long the
+  input is.
+- Simple comparisons (`gt(0)`, `ge(80)`, or a lambda like `lambda x: x > 0`)
+  are recognized and turned into C-level predicates, so filtering does not
+  call Python code for every value.
+- For NumPy arrays (or a stream of array chunks) those comparisons become
+  boolean masks, and sum / count / stats are computed per chunk with NumPy.
+"""
+
+import dis
+import operator
+from functools import partial
+from itertools import chain, islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+try:
+    from .running_stats import RunningStats
+except ImportError:  # running this file directly
+    from running_stats import RunningStats
+
+# Values per batch for aggregates (and elements per NumPy chunk)
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# x <op> c is the same test as c <reflected op> x, which partial() can bind
+_REFLECTED = {
+    ">": operator.lt, ">=": operator.le, "<": operator.gt,
+    "<=": operator.ge, "==": operator.eq, "!=": operator.ne,
+}
+_NUMPY_COMPARE = {
+    ">": "greater", ">=": "greater_equal", "<": "less",
+    "<=": "less_equal", "==": "equal", "!=": "not_equal",
+}
+
+
+# ============================================================================
+# PREDICATES
+# ============================================================================
+
+class Compare:
+    """
+    The predicate `x <op> value`, callable like a lambda but recognized by
+    the fast paths. Build it with gt(), ge(), lt(), le(), eq() or ne().
+    """
+
+    __slots__ = ("op", "value", "_test")
+
+    def __init__(self, op, value):
+        if op not in _REFLECTED:
+            raise ValueError(f"unknown comparison {op!r}")
+        self.op = op
+        self.value = value
+        self._test = partial(_REFLECTED[op], value)
+
+    def __call__(self, x):
+        return self._test(x)
+
+    def __repr__(self):
+        return f"x {self.op} {self.value!r}"
+
+    def mask(self, array):
+        """Boolean NumPy mask of the values that pass."""
+        return getattr(np, _NUMPY_COMPARE[self.op])(array, self.value)
+
+
+def gt(value):
+    return Compare(">", value)
+
+
+def ge(value):
+    return Compare(">=", value)
+
+
+def lt(value):
+    return Compare("<", value)
+
+
+def le(value):
+    return Compare("<=", value)
+
+
+def eq(value):
+    return Compare("==", value)
+
+
+def ne(value):
+    return Compare("!=", value)
+
+
+def recognize(predicate):
+    """
+    Returns a Compare equal to `predicate` if it is a comparison with a
+    constant, such as `lambda x: x > 0` or `lambda x: x >= 80`, else None.
+    (Comparisons with variables are left alone: the lambda reads the
+    variable when it runs, which may be after it changed.)
+    """
+    if isinstance(predicate, Compare):
+        return predicate
+    code = getattr(predicate, "__code__", None)
+    if code is None or code.co_argcount != 1 or code.co_kwonlyargcount:
+        return None
+    steps = [instruction for instruction in dis.get_instructions(predicate)
+             if instruction.opname not in ("RESUME", "NOP", "CACHE")]
+    if len(steps) != 4 or steps[0].opname != "LOAD_FAST" \
+            or steps[0].arg != 0 or steps[2].opname != "COMPARE_OP" \
+            or steps[1].opname != "LOAD_CONST" \
+            or steps[3].opname != "RETURN_VALUE":
+        return None
+    value = steps[1].argval
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return None
+    op = steps[2].argrepr.removeprefix("bool(").removesuffix(")")
+    return Compare(op, value) if op in _REFLECTED else None
+
+
+# ============================================================================
+# STREAM
+# ============================================================================
+
+class Stream:
+    """
+    A lazy pipeline over an iterable. filter/map/take/skip return a new
+    Stream; collect/sum/count/stats/... run it.
+
+    Args:
+        source: Any iterable (list, generator, file, range, array.array,
+                NumPy array). A stream over a generator can only run once,
+                like the generator itself.
+    """
+
+    __slots__ = ("_source", "_stages", "_chunked")
+
+    def __init__(self, source, _stages=(), _chunked=False):
+        self._source = source
+        self._stages = _stages
+        self._chunked = _chunked
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """A stream over an iterable of NumPy arrays (e.g. blocks read
+        from a memory map), treated as one long sequence."""
+        return cls(chunks, (), True)
+
+    def _then(self, kind, argument):
+        return Stream(self._source, self._stages + ((kind, argument),),
+                      self._chunked)
+
+    def filter(self, predicate):
+        """Keeps the values for which predicate(value) is true."""
+        return self._then("filter", recognize(predicate) or predicate)
+
+    def map(self, function):
+        return self._then("map", function)
+
+    def take(self, n):
+        """Stops after n values."""
+        return self._then("take", n)
+
+    def skip(self, n):
+        return self._then("skip", n)
+
+    # ------------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------------
+
+    def _numpy_chunks(self):
+        """
+        For NumPy sources: yields the chunks after the leading comparison
+        filters (applied as masks), and the stages left to run in Python.
+        """
+        stages = list(self._stages)
+        masks = []
+        while stages and stages[0][0] == "filter" \
+                and isinstance(stages[0][1], Compare):
+            masks.append(stages.pop(0)[1])
+        source = self._source
+        if not self._chunked:
+            source = (source[start:start + DEFAULT_CHUNK_SIZE]
+                      for start in range(0, len(source), DEFAULT_CHUNK_SIZE))
+
+        def filtered():
+            for chunk in source:
+                if masks:
+                    keep = masks[0].mask(chunk)
+                    for predicate in masks[1:]:
+                        keep &= predicate.mask(chunk)
+                    chunk = chunk[keep]
+                yield chunk
+        return filtered(), stages
+
+    def _is_numpy(self):
+        return np is not None and (self._chunked or
+                                   isinstance(self._source, np.ndarray))
+
+    def __iter__(self):
+        if self._is_numpy():
+            chunks, stages = self._numpy_chunks()
+            values = chain.from_iterable(chunk.tolist() for chunk in chunks)
+        else:
+            values, stages = iter(self._source), self._stages
+        for kind, argument in stages:
+            if kind == "filter":
+                if isinstance(argument, Compare):
+                    argument = argument._test   # C-level partial, no frame
+                values = filter(argument, values)
+            elif kind == "map":
+                values = map(argument, values)
+            elif kind == "take":
+                values = islice(values, argument)
+            else:
+                values = islice(values, argument, None)
+        return values
+
+    def _batches(self):
+        """Yields the results in lists (or NumPy arrays) of bounded size."""
+        if self._is_numpy():
+            chunks, stages = self._numpy_chunks()
+            if not stages:
+                yield from chunks
+                return
+        values = iter(self)
+        while True:
+            batch = list(islice(values, DEFAULT_CHUNK_SIZE))
+            if not batch:
+                return
+            yield batch
+
+    def collect(self):
+        """Runs the pipeline into a list (like the list-based code)."""
+        return list(self)
+
+    def count(self):
+        return sum(len(batch) for batch in self._batches())
+
+    def sum(self, start=0):
+        total = start
+        for batch in self._batches():
+            total += batch.sum().item() if not isinstance(batch, list) \
+                else sum(batch)
+        return total
+
+    def min(self, default=None):
+        stats = self.stats()
+        return stats.min if stats.count else default
+
+    def max(self, default=None):
+        stats = self.stats()
+        return stats.max if stats.count else default
+
+    def stats(self):
+        """Count, total, mean, min, max and variance in one pass."""
+        result = RunningStats()
+        for batch in self._batches():
+            result.update_many(batch)
+        return result
+
+    def mean(self):
+        stats = self.stats()
+        return stats.mean if stats.count else 0
+
+    def reduce(self, function, initial):
+        result = initial
+        for value in self:
+            result = function(result, value)
+        return result
+
+    def first(self, default=None):
+        return next(iter(self), default)
+
+
+def positive(numbers):
+    """Lazy filter_positive: the numbers greater than 0."""
+    return Stream(numbers).filter(gt(0))
+
+
+def passing(grades, cutoff=80):
+    """Lazy version of list(filter(lambda x: x >= 80, grades))."""
+    return Stream(grades).filter(ge(cutoff))
+
+
+# ============================================================================
+# MAIN EXECUTION - memory benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import sys
+    import time
+    import tracemalloc
+
+    def filter_positive(numbers):
+        # Same as PRACTICE_QUESTIONS.py
+        return [num for num in numbers if num > 0]
+
+    grades = [85, 92, 78, 88, 95]
+    assert passing(grades).collect() == list(filter(lambda x: x >= 80, grades))
+    assert positive([-5, 10, -3, 0, 7]).collect() == filter_positive(
+        [-5, 10, -3, 0, 7])
+    assert repr(recognize(lambda x: x >= 80)) == "x >= 80"
+    assert recognize(lambda x: x % 2 == 0) is None
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000_000
+    eager_size = min(size, 5_000_000)
+
+    def numbers(count):
+        # A generator, so the input itself is never in memory
+        return (value * 7919 % 2001 - 1000 for value in range(count))
+
+    def measure(label, function, count):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = function(count)
+        took = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label:40s} {count:>12,}  {took:7.2f}s  "
+              f"peak {peak / 1e6:9.2f} MB")
+        return result, peak
+
+    def eager(count):
+        positives = filter_positive(numbers(count))
+        doubled = list(map(lambda x: x * 2, positives))
+        passed = list(filter(lambda x: x >= 80, doubled))
+        return sum(passed), len(passed)
+
+    def lazy(count):
+        stream = Stream(numbers(count)).filter(lambda x: x > 0) \
+            .map(lambda x: x * 2).filter(lambda x: x >= 80)
+        stats = stream.stats()
+        return stats.total, stats.count
+
+    print(f"{'pipeline':40s} {'values':>12s}")
+    expected, eager_peak = measure("lists at every step", eager, eager_size)
+    assert measure("Stream", lazy, eager_size)[0] == expected
+    if size > eager_size:
+        measure("Stream", lazy, size)
+        print(f"(lists at every step would peak near "
+              f"{eager_peak * size / eager_size / 1e9:.1f} GB "
+              f"for {size:,} values)")
+
+    if np is not None:
+        def chunks(count, chunk=1 << 20):
+            for start in range(0, count, chunk):
+                block = np.arange(start, min(start + chunk, count),
+                                  dtype=np.int64)
+                yield block * 7919 % 2001 - 1000
+
+        def masked(count):
+            stats = Stream.from_chunks(chunks(count)).filter(gt(0)) \
+                .filter(lt(500)).stats()
+            return stats.count
+
+        measure("NumPy chunks with masks", masked, size)
@@ -0,0 +1,564 @@
+"""
+Memoization
+===========
+
+Several functions in Functions.py and PRACTICE_QUESTIONS.py are pure:
+the same arguments always give the same result and nothing else happens
+(`square`, `multiply`, `add_numbers`, `greet_with_title`, `get_grade`,
+`factorial`, `temperature_converter`). When callers repeat arguments,
+the result can be remembered instead of computed again.
+
+`functools.lru_cache` only knows LRU and a count limit. This module adds:
+- eviction policies: "lru" (least recently used), "lfu" (least frequently
+  used) and "ttl" (entries expire after `ttl` seconds, oldest out first)
+- a byte-size cap (estimated with `sys.getsizeof`) next to the entry cap
+- a lock per cache, so threads can share it
+- hit / miss / eviction counters per function
+- `apply_to_pure_functions()`, which caches only the functions listed in
+  PURE_FUNCTIONS and can be undone with `remove_from_pure_functions()`
+
+Caching is not free: for functions as cheap as `square` the lookup costs
+more than the call. Run this file for a benchmark that shows both cases.
+
+Example:
+    @memoize(maxsize=10_000, policy="lfu")
+    def get_grade(score): ...
+
+    get_grade(95); get_grade(95)
+    get_grade.cache.stats()     # {'hits': 1, 'misses': 1, ...}
+"""
+
+import functools
+import importlib
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+POLICIES = ("lru", "lfu", "ttl")
+
+# module (inside this package) -> functions that are safe to cache
+PURE_FUNCTIONS = {
+    "Functions": ("square", "multiply", "add_numbers", "greet_with_title"),
+    "PRACTICE_QUESTIONS": ("get_grade", "factorial", "temperature_converter"),
+}
+
+_MISSING = object()
+_KWARGS_MARK = object()
+
+
+# ============================================================================
+# STORES - one per eviction policy
+# ============================================================================
+
+class _Entry:
+    __slots__ = ("value", "size", "expires", "frequency")
+
+    def __init__(self, value, size, expires):
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.frequency = 1
+
+
+class _LRUStore:
+    """Evicts the entry used longest ago."""
+
+    def __init__(self):
+        self.data = OrderedDict()
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key):
+        entry = self.data.get(key)
+        if entry is not None:
+            self.data.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self.data[key] = entry
+
+    def victim(self):
+        return next(iter(self.data))
+
+    def remove(self, key):
+        return self.data.pop(key)
+
+    def clear(self):
+        self.data.clear()
+
+
+class _TTLStore(_LRUStore):
+    """Keeps insertion order, which is also expiry order: oldest first."""
+
+    def get(self, key):
+        return self.data.get(key)
+
+
+class _LFUStore:
+    """
+    Evicts the entry used the fewest times (the oldest of those on a tie).
+    Keys are kept in one ordered bucket per use count, so every operation
+    is O(1).
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.buckets = {}           # use count -> OrderedDict of keys
+        self.min_frequency = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def _unlink(self, key, frequency):
+        bucket = self.buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[frequency]
+            if frequency == self.min_frequency:
+                self.min_frequency = min(self.buckets, default=0)
+
+    def get(self, key):
+        entry = self.data.get(key)
+        if entry is not None:
+            self._unlink(key, entry.frequency)
+            entry.frequency += 1
+            self.buckets.setdefault(entry.frequency, OrderedDict())[key] = None
+            if self.min_frequency == 0 or entry.frequency < self.min_frequency:
+                self.min_frequency = entry.frequency
+        return entry
+
+    def put(self, key, entry):
+        self.data[key] = entry
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_frequency = 1
+
+    def victim(self):
+        return next(iter(self.buckets[self.min_frequency]))
+
+    def remove(self, key):
+        entry = self.data.pop(key)
+        self._unlink(key, entry.frequency)
+        return entry
+
+    def clear(self):
+        self.data.clear()
+        self.buckets.clear()
+        self.min_frequency = 0
+
+
+_STORES = {"lru": _LRUStore, "lfu": _LFUStore, "ttl": _TTLStore}
+
+
+def estimate_size(value, _depth=2):
+    """
+    Rough size in bytes of a value: sys.getsizeof of the object plus its
+    items for tuples, lists, sets and dicts (two levels deep).
+    """
+    size = sys.getsizeof(value)
+    if _depth and isinstance(value, (tuple, list, set, frozenset)):
+        size += sum(estimate_size(item, _depth - 1) for item in value)
+    elif _depth and isinstance(value, dict):
+        size += sum(estimate_size(key, _depth - 1) +
+                    estimate_size(item, _depth - 1)
+                    for key, item in value.items())
+    return size
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class Cache:
+    """
+    Bounded, thread-safe cache with counters.
+
+    Args:
+        name: Name used in stats (usually module.qualname of the function)
+        maxsize: Maximum number of entries (None = no entry limit)
+        policy: "lru", "lfu" or "ttl"
+        ttl: Seconds an entry stays valid (required for "ttl", optional
+             for the other policies)
+        max_bytes: Optional cap on the estimated size of keys + values;
+                   a single value larger than the cap is not stored
+        clock: Time source for ttl (time.monotonic)
+    """
+
+    def __init__(self, name, maxsize=1024, policy="lru", ttl=None,
+                 max_bytes=None, clock=time.monotonic):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, not {policy!r}")
+        if policy == "ttl" and not ttl:
+            raise ValueError("the ttl policy needs ttl=<seconds>")
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1 (or None)")
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._store = _STORES[policy]()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.skipped = 0            # calls with unhashable arguments
+
+    def __len__(self):
+        return len(self._store)
+
+    def get(self, key):
+        """Returns the cached value or _MISSING (and counts hit / miss)."""
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is not None:
+                if entry.expires is None or entry.expires > self.clock():
+                    self.hits += 1
+                    return entry.value
+                self._drop(key)
+                self.expirations += 1
+            self.misses += 1
+            return _MISSING
+
+    def put(self, key, value):
+        """Stores a value, evicting entries until the limits hold."""
+        size = estimate_size(key) + estimate_size(value) \
+            if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires = self.clock() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._store.data:
+                self._drop(key)     # another thread computed it as well
+            if self.ttl:
+                self._expire()
+            # Make room first: evicting after the insert would let LFU pick
+            # the new key itself (use count 1) and never admit anything
+            while (self.maxsize is not None and len(self._store) >= self.maxsize) \
+                    or (self.max_bytes is not None
+                        and self.bytes + size > self.max_bytes):
+                self._drop(self._store.victim())
+                self.evictions += 1
+            self._store.put(key, _Entry(value, size, expires))
+            self.bytes += size
+
+    def _drop(self, key):
+        self.bytes -= self._store.remove(key).size
+
+    def _expire(self):
+        """Removes expired entries from the front (ttl policy only keeps
+        them in expiry order)."""
+        if self.policy != "ttl":
+            return
+        now = self.clock()
+        data = self._store.data
+        while data:
+            key = next(iter(data))
+            if data[key].expires > now:
+                break
+            self._drop(key)
+            self.expirations += 1
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+            self.bytes = 0
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+            self.expirations = self.skipped = 0
+
+    def stats(self):
+        """Returns the counters as a plain dict."""
+        calls = self.hits + self.misses
+        return {
+            "policy": self.policy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / calls if calls else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "skipped": self.skipped,
+            "size": len(self._store),
+            "bytes": self.bytes,
+        }
+
+
+class _FunctoolsCache:
+    """
+    Stats view of a functools.lru_cache, used for plain LRU caches (no ttl,
+    no byte cap): its C lookup is several times faster than Cache.get.
+    Every miss inserts one entry, so evictions = misses - entries kept.
+    """
+
+    policy = "lru"
+
+    def __init__(self, name, cached):
+        self.name = name
+        self._cached = cached
+        self.skipped = 0
+        self._cleared = 0           # entries dropped by clear()
+        self._base = (0, 0, 0)      # hits, misses, evictions at reset
+
+    def __len__(self):
+        return self._cached.cache_info().currsize
+
+    def _counts(self):
+        info = self._cached.cache_info()
+        evictions = info.misses - info.currsize - self._cleared
+        return info.hits, info.misses, evictions
+
+    def clear(self):
+        self._cleared += len(self)
+        self._cached.cache_clear()
+
+    def reset_stats(self):
+        self._base = self._counts()
+        self.skipped = 0
+
+    def stats(self):
+        hits, misses, evictions = (now - base for now, base
+                                   in zip(self._counts(), self._base))
+        calls = hits + misses
+        return {
+            "policy": "lru",
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / calls if calls else 0.0,
+            "evictions": evictions,
+            "expirations": 0,
+            "skipped": self.skipped,
+            "size": len(self),
+            "bytes": None,          # not tracked without max_bytes
+        }
+
+
+# Every cache created by memoize(), for cache_stats()
+_caches = weakref.WeakSet()
+
+
+def cache_stats():
+    """Returns {function name: stats dict} for every memoized function."""
+    return {cache.name: cache.stats()
+            for cache in sorted(_caches, key=lambda cache: cache.name)}
+
+
+# ============================================================================
+# DECORATOR
+# ============================================================================
+
+def _make_key(args, kwargs, typed):
+    key = args
+    if kwargs:
+        key += (_KWARGS_MARK,) + tuple(kwargs.items())
+    if typed:
+        key += tuple(type(arg) for arg in args)
+        if kwargs:
+            key += tuple(type(value) for value in kwargs.values())
+    return key
+
+
+def memoize(func=None, *, maxsize=1024, policy="lru", ttl=None,
+            max_bytes=None, typed=False):
+    """
+    Caches the results of a pure function.
+
+    Use as @memoize or @memoize(maxsize=..., policy="lfu", ...); the
+    arguments are those of Cache, plus:
+        typed: Cache 1, 1.0 and True separately (needed when the result's
+               type follows the argument's, e.g. square(1) vs square(1.0))
+
+    The wrapper has `.cache` (with stats()) and `__wrapped__` (the
+    original). A plain LRU cache without ttl or max_bytes runs on
+    functools.lru_cache; the other settings use Cache. Exceptions are not
+    cached. Two threads missing the same key at the
+    same time may both call the function; the result is stored once.
+    """
+    if func is None:
+        return lambda f: memoize(f, maxsize=maxsize, policy=policy, ttl=ttl,
+                                 max_bytes=max_bytes, typed=typed)
+
+    name = f"{func.__module__}.{func.__qualname__}"
+    if policy == "lru" and ttl is None and max_bytes is None:
+        cached = functools.lru_cache(maxsize=maxsize, typed=typed)(func)
+        cache = _FunctoolsCache(name, cached)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return cached(*args, **kwargs)
+            except TypeError:
+                try:
+                    hash(_make_key(args, kwargs, False))
+                except TypeError:   # unhashable argument: just call
+                    cache.skipped += 1
+                    return func(*args, **kwargs)
+                raise               # the function itself raised TypeError
+    else:
+        cache = Cache(name, maxsize, policy, ttl, max_bytes)
+        get = cache.get
+        put = cache.put
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs, typed) if kwargs or typed else args
+            try:
+                value = get(key)
+            except TypeError:       # unhashable argument: just call
+                with cache._lock:
+                    cache.skipped += 1
+                return func(*args, **kwargs)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                put(key, value)
+            return value
+
+    _caches.add(cache)
+    wrapper.cache = cache
+    return wrapper
+
+
+# ============================================================================
+# PURE FUNCTIONS OF THIS PACKAGE
+# ============================================================================
+
+def _module(name):
+    """Imports a module of this package (also when run as a script)."""
+    return importlib.import_module(f"{__package__}.{name}" if __package__
+                                   else name)
+
+
+def _modules():
+    package = __package__
+    for module_name, names in PURE_FUNCTIONS.items():
+        yield _module(module_name), names
+    # The package caches names it has handed out; keep those in step too
+    if package and package in sys.modules:
+        yield sys.modules[package], tuple(
+            name for names in PURE_FUNCTIONS.values() for name in names)
+
+
+def apply_to_pure_functions(maxsize=4096, policy="lru", ttl=None,
+                            max_bytes=None):
+    """
+    Replaces the functions listed in PURE_FUNCTIONS with memoized versions.
+
+    Only that list is touched: functions that print, read input or use
+    global state are never cached. Keys are typed, so square(2) and
+    square(2.0) keep returning an int and a float.
+
+    Returns:
+        List of "module.function" names that were wrapped
+    """
+    done = []
+    wrapped = {}
+    for module, names in _modules():
+        for name in names:
+            original = vars(module).get(name)
+            if original is None or hasattr(original, "cache"):
+                continue
+            replacement = wrapped.get(original)
+            if replacement is None:
+                replacement = wrapped[original] = memoize(
+                    original, maxsize=maxsize, policy=policy, ttl=ttl,
+                    max_bytes=max_bytes, typed=True)
+                # lambdas (square, multiply) would all be "<lambda>"
+                replacement.cache.name = f"{module.__name__}.{name}"
+            setattr(module, name, replacement)
+            done.append(f"{module.__name__}.{name}")
+    return done
+
+
+def remove_from_pure_functions():
+    """Undoes apply_to_pure_functions(). Returns the restored names."""
+    done = []
+    for module, names in _modules():
+        for name in names:
+            current = vars(module).get(name)
+            if current is not None and hasattr(current, "cache"):
+                setattr(module, name, current.__wrapped__)
+                _caches.discard(current.cache)
+                done.append(f"{module.__name__}.{name}")
+    return done
+
+
+# ============================================================================
+# MAIN EXECUTION - Benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+
+    def timed(function, arguments):
+        start = time.perf_counter_ns()
+        for args in arguments:
+            function(*args)
+        return (time.perf_counter_ns() - start) / len(arguments)
+
+    square = lambda x: x ** 2
+
+    def get_grade(score):
+        if score >= 90:
+            return 'A'
+        elif score >= 80:
+            return 'B'
+        elif score >= 70:
+            return 'C'
+        elif score >= 60:
+            return 'D'
+        else:
+            return 'F'
+
+    def factorial(n):
+        if n == 0 or n == 1:
+            return 1
+        return n * factorial(n - 1)
+
+    rng = random.Random(1)
+    calls = 200_000
+    repeated = [(rng.randrange(100),) for _ in range(calls)]
+    unique = [(number,) for number in range(calls)]
+    big = [(rng.randrange(200, 300),) for _ in range(20_000)]
+
+    print(f"{'case':36s} {'plain':>9s} {'cached':>9s}   hit rate")
+    for label, function, arguments, options in (
+            ("square, 100 distinct args", square, repeated, {}),
+            ("get_grade, 100 distinct args", get_grade, repeated, {}),
+            ("get_grade, all args distinct", get_grade, unique, {}),
+            ("get_grade, distinct, LFU", get_grade, unique,
+             {"policy": "lfu"}),
+            ("get_grade, distinct, 64 KB cap", get_grade, unique,
+             {"max_bytes": 65_536}),
+            ("factorial(200..299)", factorial, big, {}),
+            ("factorial(200..299), TTL 60s", factorial, big,
+             {"policy": "ttl", "ttl": 60})):
+        cached = memoize(function, **options)
+        plain_ns = timed(function, arguments)
+        cached_ns = timed(cached, arguments)
+        stats = cached.cache.stats()
+        print(f"{label:36s} {plain_ns:7.0f}ns {cached_ns:7.0f}ns   "
+              f"{stats['hit_rate']:6.1%}  ({stats['evictions']:,} evictions)")
+
+    # A new key that turns hot must get into a full LFU cache
+    lfu = memoize(lambda letter: letter.upper(), maxsize=2, policy="lfu")
+    for letter in "aabbcccccc":
+        lfu(letter)
+    assert lfu.cache.stats()["hits"] == 7, lfu.cache.stats()
+
+    print("\nWrapped:", apply_to_pure_functions())
+    practice = _module("PRACTICE_QUESTIONS")
+    functions = _module("Functions")
+    for _ in range(3):
+        practice.get_grade(85)
+        functions.square(2.0)
+    assert functions.square(2) == 4 and type(functions.square(2.0)) is float
+    for name, stats in cache_stats().items():
+        if stats["hits"] or stats["misses"]:
+            print(f"{name}: {stats}")
+    print("Restored:", len(remove_from_pure_functions()), "functions")
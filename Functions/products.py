@@ -0,0 +1,230 @@
+"""
+Product Reducer
+===============
+
+`multiply_all(*args)` (PRACTICE_QUESTIONS.py) multiplies left to right in a
+Python loop. With big integers that is quadratic: the running product
+keeps growing and every step multiplies it by a small number. It also
+makes callers unpack huge sequences into `*args`.
+
+`product()` takes any iterable or buffer and returns exactly what
+`multiply_all(*values)` returns (0 for no values):
+
+- Integers are multiplied as a balanced product tree, so the big
+  multiplications are between numbers of similar size. Integer products
+  are exact, so the different grouping gives the same result.
+- As soon as a float (or any other type) appears, the rest is multiplied
+  left to right, exactly like multiply_all, because float rounding
+  depends on the order.
+- Very long integer inputs can be split over a process pool.
+- `log_product()` sums logarithms instead, for float inputs whose
+  product would overflow.
+
+Example:
+    product(range(1, 21))           # 2432902008176640000
+    product([])                     # 0, like multiply_all()
+    log_product([1e200, 1e200])     # (1, 921.03...)
+"""
+
+import math
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Values read from the input at a time
+DEFAULT_CHUNK_SIZE = 4096
+
+# Ranges at most this long are multiplied with a plain loop
+_LEAF_SIZE = 16
+
+
+# ============================================================================
+# PRODUCT TREE
+# ============================================================================
+
+def tree_product(values, low=0, high=None):
+    """
+    Multiplies values[low:high] as a balanced tree (1 for an empty range).
+    """
+    if high is None:
+        high = len(values)
+    if high - low <= _LEAF_SIZE:
+        result = 1
+        for index in range(low, high):
+            result *= values[index]
+        return result
+    middle = (low + high) // 2
+    return tree_product(values, low, middle) * tree_product(values, middle, high)
+
+
+class _TreeAccumulator:
+    """
+    Keeps a streamed product balanced: partial products of equal "level"
+    are multiplied together, like carrying in a binary counter.
+    """
+
+    def __init__(self):
+        self._stack = []  # (level, product), levels strictly decreasing
+
+    def push(self, value, level=0):
+        stack = self._stack
+        while stack and stack[-1][0] == level:
+            _, previous = stack.pop()
+            value = previous * value
+            level += 1
+        stack.append((level, value))
+
+    def result(self):
+        result = 1
+        while self._stack:
+            _, value = self._stack.pop()
+            result = value * result
+        return result
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def _is_exact(value):
+    return isinstance(value, int)
+
+
+def _product_sequence(values, workers, chunk_size):
+    """Product of an indexable sequence (list, tuple, int array)."""
+    if workers and workers > 1 and len(values) > chunk_size * workers:
+        chunks = [values[start:start + chunk_size]
+                  for start in range(0, len(values), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(tree_product, chunks))
+        return tree_product(partials)
+    return tree_product(values)
+
+
+def product(values, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Multiplies all values together, matching `multiply_all(*values)`.
+
+    Args:
+        values: Any iterable, array.array or NumPy array
+        workers: Processes to use for long all-integer sequences
+                 (default: multiply in this process)
+        chunk_size: Values per chunk (and per process-pool task)
+
+    Returns:
+        The product, or 0 if there are no values (like multiply_all)
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        # Python numbers, so integers never wrap around at 64 bits
+        values = values.ravel().tolist()
+
+    if isinstance(values, array):
+        if not values:
+            return 0
+        if values.typecode in "fd":
+            return math.prod(values)          # left to right, in C
+        return _product_sequence(values, workers, chunk_size)
+
+    if isinstance(values, (list, tuple)):
+        if not values:
+            return 0
+        if all(map(_is_exact, values)):
+            return _product_sequence(values, workers, chunk_size)
+
+    # Generic iterable: tree-multiply integers until something else shows
+    # up, then continue left to right
+    iterator = iter(values)
+    tree = _TreeAccumulator()
+    seen_any = False
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        seen_any = True
+        for position, value in enumerate(chunk):
+            if not _is_exact(value):
+                tree.push(tree_product(chunk, 0, position))
+                result = math.prod(chunk[position:], start=tree.result())
+                for rest in iter(lambda: list(islice(iterator, chunk_size)),
+                                 []):
+                    result = math.prod(rest, start=result)
+                return result
+        tree.push(tree_product(chunk))
+    return tree.result() if seen_any else 0
+
+
+def log_product(values):
+    """
+    Returns the product as (sign, log of absolute value), so products far
+    beyond the float range can be compared or combined.
+
+    Returns:
+        (sign, log_abs): sign is 1, -1 or 0; log_abs is -inf for 0.
+        No values gives (0, -inf), matching multiply_all() == 0.
+    """
+    sign = 1
+    logs = []
+    for value in values:
+        if value == 0:
+            return 0, -math.inf
+        if value < 0:
+            sign = -sign
+            value = -value
+        logs.append(math.log(value))
+        if len(logs) >= DEFAULT_CHUNK_SIZE:
+            logs = [math.fsum(logs)]
+    if not logs:
+        return 0, -math.inf
+    return sign, math.fsum(logs)
+
+
+# ============================================================================
+# MAIN EXECUTION - Benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    def multiply_all(*args):
+        # Same as PRACTICE_QUESTIONS.py
+        if not args:
+            return 0
+        result = 1
+        for num in args:
+            result *= num
+        return result
+
+    checks = [[], [5], [True], [2, 3, 4], [2, 0.5, 3], [10 ** 30, 1.5, 7],
+              [random.random() for _ in range(10_000)],
+              list(range(1, 100)) + [0.25] + list(range(1, 20))]
+    for values in checks:
+        assert product(values) == multiply_all(*values)
+        assert product(iter(values), chunk_size=7) == multiply_all(*values)
+    print("product() matches multiply_all() on all checks")
+
+    numbers = list(range(1, 50_001))
+    start = time.perf_counter()
+    expected = multiply_all(*numbers)
+    loop_time = time.perf_counter() - start
+    start = time.perf_counter()
+    result = product(numbers)
+    tree_time = time.perf_counter() - start
+    assert result == expected
+    print(f"1..50000   multiply_all {loop_time:.3f}s   product {tree_time:.3f}s")
+
+    floats = array("d", (random.uniform(0.5, 2.0) for _ in range(1_000_000)))
+    start = time.perf_counter()
+    expected = multiply_all(*floats)
+    loop_time = time.perf_counter() - start
+    start = time.perf_counter()
+    result = product(floats)
+    fast_time = time.perf_counter() - start
+    assert result == expected
+    print(f"1M floats  multiply_all {loop_time:.3f}s   product {fast_time:.3f}s")
+    print(f"log_product([1e200] * 5) = {log_product([1e200] * 5)}")
@@ -0,0 +1,350 @@
+"""
+Profiling Hooks
+===============
+
+`timer_decorator` in PRACTICE_QUESTIONS.py shows the idea of wrapping a
+function to time it, but it prints on every call, uses `time.time()` and
+loses the wrapped function's name and docstring.
+
+This module grows that idea into something usable in a service:
+- `perf_counter_ns` timings written into a per-function histogram
+  (count, total, p50/p95/p99, max) instead of printing
+- a single flag check when profiling is disabled
+- a lock per histogram (thread safe) and async wrappers for coroutines
+- export as JSON or Prometheus-style text
+- one call to instrument every function in a module
+
+Timing is not free. For a no-op function an enabled wrapper costs about
+2.2 us per call against 276 ns for the plain call on one machine (1.4 us
+vs 80 ns on another), mostly the lock and bucket update in `record`. Disabled,
+the flag check adds about 0.2 us. Run this file to measure it on yours;
+instrument functions that take microseconds or more, not one-liners.
+
+Example:
+    import Functions.Functions as F
+    registry = ProfileRegistry()
+    registry.instrument_module(F)
+    F.add_numbers(2, 3)
+    print(registry.to_prometheus())
+"""
+
+import functools
+import inspect
+import json
+import threading
+import types
+from time import perf_counter_ns
+
+# Each power of two is split into this many buckets (about 12% precision)
+_SUB_BUCKETS = 8
+_SUB_BITS = _SUB_BUCKETS.bit_length() - 1
+
+
+# ============================================================================
+# HISTOGRAM
+# ============================================================================
+
+def _bucket_index(value):
+    """Maps a duration in ns to a log-linear bucket number."""
+    if value < 2 * _SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - _SUB_BITS - 1
+    return shift * _SUB_BUCKETS + (value >> shift)
+
+
+def _bucket_upper(index):
+    """Largest duration in ns that falls into bucket `index`."""
+    if index < 2 * _SUB_BUCKETS:
+        return index
+    shift, sub = divmod(index, _SUB_BUCKETS)
+    shift -= 1
+    sub += _SUB_BUCKETS
+    return ((sub + 1) << shift) - 1
+
+
+class Histogram:
+    """
+    Thread-safe latency histogram with fixed memory.
+
+    Durations are counted in log-linear buckets, so percentiles are
+    approximate (within about 12%) while count, total and max are exact.
+    """
+
+    __slots__ = ("name", "count", "total_ns", "max_ns", "errors",
+                 "_buckets", "_lock")
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.errors = 0
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def record(self, duration_ns, failed=False):
+        """Adds one measured call."""
+        index = _bucket_index(duration_ns)
+        with self._lock:
+            self.count += 1
+            self.total_ns += duration_ns
+            if duration_ns > self.max_ns:
+                self.max_ns = duration_ns
+            if failed:
+                self.errors += 1
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def percentile(self, percent):
+        """Returns the approximate duration (ns) below which `percent`% of
+        calls finished."""
+        with self._lock:
+            if self.count == 0:
+                return 0
+            rank = self.count * percent / 100
+            seen = 0
+            for index in sorted(self._buckets):
+                seen += self._buckets[index]
+                if seen >= rank:
+                    return min(_bucket_upper(index), self.max_ns)
+            return self.max_ns
+
+    def reset(self):
+        with self._lock:
+            self.count = self.total_ns = self.max_ns = self.errors = 0
+            self._buckets.clear()
+
+    def summary(self):
+        """Returns the statistics as a plain dict (durations in ns)."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ns": self.total_ns,
+            "mean_ns": self.total_ns // self.count if self.count else 0,
+            "p50_ns": self.percentile(50),
+            "p95_ns": self.percentile(95),
+            "p99_ns": self.percentile(99),
+            "max_ns": self.max_ns,
+        }
+
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+class ProfileRegistry:
+    """
+    Holds one Histogram per instrumented function.
+
+    Args:
+        enabled: Start with timing switched on (can be toggled later with
+                 `enable()` / `disable()`)
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def histogram(self, name):
+        """Returns the histogram for `name`, creating it if needed."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(name))
+        return histogram
+
+    def instrument(self, func, name=None):
+        """
+        Wraps a function (or coroutine function) so every call is timed.
+
+        Args:
+            func: The function to wrap
+            name: Metric name (default: module.qualname)
+
+        Returns:
+            The wrapper, with the original name and docstring kept
+        """
+        if getattr(func, "__profiled__", None) is self:
+            return func  # already instrumented by this registry
+        histogram = self.histogram(
+            name or f"{func.__module__}.{func.__qualname__}")
+        registry = self
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                if not registry.enabled:
+                    return await func(*args, **kwargs)
+                start = perf_counter_ns()
+                failed = True
+                try:
+                    result = await func(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    histogram.record(perf_counter_ns() - start, failed)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not registry.enabled:
+                    return func(*args, **kwargs)
+                start = perf_counter_ns()
+                failed = True
+                try:
+                    result = func(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    histogram.record(perf_counter_ns() - start, failed)
+
+        wrapper.__profiled__ = self
+        return wrapper
+
+    def __call__(self, func=None, *, name=None):
+        """Lets the registry be used as a decorator: @registry or
+        @registry(name="...")."""
+        if func is None:
+            return lambda f: self.instrument(f, name)
+        return self.instrument(func, name)
+
+    def instrument_module(self, module, names=None):
+        """
+        Replaces every function defined in `module` with a timed wrapper.
+
+        Functions imported from other modules are left alone.
+
+        Args:
+            module: An imported module object
+            names: Optional list of attribute names to limit the wrapping to
+
+        Returns:
+            List of the attribute names that were instrumented
+        """
+        done = []
+        for attr, value in list(vars(module).items()):
+            if names is not None and attr not in names:
+                continue
+            if not isinstance(value, types.FunctionType):
+                continue
+            if value.__module__ != module.__name__:
+                continue
+            setattr(module, attr,
+                    self.instrument(value, f"{module.__name__}.{attr}"))
+            done.append(attr)
+        return done
+
+    def instrument_modules(self, *modules):
+        """Instruments several modules with one call."""
+        return {module.__name__: self.instrument_module(module)
+                for module in modules}
+
+    # ------------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------------
+
+    def snapshot(self):
+        """Returns {function name: summary dict} for every function called
+        at least once."""
+        return {name: histogram.summary()
+                for name, histogram in sorted(self._histograms.items())
+                if histogram.count}
+
+    def to_json(self, indent=None):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, metric="function_duration_seconds",
+                      errors_metric="function_errors_total"):
+        """
+        Returns the data in the Prometheus text exposition format: a
+        summary of the durations, and a counter of the calls that raised.
+        """
+        snapshot = self.snapshot()
+        labels = {name: name.replace("\\", "\\\\").replace('"', '\\"')
+                  for name in snapshot}
+        lines = [f"# HELP {metric} Time spent in instrumented functions.",
+                 f"# TYPE {metric} summary"]
+        for name, stats in snapshot.items():
+            label = labels[name]
+            for quantile, key in (("0.5", "p50_ns"), ("0.95", "p95_ns"),
+                                  ("0.99", "p99_ns")):
+                lines.append(f'{metric}{{function="{label}",'
+                             f'quantile="{quantile}"}} {stats[key] / 1e9:.9f}')
+            lines.append(f'{metric}_sum{{function="{label}"}} '
+                         f'{stats["total_ns"] / 1e9:.9f}')
+            lines.append(f'{metric}_count{{function="{label}"}} '
+                         f'{stats["count"]}')
+        lines += [f"# HELP {errors_metric} Calls of instrumented functions "
+                  f"that raised an exception.",
+                  f"# TYPE {errors_metric} counter"]
+        for name, stats in snapshot.items():
+            lines.append(f'{errors_metric}{{function="{labels[name]}"}} '
+                         f'{stats["errors"]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        for histogram in list(self._histograms.values()):
+            histogram.reset()
+
+
+# Shared registry
+default_registry = ProfileRegistry()
+
+
+def timer_decorator(func):
+    """
+    Production version of the practice `timer_decorator`: records the call
+    time into `default_registry` instead of printing it.
+    """
+    return default_registry.instrument(func)
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+
+    @timer_decorator
+    def slow_function():
+        """Sleeps a little, like the practice example."""
+        time.sleep(0.01)
+        return "Done!"
+
+    @timer_decorator
+    def failing_function():
+        raise ValueError("bad input")
+
+    for _ in range(20):
+        slow_function()
+    for _ in range(3):
+        try:
+            failing_function()
+        except ValueError:
+            pass
+    print(f"Name kept: {slow_function.__name__} - {slow_function.__doc__}")
+    print(default_registry.to_json(indent=2))
+    print(default_registry.to_prometheus())
+
+    # Overhead of the wrapper, enabled and disabled
+    def noop():
+        return None
+
+    wrapped = ProfileRegistry().instrument(noop)
+    calls = 200_000
+    for label, function in (("plain", noop), ("enabled", wrapped)):
+        start = perf_counter_ns()
+        for _ in range(calls):
+            function()
+        print(f"{label:>8}: {(perf_counter_ns() - start) / calls:6.0f} ns/call")
+    wrapped.__profiled__.disable()
+    start = perf_counter_ns()
+    for _ in range(calls):
+        wrapped()
+    print(f"disabled: {(perf_counter_ns() - start) / calls:6.0f} ns/call")
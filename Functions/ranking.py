@@ -0,0 +1,357 @@
+"""
+Leaderboard Ranking
+===================
+
+`student_management_system` ranks grades with `sorted(grades, reverse=True)`:
+a full O(n log n) sort and copy every time the ranking is read. A
+leaderboard whose scores change all the time and that is read for the top
+100 should not re-sort everything on each read.
+
+`Leaderboard` keeps the scores in an indexable skip list ordered from the
+highest score down. Every link remembers how many entries it jumps over,
+so positions can be counted while walking down the levels:
+
+- set / remove a student's score      O(log n) expected
+- rank_of(student), percentile(p)     O(log n) expected
+- top(k)                              O(log n + k), read off the front
+- snapshot()                          the same list as sorted(grades, reverse=True)
+
+Example:
+    board = Leaderboard({"Asha": 85, "Ravi": 92, "Ila": 78})
+    board.set("Ila", 95)
+    board.top(2)            # [('Ila', 95), ('Ravi', 92)]
+    board.rank_of("Asha")   # 3
+"""
+
+import math
+import random
+
+# Levels of the skip list; 2**32 entries before the top level fills up
+_MAX_LEVEL = 32
+
+
+class _Last:
+    """Key of the tail sentinel: greater than every real key."""
+
+    __slots__ = ()
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+
+_LAST = _Last()
+
+
+class _Node:
+    __slots__ = ("key", "student", "next", "width")
+
+    def __init__(self, key, student, level):
+        self.key = key
+        self.student = student
+        self.next = [None] * level
+        self.width = [0] * level    # entries skipped by next[level]
+
+
+class _IndexableSkipList:
+    """
+    Sorted keys with positions. width[level] of a node is the distance (in
+    level-0 steps) to node.next[level], so summing widths along a search
+    path gives the position of the node reached.
+    """
+
+    def __init__(self, seed=None):
+        self._random = random.Random(seed)
+        self.tail = _Node(_LAST, None, 0)
+        self.head = _Node(None, None, _MAX_LEVEL)
+        self.head.next = [self.tail] * _MAX_LEVEL
+        self.head.width = [1] * _MAX_LEVEL
+        self.levels = 1             # levels in use
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _random_level(self):
+        bits = self._random.getrandbits(_MAX_LEVEL - 1)
+        level = 1
+        while bits & 1:
+            level += 1
+            bits >>= 1
+        return level
+
+    def _path(self, key):
+        """Last node before `key` on every level, and its position."""
+        chain = [None] * self.levels
+        positions = [0] * self.levels
+        node = self.head
+        position = 0
+        for level in reversed(range(self.levels)):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+            positions[level] = position
+        return chain, positions
+
+    def insert(self, key, student):
+        level_count = self._random_level()
+        if level_count > self.levels:
+            for level in range(self.levels, level_count):
+                self.head.width[level] = self.size + 1
+            self.levels = level_count
+        chain, positions = self._path(key)
+        position = positions[0] + 1     # where the new node goes
+        node = _Node(key, student, level_count)
+        for level in range(level_count):
+            previous = chain[level]
+            node.next[level] = previous.next[level]
+            previous.next[level] = node
+            skipped = position - positions[level]
+            node.width[level] = previous.width[level] - skipped + 1
+            previous.width[level] = skipped
+        for level in range(level_count, self.levels):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, key):
+        chain, _ = self._path(key)
+        node = chain[0].next[0]
+        if node.key != key:
+            raise KeyError(key)
+        for level in range(len(node.next)):
+            previous = chain[level]
+            previous.width[level] += node.width[level] - 1
+            previous.next[level] = node.next[level]
+        for level in range(len(node.next), self.levels):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def count_below(self, key):
+        """Number of keys smaller than `key`."""
+        node = self.head
+        position = 0
+        for level in reversed(range(self.levels)):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        return position
+
+    def node_at(self, index):
+        """The node at position `index` (0 = smallest key)."""
+        if not 0 <= index < self.size:
+            raise IndexError("position out of range")
+        node = self.head
+        remaining = index + 1
+        for level in reversed(range(self.levels)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+                if remaining == 0:
+                    return node
+        return node
+
+    def nodes(self, start=0):
+        """Yields the nodes from position `start` on, in order."""
+        node = self.node_at(start) if start else self.head.next[0]
+        while node is not self.tail:
+            yield node
+            node = node.next[0]
+
+
+# ============================================================================
+# LEADERBOARD
+# ============================================================================
+
+class Leaderboard:
+    """
+    Student scores ranked from highest to lowest.
+
+    Equal scores share a rank (1, 2, 2, 4); among them the student who got
+    the score first is listed first.
+
+    Args:
+        scores: Optional dict {student: score} or iterable of pairs
+        seed: Seed for the skip list's random levels (for repeatable runs)
+    """
+
+    def __init__(self, scores=None, seed=None):
+        self._list = _IndexableSkipList(seed)
+        self._keys = {}             # student -> (-score, sequence)
+        self._sequence = 0
+        if scores is not None:
+            self.update(scores)
+
+    @classmethod
+    def from_grades(cls, grades):
+        """A leaderboard of a plain list of grades (students are the list
+        positions), e.g. the `grades` list of student_management_system."""
+        return cls(enumerate(grades))
+
+    def __len__(self):
+        return len(self._list)
+
+    def __contains__(self, student):
+        return student in self._keys
+
+    def __iter__(self):
+        """Students from the highest score down."""
+        return (node.student for node in self._list.nodes())
+
+    # ------------------------------------------------------------------------
+    # Changes
+    # ------------------------------------------------------------------------
+
+    def set(self, student, score):
+        """Inserts a student or changes their score."""
+        if isinstance(score, float) and math.isnan(score):
+            raise ValueError("a score cannot be NaN")
+        old = self._keys.get(student)
+        if old is not None:
+            if old[0] == -score:
+                return
+            self._list.remove(old)
+        self._sequence += 1
+        key = (-score, self._sequence)
+        self._list.insert(key, student)
+        self._keys[student] = key
+
+    def update(self, scores):
+        """Sets many scores: a dict or an iterable of (student, score)."""
+        items = scores.items() if hasattr(scores, "items") else scores
+        for student, score in items:
+            self.set(student, score)
+
+    def remove(self, student):
+        """Removes a student (KeyError if unknown)."""
+        self._list.remove(self._keys.pop(student))
+
+    def discard(self, student):
+        if student in self._keys:
+            self.remove(student)
+
+    # ------------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------------
+
+    def score(self, student):
+        return -self._keys[student][0]
+
+    def top(self, k=10):
+        """The k best (student, score) pairs, best first."""
+        result = []
+        for node in self._list.nodes():
+            if len(result) >= k:
+                break
+            result.append((node.student, -node.key[0]))
+        return result
+
+    def rank_of(self, student):
+        """1-based rank: 1 + the number of strictly higher scores."""
+        score = self._keys[student][0]
+        return self._list.count_below((score, -math.inf)) + 1
+
+    def percentile_of(self, student):
+        """Percentage of the other students with a lower score (0-100)."""
+        if len(self) == 1:
+            return 100.0
+        score = self._keys[student][0]
+        lower = len(self) - self._list.count_below((score, math.inf))
+        return 100.0 * lower / (len(self) - 1)
+
+    def percentile(self, percent):
+        """
+        The score at a percentile (nearest-rank method): percentile(50) is
+        the median, percentile(90) the score 90% of students are at or
+        below.
+        """
+        if not self:
+            raise ValueError("the leaderboard is empty")
+        if not 0 <= percent <= 100:
+            raise ValueError("percent must be between 0 and 100")
+        from_bottom = max(1, math.ceil(percent / 100 * len(self)))
+        return -self._list.node_at(len(self) - from_bottom).key[0]
+
+    def at(self, rank_position):
+        """(student, score) at a 0-based position of the ranking."""
+        node = self._list.node_at(rank_position)
+        return node.student, -node.key[0]
+
+    def snapshot(self):
+        """All scores, highest first: equal to sorted(grades, reverse=True)."""
+        return [-node.key[0] for node in self._list.nodes()]
+
+    def items(self):
+        """All (student, score) pairs, highest first."""
+        return [(node.student, -node.key[0]) for node in self._list.nodes()]
+
+
+# ============================================================================
+# MAIN EXECUTION - checks + benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+
+    grades = [85, 92, 78, 88, 95]
+    board = Leaderboard.from_grades(grades)
+    assert board.snapshot() == sorted(grades, reverse=True)
+    print(f"Sorted grades (descending): {board.snapshot()}")
+
+    # Random changes, checked against sorting a dict every time
+    rng = random.Random(3)
+    board = Leaderboard(seed=1)
+    scores = {}
+    for step in range(20_000):
+        student = rng.randrange(300)
+        if student in scores and rng.random() < 0.2:
+            board.remove(student)
+            del scores[student]
+        else:
+            scores[student] = board_score = rng.randrange(100)
+            board.set(student, board_score)
+        if step % 500 == 0 and scores:
+            expected = sorted(scores.values(), reverse=True)
+            assert board.snapshot() == expected
+            assert [score for _, score in board.top(10)] == expected[:10]
+            someone = rng.choice(list(scores))
+            assert board.rank_of(someone) == 1 + sum(
+                value > scores[someone] for value in scores.values())
+            assert board.percentile(50) == expected[
+                len(expected) - max(1, math.ceil(len(expected) / 2))]
+            assert all(board.at(i)[1] == expected[i]
+                       for i in range(len(expected)))
+    print("Leaderboard matches sorting after 20,000 random changes")
+
+    students = 100_000
+    updates = 100_000
+    board = Leaderboard(seed=7)
+    scores = {}
+    for student in range(students):
+        scores[student] = rng.randrange(1_000_000)
+    start = time.perf_counter()
+    board.update(scores)
+    print(f"build {students:,} students: {time.perf_counter() - start:.2f}s")
+
+    changes = [(rng.randrange(students), rng.randrange(1_000_000))
+               for _ in range(updates)]
+    start = time.perf_counter()
+    for number, (student, score) in enumerate(changes):
+        board.set(student, score)
+        if number % 100 == 0:
+            board.top(100)
+            board.rank_of(student)
+    took = time.perf_counter() - start
+    print(f"{updates:,} updates + {updates // 100:,} top-100/rank reads: "
+          f"{took:.2f}s ({took / updates * 1e6:.1f} us per update)")
+
+    start = time.perf_counter()
+    for number, (student, score) in enumerate(changes[:10_000]):
+        scores[student] = score
+        if number % 100 == 0:
+            sorted(scores.values(), reverse=True)[:100]
+    took = time.perf_counter() - start
+    print(f"same with sorted() per read (10,000 updates): {took:.2f}s "
+          f"({took / 10_000 * 1e6:.1f} us per update)")
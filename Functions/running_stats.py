@@ -0,0 +1,195 @@
+"""
+Running Statistics
+==================
+
+`get_stats` (PRACTICE_QUESTIONS.py) walks the list twice, once for `min()`
+and once for `max()`. `calculate_average` (Functions.py) needs every value
+unpacked into `*numbers`. Neither works on an endless stream of metrics.
+
+RunningStats keeps count, sum, min, max, mean and variance in O(1) memory.
+The variance uses Welford's update, which stays accurate where the naive
+"sum of squares" formula loses precision. Two accumulators built on
+different shards can be combined with `merge()`.
+
+Example:
+    stats = RunningStats()
+    for value in metric_stream:
+        stats.update(value)
+    stats.mean, stats.variance, stats.min, stats.max
+"""
+
+import sys
+
+
+class RunningStats:
+    """
+    Incremental count / sum / min / max / mean / variance accumulator.
+
+    `min` and `max` follow the same rules as the built-in `min()` and
+    `max()` (the first of equal values wins), and `mean` is `total / count`,
+    so the wrappers in the practice files return exactly what they did
+    before.
+    """
+
+    __slots__ = ("count", "total", "min", "max", "_mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self._mean = 0.0   # Welford running mean
+        self._m2 = 0.0     # sum of squared distances from the mean
+
+    @classmethod
+    def from_values(cls, values):
+        """Builds an accumulator from an iterable in one call."""
+        stats = cls()
+        stats.update_many(values)
+        return stats
+
+    def update(self, value):
+        """Adds one value."""
+        self.count += 1
+        self.total += value
+        if self.count == 1:
+            self.min = self.max = value
+        else:
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+    def update_many(self, values):
+        """
+        Adds many values.
+
+        NumPy arrays, array.array, lists and tuples are summarised as one
+        batch (sum/min/max in C, then one pass for the variance) and merged;
+        any other iterable is consumed one value at a time.
+        """
+        # An ndarray can only exist if NumPy is already loaded, so look it
+        # up instead of importing it (keeps importing this module cheap)
+        np = sys.modules.get("numpy")
+        if np is not None and isinstance(values, np.ndarray):
+            if values.size:
+                batch = RunningStats()
+                batch.count = int(values.size)
+                batch.total = values.sum().item()
+                batch.min = values.min().item()
+                batch.max = values.max().item()
+                batch._mean = batch.total / batch.count
+                batch._m2 = float(((values - batch._mean) ** 2).sum())
+                self.merge(batch)
+            return self
+
+        if hasattr(values, "__len__") and hasattr(values, "__getitem__"):
+            if len(values):
+                batch = RunningStats()
+                batch.count = len(values)
+                batch.total = sum(values)
+                batch.min = min(values)
+                batch.max = max(values)
+                mean = batch._mean = batch.total / batch.count
+                batch._m2 = sum((value - mean) ** 2 for value in values)
+                self.merge(batch)
+            return self
+
+        update = self.update
+        for value in values:
+            update(value)
+        return self
+
+    def merge(self, other):
+        """
+        Combines another accumulator into this one (Chan et al. formula).
+
+        Returns:
+            self, to allow chaining
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count = other.count
+            self.total = other.total
+            self.min = other.min
+            self.max = other.max
+            self._mean = other._mean
+            self._m2 = other._m2
+            return self
+
+        count = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        if other.min < self.min:
+            self.min = other.min
+        if other.max > self.max:
+            self.max = other.max
+        return self
+
+    @property
+    def mean(self):
+        """Average of the values (None if there are none)."""
+        if self.count == 0:
+            return None
+        return self.total / self.count
+
+    @property
+    def variance(self):
+        """Population variance (None if there are no values)."""
+        if self.count == 0:
+            return None
+        return self._m2 / self.count
+
+    @property
+    def sample_variance(self):
+        """Sample variance (None if there are fewer than two values)."""
+        if self.count < 2:
+            return None
+        return self._m2 / (self.count - 1)
+
+    @property
+    def stddev(self):
+        variance = self.variance
+        return None if variance is None else variance ** 0.5
+
+    def as_dict(self):
+        return {"count": self.count, "sum": self.total, "min": self.min,
+                "max": self.max, "mean": self.mean,
+                "variance": self.variance}
+
+    def __repr__(self):
+        return (f"RunningStats(count={self.count}, mean={self.mean}, "
+                f"min={self.min}, max={self.max}, variance={self.variance})")
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import statistics
+
+    values = [random.gauss(1e9, 1.0) for _ in range(100_000)]
+
+    streamed = RunningStats()
+    for value in values:
+        streamed.update(value)
+
+    # Same data split into shards and merged
+    shards = [RunningStats.from_values(values[i:i + 7_000])
+              for i in range(0, len(values), 7_000)]
+    merged = RunningStats()
+    for shard in shards:
+        merged.merge(shard)
+
+    print(f"streamed : {streamed}")
+    print(f"merged   : {merged}")
+    print(f"statistics.pvariance: {statistics.pvariance(values)}")
@@ -0,0 +1,370 @@
+"""
+Columnar Student Store
+======================
+
+`create_profile` in Functions.py builds a new dict for every student, with
+a nested `hobbies` list and an `additional_info` dict. With a million
+students those dicts use most of the memory.
+
+StudentStore keeps the same information in columns instead:
+- every value (name, university, hobby, ...) is stored once in a pool
+- each column is an `array` of 32-bit integer ids pointing into the pool
+- hobbies are one flat id array plus an offsets array
+
+Rows are read back through `StudentRecord`, a tiny `__slots__` object, or
+as the exact dict `create_profile` would have returned.
+
+Example:
+    store = StudentStore()
+    store.add("Emma", 22, "Reading", "Coding", university="MIT",
+              graduation_year=2025)
+    store.where(graduation_year=2025)   # [0]
+"""
+
+from array import array
+
+# Id stored in an additional_info column when a student has no such key
+MISSING = -1
+
+
+# ============================================================================
+# VALUE POOL - each distinct value stored only once
+# ============================================================================
+
+class ValuePool:
+    """Maps values to small integer ids so repeated values are shared."""
+
+    __slots__ = ("_ids", "values")
+
+    def __init__(self):
+        self._ids = {}
+        self.values = []
+
+    def add(self, value):
+        """Returns the id of `value`, adding it to the pool if needed."""
+        # One dict per type, so 1, 1.0 and True stay distinct values
+        ids = self._ids.get(type(value))
+        if ids is None:
+            ids = self._ids[type(value)] = {}
+        try:
+            value_id = ids.get(value)
+        except TypeError:  # unhashable values (lists, dicts) are not shared
+            ids = None
+            value_id = None
+        if value_id is None:
+            value_id = len(self.values)
+            self.values.append(value)
+            if ids is not None:
+                ids[value] = value_id
+        return value_id
+
+    def find(self, value):
+        """Returns the id of `value`, or None if it was never added."""
+        try:
+            return self._ids.get(type(value), {}).get(value)
+        except TypeError:
+            return None
+
+    def find_equal(self, value):
+        """
+        Returns the ids of every pooled value that is == `value`, whatever
+        its type (2025, 2025.0 and True == 1 each have their own id).
+        """
+        found = set()
+        for ids in self._ids.values():
+            try:
+                value_id = ids.get(value)
+            except TypeError:
+                return found
+            if value_id is not None:
+                found.add(value_id)
+        return found
+
+    def __len__(self):
+        return len(self.values)
+
+
+# ============================================================================
+# RECORD VIEW
+# ============================================================================
+
+class StudentRecord:
+    """
+    Lightweight view of one row of a StudentStore.
+
+    Holds only the store and the row number; fields are looked up when
+    they are accessed.
+    """
+
+    __slots__ = ("_store", "index")
+
+    def __init__(self, store, index):
+        self._store = store
+        self.index = index
+
+    @property
+    def name(self):
+        return self._store._value(self._store._names[self.index])
+
+    @property
+    def age(self):
+        return self._store._value(self._store._ages[self.index])
+
+    @property
+    def hobbies(self):
+        return self._store.hobbies(self.index)
+
+    @property
+    def additional_info(self):
+        return self._store.additional_info(self.index)
+
+    def __getitem__(self, key):
+        """Supports profile["name"] style access like the old dicts."""
+        if key in ("name", "age", "hobbies", "additional_info"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def to_dict(self):
+        """Returns the same dict `create_profile` builds."""
+        return self._store.to_profile(self.index)
+
+    def __repr__(self):
+        return f"StudentRecord({self.to_dict()!r})"
+
+
+# ============================================================================
+# STUDENT STORE
+# ============================================================================
+
+class StudentStore:
+    """
+    Column-oriented storage for student profiles.
+
+    Accepts the same arguments as `create_profile(name, age, *hobbies,
+    **additional_info)`.
+    """
+
+    def __init__(self):
+        self._pool = ValuePool()
+        self._names = array("i")
+        self._ages = array("i")
+        self._hobby_ids = array("i")
+        self._hobby_offsets = array("i", [0])
+        self._info = {}  # key -> array of value ids (MISSING if absent)
+
+    def _value(self, value_id):
+        return self._pool.values[value_id]
+
+    def add(self, name, age, *hobbies, **additional_info):
+        """
+        Adds one student.
+
+        Returns:
+            The row number of the new student
+        """
+        add = self._pool.add
+        index = len(self._names)
+
+        self._names.append(add(name))
+        self._ages.append(add(age))
+
+        self._hobby_ids.extend(add(hobby) for hobby in hobbies)
+        self._hobby_offsets.append(len(self._hobby_ids))
+
+        for key, value in additional_info.items():
+            column = self._info.get(key)
+            if column is None:
+                # New key: earlier students do not have it
+                column = self._info[key] = array("i", [MISSING]) * index
+            column.append(add(value))
+        for key, column in self._info.items():
+            if len(column) == index:
+                column.append(MISSING)
+
+        return index
+
+    def extend(self, profiles):
+        """
+        Adds many students from `create_profile`-style dicts.
+
+        Args:
+            profiles: Iterable of dicts with name, age, hobbies and
+                      additional_info keys
+        """
+        for profile in profiles:
+            self.add(profile["name"], profile["age"], *profile["hobbies"],
+                     **profile["additional_info"])
+
+    def __len__(self):
+        return len(self._names)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("student index out of range")
+        return StudentRecord(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield StudentRecord(self, index)
+
+    def hobbies(self, index):
+        """Returns the hobbies of one student as a list."""
+        start = self._hobby_offsets[index]
+        end = self._hobby_offsets[index + 1]
+        values = self._pool.values
+        return [values[value_id] for value_id in self._hobby_ids[start:end]]
+
+    def additional_info(self, index):
+        """Returns the additional info of one student as a dict."""
+        values = self._pool.values
+        return {key: values[column[index]]
+                for key, column in self._info.items()
+                if column[index] != MISSING}
+
+    def to_profile(self, index):
+        """Returns the same dict `create_profile` would have built."""
+        return {
+            "name": self._value(self._names[index]),
+            "age": self._value(self._ages[index]),
+            "hobbies": self.hobbies(index),
+            "additional_info": self.additional_info(index)
+        }
+
+    # ------------------------------------------------------------------------
+    # Column scans
+    # ------------------------------------------------------------------------
+
+    def _column(self, key):
+        if key == "name":
+            return self._names
+        if key == "age":
+            return self._ages
+        return self._info.get(key)
+
+    def column(self, key):
+        """
+        Yields the value of `key` for every student (None when missing).
+
+        Args:
+            key: "name", "age" or any additional_info key
+        """
+        column = self._column(key)
+        if column is None:
+            raise KeyError(key)
+        values = self._pool.values
+        for value_id in column:
+            yield None if value_id == MISSING else values[value_id]
+
+    def where(self, **conditions):
+        """
+        Finds students whose columns equal the given values.
+
+        The values are turned into pool ids once, so the scan only compares
+        integers. Values match with ==, as in a dict scan: 2025.0 finds
+        students stored with 2025.
+
+        Example:
+            store.where(graduation_year=2025, university="MIT")
+
+        Returns:
+            List of matching row numbers
+
+        Raises:
+            KeyError: For a column no student has, like `column()`
+        """
+        columns = []
+        for key, value in conditions.items():
+            column = self._column(key)
+            if column is None:
+                raise KeyError(key)
+            columns.append((column, self._pool.find_equal(value)))
+
+        matches = None
+        for column, value_ids in columns:
+            if not value_ids:
+                return []
+            if len(value_ids) == 1:
+                value_id, = value_ids
+                if matches is None:
+                    matches = [index for index, found in enumerate(column)
+                               if found == value_id]
+                else:
+                    matches = [index for index in matches
+                               if column[index] == value_id]
+            elif matches is None:
+                matches = [index for index, found in enumerate(column)
+                           if found in value_ids]
+            else:
+                matches = [index for index in matches
+                           if column[index] in value_ids]
+            if not matches:
+                return []
+        return matches if matches is not None else list(range(len(self)))
+
+
+# ============================================================================
+# MAIN EXECUTION - Memory benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import sys
+    import time
+    import tracemalloc
+
+    def create_profile(name, age, *hobbies, **additional_info):
+        # Same as Functions.py
+        profile = {
+            "name": name,
+            "age": age,
+            "hobbies": list(hobbies),
+            "additional_info": additional_info
+        }
+        return profile
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    universities = ["MIT", "Stanford", "Oxford", "IIT Delhi", "ETH Zurich"]
+    hobby_names = ["Reading", "Coding", "Gaming", "Chess", "Music"]
+    rng = random.Random(42)
+    rows = [(f"student{i}", rng.randint(17, 30),
+             rng.sample(hobby_names, rng.randint(0, 3)),
+             {"university": rng.choice(universities),
+              "graduation_year": rng.randint(2020, 2030),
+              "email": f"student{i}@example.com"})
+            for i in range(count)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    profiles = [create_profile(name, age, *hobbies, **info)
+                for name, age, hobbies, info in rows]
+    dict_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = StudentStore()
+    for name, age, hobbies, info in rows:
+        store.add(name, age, *hobbies, **info)
+    store_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(f"Students       : {count:,}")
+    print(f"dict profiles  : {dict_bytes / 1e6:8.1f} MB")
+    print(f"StudentStore   : {store_bytes / 1e6:8.1f} MB "
+          f"({dict_bytes / store_bytes:.1f}x smaller)")
+    print("(names and emails are unique strings held by both versions)")
+
+    start = time.perf_counter()
+    expected = [i for i, p in enumerate(profiles)
+                if p["additional_info"].get("graduation_year") == 2025]
+    dict_time = time.perf_counter() - start
+    start = time.perf_counter()
+    found = store.where(graduation_year=2025)
+    store_time = time.perf_counter() - start
+    assert found == expected
+    print(f"graduation_year=2025: {len(found):,} students "
+          f"(dicts {dict_time * 1e3:.1f} ms, store {store_time * 1e3:.1f} ms)")
+
+    assert all(store.to_profile(i) == profiles[i] for i in range(0, count, 997))
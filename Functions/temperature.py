@@ -0,0 +1,351 @@
+"""
+Batch Temperature Conversion
+============================
+
+`temperature_converter` (PRACTICE_QUESTIONS.py) converts one value per call
+and runs `unit.upper()` and the string comparisons every time.
+
+This module looks the conversion up once per batch (or once per unit code
+in a mixed batch) and applies it to a whole buffer:
+
+- `convert_batch` works on lists, array.array and NumPy arrays, with one
+  unit for everything or a unit code per reading, and can write into a
+  preallocated output (or the input itself, in place). NumPy writes with
+  ufuncs into `out` directly; other outputs are filled in bounded chunks,
+  so no full-size temporary is built.
+- `convert_lines` streams line-delimited sensor files ("21.5 C").
+
+Units: 'C' (Celsius), 'F' (Fahrenheit) and 'K' (Kelvin). When no target
+unit is given, C and F are converted to "the other one" like
+`temperature_converter` does, and K is converted to C.
+
+The formulas keep the same order of operations as `temperature_converter`,
+so C <-> F results are bit-for-bit identical to it.
+"""
+
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+KELVIN_OFFSET = 273.15
+
+
+def c_to_f(t):
+    return (t * 9/5) + 32
+
+
+def f_to_c(t):
+    return (t - 32) * 5/9
+
+
+def c_to_k(t):
+    return t + KELVIN_OFFSET
+
+
+def k_to_c(t):
+    return t - KELVIN_OFFSET
+
+
+def f_to_k(t):
+    return (t - 32) * 5/9 + KELVIN_OFFSET
+
+
+def k_to_f(t):
+    return ((t - KELVIN_OFFSET) * 9/5) + 32
+
+
+def same_unit(t):
+    return t + 0.0
+
+
+def _unknown_unit(t):
+    return math.nan
+
+
+# (from, to) -> function of one temperature. Plain + - * /, so they also
+# work element-wise on a NumPy array.
+CONVERSIONS = {
+    ("C", "F"): c_to_f, ("F", "C"): f_to_c,
+    ("C", "K"): c_to_k, ("K", "C"): k_to_c,
+    ("F", "K"): f_to_k, ("K", "F"): k_to_f,
+    ("C", "C"): same_unit, ("F", "F"): same_unit, ("K", "K"): same_unit,
+}
+
+# The same formulas as NumPy ufunc steps, applied with out= so no
+# temporaries are needed: (t * 9/5) + 32 is multiply 9, divide 5, add 32
+UFUNC_STEPS = {
+    ("C", "F"): (("multiply", 9), ("divide", 5), ("add", 32)),
+    ("F", "C"): (("subtract", 32), ("multiply", 5), ("divide", 9)),
+    ("C", "K"): (("add", KELVIN_OFFSET),),
+    ("K", "C"): (("subtract", KELVIN_OFFSET),),
+    ("F", "K"): (("subtract", 32), ("multiply", 5), ("divide", 9),
+                 ("add", KELVIN_OFFSET)),
+    ("K", "F"): (("subtract", KELVIN_OFFSET), ("multiply", 9),
+                 ("divide", 5), ("add", 32)),
+    ("C", "C"): (("add", 0.0),),
+    ("F", "F"): (("add", 0.0),),
+    ("K", "K"): (("add", 0.0),),
+}
+
+# Values converted per chunk when writing into a non-NumPy `out`
+CHUNK_SIZE = 1 << 16
+
+# Target used when none is given (same pairs as temperature_converter)
+DEFAULT_TARGET = {"C": "F", "F": "C", "K": "C"}
+
+
+def _unit(unit):
+    """Normalizes 'c', 'C', b'C' or ord('C') to 'C' (None if unknown)."""
+    if isinstance(unit, int):
+        unit = chr(unit)
+    elif isinstance(unit, (bytes, bytearray)):
+        unit = unit.decode("ascii", "replace")
+    unit = unit.upper()
+    return unit if unit in DEFAULT_TARGET else None
+
+
+def _pair(from_unit, to_unit):
+    """Validates and normalizes a (from, to) unit pair."""
+    source = _unit(from_unit)
+    if source is None:
+        raise ValueError(f"unknown temperature unit {from_unit!r}")
+    target = DEFAULT_TARGET[source] if to_unit is None else _unit(to_unit)
+    if target is None:
+        raise ValueError(f"unknown temperature unit {to_unit!r}")
+    return source, target
+
+
+def get_conversion(from_unit, to_unit=None):
+    """
+    Returns the function converting `from_unit` to `to_unit`.
+
+    Raises:
+        ValueError: For an unknown unit
+    """
+    return CONVERSIONS[_pair(from_unit, to_unit)]
+
+
+# ============================================================================
+# BATCH CONVERSION
+# ============================================================================
+
+def _convert_mixed(values, codes, to_unit):
+    """Converts each value by its unit code (unknown codes give NaN)."""
+    by_code = {source: CONVERSIONS[source, to_unit or DEFAULT_TARGET[source]]
+               for source in DEFAULT_TARGET}
+    get = by_code.get
+    return [get(code, _unknown_unit)(t) for t, code in zip(values, codes)]
+
+
+def _unit_codes(units, size):
+    """Turns a str/bytes/list of unit codes into one upper-case str."""
+    if isinstance(units, (bytes, bytearray)):
+        units = units.decode("ascii")
+    elif not isinstance(units, str):
+        units = "".join(_unit(unit) or "?" for unit in units)
+    if len(units) != size:
+        raise ValueError("need exactly one unit code per value")
+    return units.upper()
+
+
+def _convert_numpy(values, source, target, out=None):
+    """Applies UFUNC_STEPS, writing every step into `out` (a new float64
+    array when not given, so integer readings work too)."""
+    if out is None:
+        out = np.empty(values.shape, dtype=np.float64)
+    for name, constant in UFUNC_STEPS[source, target]:
+        out = getattr(np, name)(values, constant, out=out)
+        values = out
+    return out
+
+
+def _store(out, start, converted):
+    """Writes one converted chunk (a list) into `out` at `start`."""
+    if isinstance(out, array):
+        converted = array(out.typecode, converted)
+    out[start:start + len(converted)] = converted
+
+
+def convert_batch(values, unit, to_unit=None, out=None):
+    """
+    Converts many temperatures at once.
+
+    Args:
+        values: list, array.array('d'/'f') or NumPy array of temperatures
+        unit: One unit for every value ('C'), or one code per value as a
+              str ("CFKC..."), bytes, or list (a list is always read as
+              one code per value, even with a single element)
+        to_unit: Target unit (default: the "other" unit, see module doc)
+        out: Optional preallocated output of the same length; pass `values`
+             itself to convert in place
+
+    Returns:
+        `out` if given, otherwise a new array.array('d') (or NumPy array
+        for NumPy input). With one code per value, readings with an
+        unknown unit become NaN.
+    """
+    size = len(values)
+    if out is not None and len(out) != size:
+        raise ValueError("out must have the same length as values")
+    is_numpy = np is not None and isinstance(values, np.ndarray)
+    numpy_out = out is None or (np is not None and isinstance(out, np.ndarray))
+
+    single = isinstance(unit, int) or (
+        isinstance(unit, (str, bytes, bytearray)) and len(unit) == 1)
+    if single:
+        source, target = _pair(unit, to_unit)
+        if is_numpy and numpy_out:
+            return _convert_numpy(values, source, target, out)
+        convert = CONVERSIONS[source, target]
+        if out is None:
+            return array("d", map(convert, values))
+        for start in range(0, size, CHUNK_SIZE):
+            _store(out, start,
+                   list(map(convert, values[start:start + CHUNK_SIZE])))
+        return out
+
+    codes = _unit_codes(unit, size)
+    if is_numpy and numpy_out:
+        result = np.empty(size) if out is None else out
+        code_array = np.frombuffer(codes.encode("ascii"), dtype=np.uint8)
+        known = np.zeros(size, dtype=bool)
+        for source in DEFAULT_TARGET:
+            mask = code_array == ord(source)
+            if mask.any():
+                target = DEFAULT_TARGET[source] if to_unit is None \
+                    else _pair(source, to_unit)[1]
+                result[mask] = _convert_numpy(values[mask], source, target)
+                known |= mask
+        result[~known] = np.nan
+        return result
+    target = None if to_unit is None else _pair("C", to_unit)[1]
+    if out is None:
+        return array("d", _convert_mixed(values, codes, target))
+    for start in range(0, size, CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        _store(out, start,
+               _convert_mixed(values[start:stop], codes[start:stop], target))
+    return out
+
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+def convert_lines(lines, to_unit=None, default_unit=None):
+    """
+    Converts a line-delimited stream of readings lazily.
+
+    Each line is "<value> <unit>" or "<value>,<unit>"; lines with only a
+    value use `default_unit`. Blank lines are skipped. A reading with an
+    unknown unit yields None, like `temperature_converter`.
+
+    Args:
+        lines: Any iterable of lines (e.g. an open file)
+        to_unit: Target unit (default: the "other" unit)
+        default_unit: Unit for lines that do not name one
+
+    Yields:
+        Converted temperatures as floats (or None)
+
+    Raises:
+        ValueError: If `to_unit` is unknown, or a value is not a number
+                    (with the line number)
+    """
+    if to_unit is not None and _unit(to_unit) is None:
+        raise ValueError(f"unknown temperature unit {to_unit!r}")
+    cache = {}
+    for line_number, line in enumerate(lines, 1):
+        parts = line.replace(",", " ").split()
+        if not parts:
+            continue
+        unit = parts[1] if len(parts) > 1 else default_unit
+        convert = cache.get(unit)
+        if convert is None and unit not in cache:
+            try:
+                convert = get_conversion(unit, to_unit)
+            except (ValueError, AttributeError):
+                convert = None
+            cache[unit] = convert
+        try:
+            value = float(parts[0])
+        except ValueError:
+            raise ValueError(f"line {line_number}: bad temperature "
+                             f"{parts[0]!r}") from None
+        yield None if convert is None else convert(value)
+
+
+# ============================================================================
+# MAIN EXECUTION - Benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    def temperature_converter(temp, unit):
+        # Same as PRACTICE_QUESTIONS.py
+        if unit.upper() == 'C':
+            return (temp * 9/5) + 32
+        elif unit.upper() == 'F':
+            return (temp - 32) * 5/9
+        else:
+            return None
+
+    size = 1_000_000
+    readings = array("d", (random.uniform(-40, 120) for _ in range(size)))
+    units = "".join(random.choice("CF") for _ in range(size))
+
+    start = time.perf_counter()
+    expected = [temperature_converter(t, "c") for t in readings]
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = convert_batch(readings, "c")
+    batch = time.perf_counter() - start
+    assert list(result) == expected
+    print(f"scalar loop, one unit  : {size / scalar / 1e6:6.2f} M values/s")
+    print(f"convert_batch, one unit: {size / batch / 1e6:6.2f} M values/s")
+
+    start = time.perf_counter()
+    expected = [temperature_converter(t, u) for t, u in zip(readings, units)]
+    scalar = time.perf_counter() - start
+    out = array("d", bytes(8 * size))
+    start = time.perf_counter()
+    convert_batch(readings, units, out=out)
+    batch = time.perf_counter() - start
+    assert list(out) == expected
+    print(f"scalar loop, mixed     : {size / scalar / 1e6:6.2f} M values/s")
+    print(f"convert_batch, mixed   : {size / batch / 1e6:6.2f} M values/s")
+
+    if np is not None:
+        np_readings = np.frombuffer(readings, dtype=np.float64)
+        start = time.perf_counter()
+        converted = convert_batch(np_readings, "C")
+        print(f"convert_batch, numpy   : "
+              f"{size / (time.perf_counter() - start) / 1e6:6.2f} M values/s")
+        assert converted.tolist() == list(result)
+
+        # Integer readings (sensor counts) give float results, one unit
+        # for all and mixed
+        counts = np.array([-40, 0, 37, 100, 300])
+        for source in "CFK":
+            for target in "CFK":
+                converted = convert_batch(counts, source, target)
+                assert converted.dtype == np.float64
+                assert converted.tolist() == [
+                    CONVERSIONS[source, target](float(t)) for t in counts]
+        mixed = convert_batch(counts, "CFKCX")
+        assert mixed[:4].tolist() == [c_to_f(-40), f_to_c(0), k_to_c(37),
+                                      c_to_f(100)]
+        assert math.isnan(mixed[4])
+
+    lines = [f"{t:.2f} {u}\n" for t, u in zip(readings[:200_000], units)]
+    start = time.perf_counter()
+    count = sum(1 for _ in convert_lines(lines))
+    print(f"convert_lines          : "
+          f"{count / (time.perf_counter() - start) / 1e6:6.2f} M lines/s")
@@ -0,0 +1,264 @@
+"""
+Word-Frequency and N-Gram Index
+===============================
+
+`analyze_text` counts the words and then throws them away. When the same
+documents are searched again and again it is much cheaper to keep what
+that pass already saw.
+
+TextIndex computes the usual `analyze_text` statistics for every document
+and, in the same pass over its words, builds:
+
+- an inverted index: term -> documents and word positions, stored as
+  delta-encoded `array`s (small gaps instead of large absolute numbers)
+- unigram and bigram frequency tables
+
+Queries (top-k terms, document lookup, phrase search) are answered from
+the index without reading the text again.
+
+Example:
+    index = TextIndex()
+    index.add("Hello world! This is Python.")
+    index.add("Python functions are great. Hello again!")
+    index.top_terms(2)             # [('hello', 2), ('python', 2)]
+    index.phrase("python functions")   # [(1, 0)]: document 1, word 0
+"""
+
+import heapq
+from array import array
+from collections import Counter
+from itertools import accumulate
+
+try:
+    from .text_stream import WORD_PUNCTUATION, TextStats
+except ImportError:
+    from text_stream import WORD_PUNCTUATION, TextStats
+
+
+def normalize(word):
+    """Turns a word into an index term: punctuation stripped, lower case."""
+    return word.strip(WORD_PUNCTUATION).lower()
+
+
+# ============================================================================
+# POSTINGS
+# ============================================================================
+
+class Postings:
+    """
+    Compact posting list of one term.
+
+    Documents are added in increasing id order, so only the gap to the
+    previous document id is stored. Positions inside a document are stored
+    the same way, restarting for every document.
+    """
+
+    __slots__ = ("doc_gaps", "counts", "position_gaps", "_last_doc")
+
+    def __init__(self):
+        self.doc_gaps = array("I")
+        self.counts = array("I")          # positions stored per document
+        self.position_gaps = array("I")
+        self._last_doc = 0
+
+    def add(self, doc_id, positions):
+        self.doc_gaps.append(doc_id - self._last_doc)
+        self._last_doc = doc_id
+        self.counts.append(len(positions))
+        previous = 0
+        for position in positions:
+            self.position_gaps.append(position - previous)
+            previous = position
+
+    def documents(self):
+        """Returns the document ids containing the term."""
+        return list(accumulate(self.doc_gaps))
+
+    def items(self):
+        """Yields (doc_id, positions list) for every document."""
+        start = 0
+        for doc_id, count in zip(accumulate(self.doc_gaps), self.counts):
+            gaps = self.position_gaps[start:start + count]
+            start += count
+            yield doc_id, list(accumulate(gaps))
+
+    def __len__(self):
+        return len(self.counts)
+
+
+# ============================================================================
+# INDEXING PASS
+# ============================================================================
+
+class _IndexingStats(TextStats):
+    """TextStats that also hands every complete word to the index."""
+
+    __slots__ = ("_positions", "_position", "_previous_term", "_index")
+
+    def __init__(self, index):
+        super().__init__()
+        self._index = index
+        self._positions = {}        # term -> positions in this document
+        self._position = 0
+        self._previous_term = None
+
+    def _add_words(self, words):
+        super()._add_words(words)
+        positions = self._positions
+        unigrams = self._index.unigrams
+        bigrams = self._index.bigrams
+        previous = self._previous_term
+        position = self._position
+        for word in words:
+            term = normalize(word)
+            if term:
+                found = positions.get(term)
+                if found is None:
+                    positions[term] = [position]
+                else:
+                    found.append(position)
+                unigrams[term] += 1
+                if previous is not None:
+                    bigrams[previous, term] += 1
+                previous = term
+            else:
+                previous = None     # a bare "!!" breaks the phrase
+            position += 1
+        self._previous_term = previous
+        self._position = position
+
+
+# ============================================================================
+# TEXT INDEX
+# ============================================================================
+
+class TextIndex:
+    """Inverted index and n-gram tables over a growing set of documents."""
+
+    def __init__(self):
+        self.postings = {}          # term -> Postings
+        self.unigrams = Counter()
+        self.bigrams = Counter()
+        self.stats = []             # analyze_text result per document
+
+    def __len__(self):
+        return len(self.stats)
+
+    def add(self, text):
+        """
+        Indexes one document given as a string.
+
+        Returns:
+            The document id
+        """
+        return self.add_stream([text])
+
+    def add_stream(self, chunks):
+        """
+        Indexes one document given as an iterable of text chunks (e.g. a
+        file read in pieces). Words split across chunks are handled.
+
+        Returns:
+            The document id
+        """
+        doc_id = len(self.stats)
+        builder = _IndexingStats(self)
+        for chunk in chunks:
+            builder.feed(chunk)
+        self.stats.append(builder.finish())
+
+        for term, positions in builder._positions.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = Postings()
+            postings.add(doc_id, positions)
+        return doc_id
+
+    # ------------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------------
+
+    def top_terms(self, k=10):
+        """Returns the k most frequent terms as (term, count) pairs."""
+        return self.unigrams.most_common(k)
+
+    def top_bigrams(self, k=10):
+        """Returns the k most frequent word pairs as ((a, b), count)."""
+        return self.bigrams.most_common(k)
+
+    def documents(self, term):
+        """Returns the ids of the documents containing `term`."""
+        postings = self.postings.get(normalize(term))
+        return postings.documents() if postings else []
+
+    def document_frequency(self, term):
+        postings = self.postings.get(normalize(term))
+        return len(postings) if postings else 0
+
+    def phrase(self, text):
+        """
+        Finds every place the words of `text` appear next to each other.
+
+        Returns:
+            List of (doc_id, position of the first word)
+        """
+        terms = [normalize(word) for word in text.split()]
+        if not terms or not all(terms):
+            return []
+        lists = [self.postings.get(term) for term in terms]
+        if any(postings is None for postings in lists):
+            return []
+
+        # Walk the rarest term first so the candidate set is small
+        order = sorted(range(len(terms)), key=lambda i: len(lists[i]))
+        candidates = None
+        by_term = {}
+        for i in order:
+            docs = dict(lists[i].items()) if candidates is None else {
+                doc_id: positions for doc_id, positions in lists[i].items()
+                if doc_id in candidates}
+            by_term[i] = docs
+            candidates = set(docs)
+            if not candidates:
+                return []
+
+        matches = []
+        for doc_id in sorted(candidates):
+            later = [set(by_term[i][doc_id]) for i in range(1, len(terms))]
+            for start in by_term[0][doc_id]:
+                if all(start + offset in positions
+                       for offset, positions in enumerate(later, 1)):
+                    matches.append((doc_id, start))
+        return matches
+
+    def term_counts(self, terms):
+        """Returns {term: total count} for the given terms."""
+        return {term: self.unigrams[normalize(term)] for term in terms}
+
+    def top_terms_in(self, doc_ids, k=10):
+        """Returns the k most frequent terms inside a set of documents."""
+        wanted = set(doc_ids)
+        totals = ((sum(count for doc_id, count
+                       in zip(accumulate(postings.doc_gaps), postings.counts)
+                       if doc_id in wanted), term)
+                  for term, postings in self.postings.items())
+        return [(term, count) for count, term
+                in heapq.nlargest(k, totals) if count]
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    index = TextIndex()
+    index.add("Hello world! This is Python. Functions are great?")
+    index.add("Python functions are great. Hello again!")
+    index.add_stream(["Great pyth", "on functions, great ", "Python."])
+
+    print(f"Stats of document 0: {index.stats[0]}")
+    print(f"Top terms  : {index.top_terms(3)}")
+    print(f"Top bigrams: {index.top_bigrams(2)}")
+    print(f"'hello' in : {index.documents('Hello')}")
+    print(f"'python functions' at: {index.phrase('python functions')}")
+    print(f"'functions are great' at: {index.phrase('Functions are great')}")
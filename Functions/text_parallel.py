@@ -0,0 +1,206 @@
+"""
+Parallel Text Analysis Engine
+=============================
+
+Runs the streaming analyzer from text_stream.py on several CPU cores.
+
+How it works:
+1. The file is memory-mapped (no copy is read into Python memory).
+2. It is split into byte ranges, each ending right after a whitespace
+   byte, so no word is ever cut in half.
+3. Every range is analyzed in a separate process.
+4. The partial TextStats are merged. Merging only adds counts, so the
+   result is exactly the same as the serial `analyze_file`.
+
+Only ASCII-compatible encodings (UTF-8, Latin-1, ASCII) can be split this
+way, because an ASCII whitespace byte can never be part of a multi-byte
+UTF-8 character.
+
+Example:
+    stats = analyze_file_parallel("corpus.txt", workers=8)
+"""
+
+import codecs
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+try:
+    from .text_stream import DEFAULT_CHUNK_SIZE, TextStats, analyze_file
+except ImportError:
+    from text_stream import DEFAULT_CHUNK_SIZE, TextStats, analyze_file
+
+# Bytes that `str.split()` treats as whitespace and that are single-byte in
+# every ASCII-compatible encoding
+_WHITESPACE = re.compile(rb"[ \t\n\r\x0b\x0c\x1c-\x1f]")
+
+# Vowels counted by `count_vowels` in PRACTICE_QUESTIONS.py
+_VOWELS = "aeiouAEIOU"
+
+# Files smaller than this are not worth starting a process pool for
+MIN_PARALLEL_SIZE = 8 << 20  # 8 MiB
+
+
+# ============================================================================
+# SPLITTING THE FILE
+# ============================================================================
+
+def split_ranges(buffer, parts):
+    """
+    Splits a bytes-like buffer into about `parts` ranges at whitespace.
+
+    Args:
+        buffer: bytes, bytearray or mmap object
+        parts: Desired number of ranges
+
+    Returns:
+        List of (start, end) byte offsets covering the whole buffer
+    """
+    size = len(buffer)
+    if size == 0:
+        return []
+
+    ranges = []
+    start = 0
+    step = max(1, size // max(1, parts))
+    while start < size:
+        target = start + step
+        if target >= size:
+            ranges.append((start, size))
+            break
+        # Move the cut forward to just after the next whitespace byte
+        match = _WHITESPACE.search(buffer, target)
+        end = match.end() if match else size
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _iter_range(path, start, end, chunk_size):
+    """Yields the bytes of [start, end) of a file through mmap."""
+    with open(path, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for offset in range(start, end, chunk_size):
+            yield mm[offset:min(offset + chunk_size, end)]
+
+
+# ============================================================================
+# WORKERS (run inside the process pool)
+# ============================================================================
+
+def _analyze_range(args):
+    path, start, end, encoding, chunk_size = args
+    stats = TextStats()
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in _iter_range(path, start, end, chunk_size):
+        stats.feed(decoder.decode(chunk))
+    stats.feed(decoder.decode(b"", final=True))
+    stats.flush()
+    return stats
+
+
+def _count_vowels_range(args):
+    path, start, end, encoding, chunk_size = args
+    count = 0
+    for chunk in _iter_range(path, start, end, chunk_size):
+        # Vowels are ASCII, so counting raw bytes is safe for UTF-8
+        for vowel in _VOWELS.encode(encoding):
+            count += chunk.count(vowel)
+    return count
+
+
+def _map_ranges(worker, path, workers, encoding, chunk_size):
+    """Splits `path` and runs `worker` over every range in a process pool."""
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # A few ranges per worker keeps cores busy if some finish early
+            ranges = split_ranges(mm, workers * 4)
+
+    jobs = [(path, start, end, encoding, chunk_size) for start, end in ranges]
+    if workers == 1:
+        return list(map(worker, jobs))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(worker, jobs))
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def analyze_file_parallel(path, workers=None, encoding="utf-8",
+                          chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Analyzes a text file on several cores.
+
+    Args:
+        path: Path to the text file
+        workers: Number of processes (default: number of CPUs)
+        encoding: An ASCII-compatible text encoding
+        chunk_size: Bytes decoded at a time inside each worker
+
+    Returns:
+        The same dictionary as `analyze_file` / `analyze_text`
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or os.path.getsize(path) < MIN_PARALLEL_SIZE:
+        return analyze_file(path, encoding=encoding)
+
+    partials = _map_ranges(_analyze_range, path, workers, encoding, chunk_size)
+    return reduce(TextStats.merge, partials, TextStats()).finish()
+
+
+def count_vowels_file(path, workers=None, encoding="utf-8",
+                      chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Counts vowels in a file on several cores, like `count_vowels`.
+
+    Returns:
+        Number of characters in "aeiouAEIOU"
+    """
+    workers = workers or os.cpu_count() or 1
+    return sum(_map_ranges(_count_vowels_range, path, workers,
+                           encoding, chunk_size))
+
+
+# ============================================================================
+# MAIN EXECUTION - Benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import time
+
+    # Usage: python text_parallel.py [file] [size_in_mb]
+    if len(sys.argv) > 1 and os.path.exists(sys.argv[1]):
+        path = sys.argv[1]
+    else:
+        size_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+        line = b"Hello world! This is Python. Functions are great?\n"
+        path = os.path.join(tempfile.gettempdir(), "text_parallel_bench.txt")
+        with open(path, "wb") as file:
+            file.write(line * (size_mb * (1 << 20) // len(line)))
+
+    size_mb = os.path.getsize(path) / (1 << 20)
+    print(f"File: {path} ({size_mb:.0f} MiB)")
+
+    start = time.perf_counter()
+    serial = analyze_file(path)
+    base = time.perf_counter() - start
+    print(f"serial      : {base:.2f}s  {size_mb / base:7.1f} MiB/s")
+
+    for workers in (1, 2, 4, 8):
+        if workers > (os.cpu_count() or 1):
+            break
+        start = time.perf_counter()
+        result = analyze_file_parallel(path, workers=workers)
+        took = time.perf_counter() - start
+        assert result == serial
+        print(f"{workers} worker(s) : {took:.2f}s  {size_mb / took:7.1f} MiB/s"
+              f"  speedup x{base / took:.2f}")
+
+    print(f"Result: {serial}")
@@ -0,0 +1,211 @@
+"""
+Streaming Text Analyzer
+=======================
+
+`analyze_text` in PRACTICE_QUESTIONS.py needs the whole text in memory and
+walks it three times (split, replace, and a per-character generator).
+This module computes the same statistics in a single pass over chunks, so
+a multi-gigabyte file can be analyzed with a fixed amount of memory.
+
+The result dictionary is identical to `analyze_text`:
+    word_count, char_count, sentence_count, avg_word_length
+
+Example:
+    stats = analyze_file("transcript.log")
+    stats = analyze_stream(["Hello wor", "ld! Bye."])
+"""
+
+import codecs
+
+# Characters `analyze_text` treats as sentence terminators
+SENTENCE_ENDINGS = ".!?"
+
+# Punctuation `analyze_text` strips from each word before measuring it
+WORD_PUNCTUATION = ".,!?;:"
+
+# Default number of characters read per chunk (1 MiB of text)
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+# ============================================================================
+# RUNNING COUNTS
+# ============================================================================
+
+class TextStats:
+    """
+    Running counts for the text analyzer.
+
+    Feed it chunks in order with `feed()`, then call `finish()` to get the
+    same dictionary `analyze_text` returns. A word that is cut in half by a
+    chunk boundary is kept in `_carry` until the next chunk completes it,
+    so memory stays at one chunk plus the longest word.
+
+    Two TextStats built over neighbouring pieces of text can be combined
+    with `merge()`, as long as the pieces were cut at whitespace.
+    """
+
+    __slots__ = ("word_count", "char_count", "terminator_count",
+                 "total_word_length", "_carry")
+
+    def __init__(self):
+        self.word_count = 0
+        self.char_count = 0
+        self.terminator_count = 0   # raw count, before the "at least 1" rule
+        self.total_word_length = 0
+        self._carry = ""
+
+    def feed(self, chunk):
+        """
+        Adds the next chunk of text to the running counts.
+
+        Args:
+            chunk: A string continuing the text fed so far
+        """
+        if not chunk:
+            return
+
+        # Character based counts do not care about word boundaries
+        self.char_count += len(chunk) - chunk.count(" ")
+        for mark in SENTENCE_ENDINGS:
+            self.terminator_count += chunk.count(mark)
+
+        text = self._carry + chunk
+        words = text.split()
+
+        # If the chunk does not end in whitespace its last word may continue
+        # in the next chunk, so hold it back
+        if words and not text[-1].isspace():
+            self._carry = words.pop()
+        else:
+            self._carry = ""
+
+        self._add_words(words)
+
+    def _add_words(self, words):
+        self.word_count += len(words)
+        self.total_word_length += sum(len(word.strip(WORD_PUNCTUATION))
+                                      for word in words)
+
+    def flush(self):
+        """Counts the word held back at the end of the last chunk."""
+        if self._carry:
+            self._add_words([self._carry])
+            self._carry = ""
+
+    def merge(self, other):
+        """
+        Adds the counts of another (flushed) TextStats into this one.
+
+        Merging is associative, so partial results can be combined in any
+        grouping. Both pieces must have been split at whitespace.
+
+        Returns:
+            self, to allow chaining
+        """
+        self.flush()
+        other.flush()
+        self.word_count += other.word_count
+        self.char_count += other.char_count
+        self.terminator_count += other.terminator_count
+        self.total_word_length += other.total_word_length
+        return self
+
+    def finish(self):
+        """
+        Returns the statistics in the same format as `analyze_text`.
+        """
+        self.flush()
+
+        sentence_count = self.terminator_count
+        if sentence_count == 0:
+            sentence_count = 1  # At least one sentence if no punctuation
+
+        if self.word_count > 0:
+            avg_word_length = self.total_word_length / self.word_count
+        else:
+            avg_word_length = 0
+
+        return {
+            'word_count': self.word_count,
+            'char_count': self.char_count,
+            'sentence_count': sentence_count,
+            'avg_word_length': round(avg_word_length, 2)
+        }
+
+
+# ============================================================================
+# PUBLIC HELPERS
+# ============================================================================
+
+def analyze_stream(chunks, encoding="utf-8"):
+    """
+    Analyzes text given as any iterable of chunks, reading it only once.
+
+    Args:
+        chunks: Iterable of str or bytes chunks (e.g. lines of a file,
+                socket reads, or a generator)
+        encoding: Used to decode bytes chunks; multi-byte characters split
+                  across chunks are handled by an incremental decoder
+
+    Returns:
+        Dictionary with word_count, char_count, sentence_count and
+        avg_word_length
+    """
+    stats = TextStats()
+    decoder = None
+    for chunk in chunks:
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding)()
+            chunk = decoder.decode(chunk)
+        stats.feed(chunk)
+    if decoder is not None:
+        stats.feed(decoder.decode(b"", final=True))
+    return stats.finish()
+
+
+def iter_file_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, encoding="utf-8"):
+    """
+    Yields a text file in fixed-size chunks.
+
+    The file is opened with newline="" so line endings are counted exactly
+    as they are stored on disk (no "\\r\\n" -> "\\n" translation).
+    """
+    with open(path, "r", encoding=encoding, newline="") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def analyze_file(path, chunk_size=DEFAULT_CHUNK_SIZE, encoding="utf-8"):
+    """
+    Analyzes a text file of any size with constant memory.
+
+    Gives the same result as
+    `analyze_text(open(path, encoding=encoding, newline="").read())`.
+
+    Args:
+        path: Path to the text file
+        chunk_size: Number of characters read at a time
+        encoding: Text encoding of the file
+
+    Returns:
+        Dictionary with word_count, char_count, sentence_count and
+        avg_word_length
+    """
+    return analyze_stream(iter_file_chunks(path, chunk_size, encoding))
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    sample_text = "Hello world! This is Python. Functions are great?"
+
+    # Cut the sample into tiny chunks so words and "!" cross boundaries
+    chunks = [sample_text[i:i + 4] for i in range(0, len(sample_text), 4)]
+    print(f"Chunks: {chunks}")
+    print(f"Analysis: {analyze_stream(chunks)}")
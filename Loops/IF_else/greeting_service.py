@@ -0,0 +1,224 @@
+# Cached, time-zone-aware greeting service
+#
+# ifelse_practice.py formats the clock with time.strftime, turns the hour
+# string back into an int and walks the if/elif chain. Doing that on every
+# page view is wasteful: the answer only changes three times a day.
+#
+# Here:
+#   - the if/elif chain is run once per hour of the day (HOUR_GREETINGS)
+#   - every time zone gets a schedule: the moments (as epoch seconds) where
+#     its greeting changes, for today and tomorrow
+#   - the current greeting of a zone is cached until its next change, so a
+#     call is one clock read, one dict lookup and one comparison
+#   - greet_batch() answers a whole list of (user, time zone) pairs
+#
+# Run:  python greeting_service.py        -> greeting + benchmark (ns/call)
+
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+
+def greeting_for_hour(hour):
+    """The if/elif chain of ifelse_practice.py."""
+    if hour < 12:
+        return "Good Morning"
+    elif hour <= 17:
+        return "Good Afternoon"
+    else:
+        return "Good Evening"
+
+
+HOUR_GREETINGS = tuple(greeting_for_hour(hour) for hour in range(24))
+
+# Hours where the greeting changes (0 always starts a new day)
+_CHANGE_HOURS = [hour for hour in range(24)
+                 if hour == 0 or HOUR_GREETINGS[hour] != HOUR_GREETINGS[hour - 1]]
+
+
+# ============================================================================
+# PER-ZONE SCHEDULE
+# ============================================================================
+
+class _ZoneSchedule:
+    """
+    When the greeting of one zone changes, for today and tomorrow.
+
+    `starts[i]` is the epoch second where `greetings[i]` begins; the last
+    entry of `starts` ends the schedule.
+    """
+
+    __slots__ = ("starts", "greetings")
+
+    def __init__(self, zone, now):
+        day = datetime.fromtimestamp(now, zone).date()
+        periods = []
+        for offset in range(3):
+            date = day + timedelta(days=offset)
+            for hour in _CHANGE_HOURS:
+                # zone None is the computer's own time zone (naive datetime)
+                moment = datetime(date.year, date.month, date.day, hour,
+                                  tzinfo=zone).timestamp()
+                periods.append((moment, HOUR_GREETINGS[hour]))
+        periods.sort()
+        self.starts = [moment for moment, _ in periods]
+        self.greetings = [greeting for _, greeting in periods]
+
+    def period(self, now):
+        """
+        Returns (start, end, greeting) of the period containing `now`, or
+        None when `now` is outside the schedule.
+        """
+        index = bisect_right(self.starts, now) - 1
+        if index < 0 or index + 1 >= len(self.starts):
+            return None
+        return self.starts[index], self.starts[index + 1], self.greetings[index]
+
+
+# ============================================================================
+# GREETING SERVICE
+# ============================================================================
+
+class GreetingService:
+    """
+    Greets by the local time of any time zone.
+
+    Args:
+        clock: Function returning the current epoch seconds (time.time);
+               replace it to test other times of day
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._zones = {}            # name -> ZoneInfo (None = local)
+        self._schedules = {}        # name -> _ZoneSchedule
+        self._current = {}          # name -> (start, end, greeting)
+
+    def _zone(self, name):
+        zone = self._zones.get(name, False)
+        if zone is False:
+            zone = self._zones[name] = None if name is None else ZoneInfo(name)
+        return zone
+
+    def _refresh(self, name, now):
+        """Finds the period of `now`, rebuilding the schedule if needed."""
+        schedule = self._schedules.get(name)
+        period = schedule.period(now) if schedule is not None else None
+        if period is None:
+            schedule = _ZoneSchedule(self._zone(name), now)
+            self._schedules[name] = schedule
+            period = schedule.period(now)
+        self._current[name] = period
+        return period[2]
+
+    def greeting(self, tz=None, now=None):
+        """
+        Returns "Good Morning", "Good Afternoon" or "Good Evening".
+
+        Args:
+            tz: IANA time zone name such as "Europe/Paris" (None = the
+                computer's own time zone, like ifelse_practice.py)
+            now: Epoch seconds to greet at (default: the clock)
+
+        Raises:
+            zoneinfo.ZoneInfoNotFoundError: If the time zone is unknown
+        """
+        if now is None:
+            now = self.clock()
+        period = self._current.get(tz)
+        if period is not None and period[0] <= now < period[1]:
+            return period[2]
+        return self._refresh(tz, now)
+
+    def greet_batch(self, pairs, now=None):
+        """
+        Greets many users at once; the clock is read once for the batch.
+
+        Args:
+            pairs: Iterable of (user, tz) pairs
+
+        Returns:
+            List of (user, greeting) pairs in input order
+        """
+        if now is None:
+            now = self.clock()
+        greeting = self.greeting
+        by_zone = {}
+        result = []
+        for user, tz in pairs:
+            text = by_zone.get(tz)
+            if text is None:
+                text = by_zone[tz] = greeting(tz, now)
+            result.append((user, text))
+        return result
+
+    def clear(self):
+        """Forgets cached zones and periods."""
+        self._zones.clear()
+        self._schedules.clear()
+        self._current.clear()
+
+
+default_service = GreetingService()
+
+
+def greet(tz=None):
+    """Greeting for the current time in `tz`, using the shared service."""
+    return default_service.greeting(tz)
+
+
+# ============================================================================
+# MAIN EXECUTION - Benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+
+    def strftime_greeting():
+        # What ifelse_practice.py does on every run
+        hour = int(time.strftime("%H"))
+        if hour < 12:
+            return "Good Morning"
+        elif hour <= 17:
+            return "Good Afternoon"
+        else:
+            return "Good Evening"
+
+    zones = ["UTC", "Europe/London", "America/New_York", "Asia/Kolkata",
+             "Asia/Kathmandu", "Australia/Lord_Howe", "America/Santiago"]
+
+    # The cache must agree with the plain chain at any moment, including
+    # around daylight-saving changes
+    service = GreetingService()
+    rng = random.Random(0)
+    moment = 1_700_000_000
+    for _ in range(50_000):
+        moment += rng.randrange(1, 6 * 3600)
+        tz = rng.choice(zones)
+        expected = HOUR_GREETINGS[datetime.fromtimestamp(moment,
+                                                         ZoneInfo(tz)).hour]
+        assert service.greeting(tz, moment) == expected, (tz, moment)
+    assert greet() == strftime_greeting()
+    print(f"Now: {greet()} (local), {greet('Asia/Tokyo')} (Tokyo)")
+
+    calls = 1_000_000
+    service = GreetingService()
+    timings = []
+    for name, function in (("strftime + if/elif", strftime_greeting),
+                           ("cached, local", service.greeting),
+                           ("cached, 'Asia/Kolkata'",
+                            lambda: service.greeting("Asia/Kolkata"))):
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            function()
+        timings.append((name, (time.perf_counter_ns() - start) / calls))
+
+    users = [(f"user{i}", rng.choice(zones)) for i in range(calls)]
+    start = time.perf_counter_ns()
+    service.greet_batch(users)
+    timings.append(("greet_batch (7 zones)",
+                    (time.perf_counter_ns() - start) / calls))
+
+    for name, nanoseconds in timings:
+        print(f"{name:24s}: {nanoseconds:7.0f} ns/call")
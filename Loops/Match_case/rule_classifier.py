@@ -0,0 +1,340 @@
+# Rule-based classifier compiled into lookup tables
+#
+# Match_case.py and the nested if/elif ladder in if_else.py classify a
+# number by trying the cases one after another. With a handful of cases
+# that is fine; with hundreds of rules and millions of numbers it is slow.
+#
+# Here the rules are written down as data and compiled once:
+#   - exact values  -> one dict lookup
+#   - ranges        -> a sorted table of interval boundaries, searched with
+#                      bisect (or numpy.searchsorted for whole arrays)
+#   - guards        -> any other test (a function); only tried when a guard
+#                      comes before the rule the tables found
+#
+# Like match/case, the FIRST rule that matches wins, so the compiled
+# classifier gives exactly the same labels as the original chains.
+#
+# Run:  python rule_classifier.py            -> check + benchmark
+#       python rule_classifier.py 1000000    -> benchmark with fewer inputs
+
+import heapq
+import math
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+_NO_RULE = math.inf
+
+
+class Rule:
+    """
+    One case of the classifier. Build rules with exact(), between() or
+    guard().
+
+    `label` is what the classifier returns; it may also be a function of
+    the value (e.g. `str` to return the number itself as text).
+    """
+
+    __slots__ = ("kind", "value", "low", "high", "test", "label")
+
+    def __init__(self, kind, label, value=None, low=None, high=None,
+                 test=None):
+        self.kind = kind
+        self.label = label
+        self.value = value
+        self.low = low
+        self.high = high
+        self.test = test
+
+    def __repr__(self):
+        if self.kind == "exact":
+            return f"exact({self.value!r}, {self.label!r})"
+        if self.kind == "range":
+            return f"between({self.low}, {self.high}, {self.label!r})"
+        return f"guard({self.test!r}, {self.label!r})"
+
+
+def exact(value, label):
+    """Matches one value, like `case 0:`."""
+    return Rule("exact", label, value=value)
+
+
+def between(low, high, label, low_inclusive=True, high_inclusive=False):
+    """
+    Matches low <= x < high (change the ends with the *_inclusive flags).
+    Use None for an open end, e.g. between(None, 0, ...) is x < 0.
+    """
+    # Store every range as a half-open float interval [start, end)
+    if low is None:
+        start = -math.inf
+    else:
+        start = float(low) if low_inclusive else math.nextafter(low, math.inf)
+    if high is None:
+        end = math.inf
+    else:
+        end = math.nextafter(high, math.inf) if high_inclusive else float(high)
+    return Rule("range", label, low=start, high=end)
+
+
+def guard(test, label):
+    """Matches when test(x) is true, like `case _ if x > 50:`."""
+    return Rule("guard", label, test=test)
+
+
+# ============================================================================
+# COMPILED CLASSIFIER
+# ============================================================================
+
+class RuleClassifier:
+    """
+    Compiles a list of rules into lookup tables.
+
+    Args:
+        rules: Rules in priority order (first match wins)
+        default: Label when no rule matches (None, like a match statement
+                 with no `case _:`)
+    """
+
+    def __init__(self, rules, default=None):
+        self.rules = list(rules)
+        self.default = default
+        self._labels = [rule.label for rule in self.rules]
+
+        # Exact values: first rule wins
+        self._exact = {}
+        for index, rule in enumerate(self.rules):
+            if rule.kind == "exact":
+                self._exact.setdefault(rule.value, index)
+
+        self._guards = [(index, rule.test)
+                        for index, rule in enumerate(self.rules)
+                        if rule.kind == "guard"]
+        self._bounds, self._winners = self._compile_ranges()
+
+    def _compile_ranges(self):
+        """
+        Sweeps over the range boundaries and records, for every piece of
+        the number line, the first range rule covering it.
+
+        Returns:
+            (bounds, winners): x falls in piece bisect_right(bounds, x),
+            whose rule is winners[piece] (inf for none)
+        """
+        starts = {}
+        ends = {}
+        for index, rule in enumerate(self.rules):
+            if rule.kind == "range" and rule.low < rule.high:
+                starts.setdefault(rule.low, []).append(index)
+                ends.setdefault(rule.high, set()).add(index)
+        points = sorted(starts.keys() | ends.keys())
+
+        bounds = []
+        winners = [_NO_RULE]        # piece before the first boundary
+        active = []                 # heap of rule indices
+        finished = set()
+        for point in points:
+            finished |= ends.get(point, set())
+            for index in starts.get(point, ()):
+                heapq.heappush(active, index)
+                finished.discard(index)
+            while active and active[0] in finished:
+                heapq.heappop(active)
+            winner = active[0] if active else _NO_RULE
+            if winner == winners[-1]:
+                continue            # same rule as the previous piece: merge
+            bounds.append(point)
+            winners.append(winner)
+        return bounds, winners
+
+    def _label(self, index, value):
+        if index == _NO_RULE:
+            return self.default
+        label = self._labels[index]
+        return label(value) if callable(label) else label
+
+    def rule_index(self, value):
+        """Returns the index of the first matching rule (inf if none)."""
+        found = self._exact.get(value, _NO_RULE)
+        if value == value:  # NaN fails every range test
+            piece = self._winners[bisect_right(self._bounds, value)]
+            if piece < found:
+                found = piece
+        for index, test in self._guards:
+            if index >= found:
+                break
+            if test(value):
+                return index
+        return found
+
+    def classify(self, value):
+        """Returns the label of the first rule matching `value`."""
+        return self._label(self.rule_index(value), value)
+
+    def classify_many(self, values):
+        """
+        Classifies a whole list / array.array / NumPy array.
+
+        Returns:
+            List of labels (NumPy object array for NumPy input)
+        """
+        if np is not None and isinstance(values, np.ndarray):
+            return self._classify_numpy(values)
+        exact = self._exact
+        bounds = self._bounds
+        winners = self._winners
+        if not self._guards and not any(map(callable, self._labels)):
+            labels = self._labels + [self.default]
+            no_rule = len(labels) - 1
+            if not exact:
+                return [labels[no_rule if w == _NO_RULE else w] for w in
+                        (winners[bisect_right(bounds, v)] for v in values)]
+            result = []
+            append = result.append
+            for value in values:
+                found = exact.get(value, _NO_RULE)
+                piece = winners[bisect_right(bounds, value)]
+                if piece < found and value == value:
+                    found = piece
+                append(labels[no_rule if found == _NO_RULE else found])
+            return result
+        classify = self.classify
+        return [classify(value) for value in values]
+
+    def _classify_numpy(self, values):
+        winners = np.array([len(self.rules) if w == _NO_RULE else w
+                            for w in self._winners])
+        found = winners[np.searchsorted(np.asarray(self._bounds), values,
+                                        side="right")]
+        if values.dtype.kind == "f":
+            found[np.isnan(values)] = len(self.rules)
+        if self._exact:
+            keys = np.array(sorted(self._exact))
+            ranks = np.array([self._exact[key] for key in keys.tolist()])
+            position = np.searchsorted(keys, values).clip(0, len(keys) - 1)
+            hit = keys[position] == values
+            found = np.where(hit, np.minimum(found, ranks[position]), found)
+
+        labels = np.array(self._labels + [self.default], dtype=object)
+        if not self._guards and not any(map(callable, self._labels)):
+            return labels[found]
+        # Guards and label functions need Python for each value
+        return np.array([self.classify(value) for value in values.tolist()],
+                        dtype=object)
+
+
+# ============================================================================
+# THE EXISTING SCRIPTS AS RULES
+# ============================================================================
+
+# Match_case.py
+MATCH_CASE_RULES = [
+    exact(0, "You entered zero."),
+    exact(1, "You entered one."),
+    exact(2, "You entered two."),
+    guard(lambda x: x > 50, str),           # prints the number itself
+]
+
+# if_else.py, the nested ladder
+IF_ELSE_RULES = [
+    between(None, 0, "Negative number"),
+    between(0, 10, "Single digit positive number", low_inclusive=False),
+    between(10, 20, "Double digit positive number"),
+    between(20, None, "Number is greater than 20"),
+    exact(0, "Zero"),
+]
+
+# The x > 50 guard can also be written as a range, which keeps the whole
+# classifier inside the lookup tables
+MATCH_CASE_RANGE_RULES = MATCH_CASE_RULES[:3] + [
+    between(50, None, str, low_inclusive=False)]
+
+
+# ============================================================================
+# MAIN EXECUTION - check + benchmark
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import sys
+    import time
+
+    def match_case(x):
+        # Same cases as Match_case.py, returning instead of printing
+        match x:
+            case 0:
+                return "You entered zero."
+            case 1:
+                return "You entered one."
+            case 2:
+                return "You entered two."
+            case _ if x > 50:
+                return str(x)
+
+    def if_else(x):
+        # Same ladder as if_else.py
+        if x < 0:
+            return "Negative number"
+        elif x > 0:
+            if x < 10:
+                return "Single digit positive number"
+            elif x < 20:
+                return "Double digit positive number"
+            else:
+                return "Number is greater than 20"
+        else:
+            return "Zero"
+
+    sample = list(range(-100, 200)) + [0.5, 9.999, 10.0, 19.5, 20.0, -0.0]
+    for rules, reference in ((MATCH_CASE_RULES, match_case),
+                             (MATCH_CASE_RANGE_RULES, match_case),
+                             (IF_ELSE_RULES, if_else)):
+        classifier = RuleClassifier(rules)
+        assert classifier.classify_many(sample) == list(map(reference, sample))
+    print("Labels match Match_case.py and if_else.py")
+
+    # 10^3 rules: 500 exact values and 500 overlapping ranges
+    rng = random.Random(5)
+    rules = []
+    for number in range(1000):
+        if number % 2:
+            rules.append(exact(rng.randrange(1_000_000), f"exact-{number}"))
+        else:
+            low = rng.randrange(1_000_000)
+            rules.append(between(low, low + rng.randrange(1, 5000),
+                                 f"range-{number}"))
+    classifier = RuleClassifier(rules, default="none")
+
+    def linear(x):
+        for rule in rules:
+            if rule.kind == "exact" and x == rule.value:
+                return rule.label
+            if rule.kind == "range" and rule.low <= x < rule.high:
+                return rule.label
+        return "none"
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    inputs = [rng.randrange(1_000_000) for _ in range(size)]
+    check = inputs[:10_000]
+
+    start = time.perf_counter()
+    expected = [linear(x) for x in check]
+    linear_rate = len(check) / (time.perf_counter() - start)
+    assert classifier.classify_many(check) == expected
+
+    start = time.perf_counter()
+    labels = classifier.classify_many(inputs)
+    took = time.perf_counter() - start
+    print(f"1000 rules, {size:,} inputs")
+    print(f"linear chain : {linear_rate / 1e6:8.3f} M values/s "
+          f"(measured on {len(check):,} values)")
+    print(f"compiled     : {size / took / 1e6:8.3f} M values/s "
+          f"({took:.2f}s, {len(classifier._bounds)} boundaries)")
+    if np is not None:
+        array = np.array(inputs)
+        start = time.perf_counter()
+        classifier.classify_many(array)
+        took = time.perf_counter() - start
+        print(f"numpy        : {size / took / 1e6:8.3f} M values/s")